@@ -8,13 +8,59 @@ import sqlite3
 import hashlib
 import secrets
 import json
+import zlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from pydantic import BaseModel, Field, EmailStr
 import jwt
 from dotenv import load_dotenv
 
+try:
+    from .admin_identity import (
+        ADMIN_ROLES,
+        admin_identity_cache,
+        bump_revocation_stamp,
+        fetch_admin,
+        revocation_stamp_path,
+    )
+    from .metrics import ADMIN_QUERY_SECONDS, TrackedConnection
+    from .notifications import (
+        NOTIFICATION_LONG_POLL_SECONDS,
+        init_notifications,
+        list_notifications,
+        notification_counts,
+        wait_for_notifications,
+    )
+    from .patients import init_patients
+    from .review_queue import claim_next_case, init_review_queue, pending_count, release_case, resolve_case
+    from .session_codec import decode_matched_rules, decode_payload, decode_request
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from admin_identity import (  # type: ignore
+        ADMIN_ROLES,
+        admin_identity_cache,
+        bump_revocation_stamp,
+        fetch_admin,
+        revocation_stamp_path,
+    )
+    from metrics import ADMIN_QUERY_SECONDS, TrackedConnection  # type: ignore
+    from notifications import (  # type: ignore
+        NOTIFICATION_LONG_POLL_SECONDS,
+        init_notifications,
+        list_notifications,
+        notification_counts,
+        wait_for_notifications,
+    )
+    from patients import init_patients  # type: ignore
+    from review_queue import (  # type: ignore
+        claim_next_case,
+        init_review_queue,
+        pending_count,
+        release_case,
+        resolve_case,
+    )
+    from session_codec import decode_matched_rules, decode_payload, decode_request  # type: ignore
+
 load_dotenv()
 
 # JWT Configuration
@@ -30,7 +76,7 @@ DB_FILE = "triage_sessions.db"
 
 def init_admin_db():
     """Initialize admin and patient tracking tables"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     # Admin users table
@@ -49,39 +95,11 @@ def init_admin_db():
         )
     """)
     
-    # Patient/User table for tracking active sessions
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS patients (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            patient_name TEXT,
-            age INTEGER,
-            gender TEXT,
-            contact TEXT,
-            last_visit DATETIME DEFAULT CURRENT_TIMESTAMP,
-            total_consultations INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'active'
-        )
-    """)
+    # Patients, linked to authenticated users and maintained by log_session
+    init_patients(conn)
     
-    # Enhanced triage_sessions table with patient info
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS triage_cases (
-            id TEXT PRIMARY KEY,
-            patient_id INTEGER,
-            patient_name TEXT,
-            age INTEGER,
-            condition TEXT,
-            symptoms TEXT,
-            severity TEXT,
-            triage_label TEXT,
-            status TEXT DEFAULT 'pending',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            reviewed_by INTEGER,
-            notes TEXT,
-            FOREIGN KEY (patient_id) REFERENCES patients(id),
-            FOREIGN KEY (reviewed_by) REFERENCES admin_users(id)
-        )
-    """)
+    # Clinician review queue (triage_cases, its queue index and pending counter)
+    init_review_queue(conn)
     
     # Admin activity log
     cursor.execute("""
@@ -96,18 +114,8 @@ def init_admin_db():
         )
     """)
     
-    # Notifications table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            admin_id INTEGER,
-            message TEXT,
-            type TEXT,
-            is_read BOOLEAN DEFAULT 0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (admin_id) REFERENCES admin_users(id)
-        )
-    """)
+    # Notifications, unread counters and emergency fan-out
+    init_notifications(conn)
     
     # Create default admin if doesn't exist
     cursor.execute("SELECT COUNT(*) FROM admin_users")
@@ -173,33 +181,38 @@ async def get_current_admin(authorization: str = Header(None)) -> Dict:
         admin_id = payload.get("sub")
         if not admin_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
-        
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, username, email, full_name, role, is_active FROM admin_users WHERE id = ?",
-            (admin_id,)
-        )
-        user = cursor.fetchone()
+        admin_id = int(admin_id)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid authorization header format")
+    
+    # Active admins are cached; revocations clear the cache in every worker via the stamp file
+    admin_identity_cache.sync(revocation_stamp_path(DB_FILE))
+    admin = admin_identity_cache.get(admin_id)
+    if admin is None:
+        version = admin_identity_cache.version
+        conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+        record = fetch_admin(conn, admin_id)
         conn.close()
         
-        if not user or not user[5]:
+        if not record or not record["is_active"]:
             raise HTTPException(status_code=401, detail="User not found or inactive")
         
-        return {
-            "id": user[0],
-            "username": user[1],
-            "email": user[2],
-            "full_name": user[3],
-            "role": user[4]
-        }
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid authorization header format")
+        admin = {key: record[key] for key in ("id", "username", "email", "full_name", "role")}
+        admin_identity_cache.put(admin_id, admin, version)
+    
+    # Callers may mutate the dict; keep the cached copy pristine
+    return dict(admin)
+
+async def require_superadmin(current_admin: Dict = Depends(get_current_admin)) -> Dict:
+    """Only superadmins may manage other admin accounts"""
+    if current_admin["role"] != "superadmin":
+        raise HTTPException(status_code=403, detail="Superadmin role required")
+    return current_admin
 
 # Log admin activity
 def log_admin_activity(admin_id: int, action: str, details: str = None, ip_address: str = None):
     """Log admin activity to database"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     cursor.execute("""
         INSERT INTO admin_activity_log (admin_id, action, details, ip_address)
@@ -250,9 +263,10 @@ class PatientInfo(BaseModel):
 # API Endpoints
 
 @admin_router.post("/auth/login", response_model=LoginResponse)
+@ADMIN_QUERY_SECONDS.labels("login").time()
 async def admin_login(request: LoginRequest):
     """Admin login endpoint"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     cursor.execute(
@@ -296,9 +310,10 @@ async def admin_login(request: LoginRequest):
     )
 
 @admin_router.get("/dashboard/stats", response_model=DashboardStats)
+@ADMIN_QUERY_SECONDS.labels("dashboard_stats").time()
 async def get_dashboard_stats(current_admin: Dict = Depends(get_current_admin)):
     """Get dashboard statistics matching the design"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     # Total consultations (from triage_sessions)
@@ -341,15 +356,8 @@ async def get_dashboard_stats(current_admin: Dict = Depends(get_current_admin)):
     
     emergency_growth = calculate_growth(recent_emergency, previous_emergency)
     
-    # Pending reviews (cases not yet resolved)
-    cursor.execute("""
-        SELECT COUNT(*) FROM triage_cases WHERE status = 'pending'
-    """)
-    pending_count = cursor.fetchone()[0]
-    if pending_count == 0:
-        # Fallback to recent sessions
-        cursor.execute("SELECT COUNT(*) FROM triage_sessions WHERE timestamp >= ?", (week_ago,))
-        pending_count = cursor.fetchone()[0]
+    # Pending reviews (maintained counter, O(1))
+    pending_reviews = pending_count(conn)
     
     pending_growth = 12.0  # Placeholder
     
@@ -375,7 +383,7 @@ async def get_dashboard_stats(current_admin: Dict = Depends(get_current_admin)):
         consultations_growth=consultations_growth,
         emergency_cases=emergency_cases,
         emergency_growth=emergency_growth,
-        pending_reviews=pending_count,
+        pending_reviews=pending_reviews,
         pending_growth=pending_growth,
         resolved_cases=resolved_count,
         resolved_growth=resolved_growth
@@ -389,19 +397,21 @@ def calculate_growth(current: int, previous: int) -> float:
     return round(growth, 1)
 
 @admin_router.get("/triage-cases/recent")
+@ADMIN_QUERY_SECONDS.labels("recent_triage_cases").time()
 async def get_recent_triage_cases(
     limit: int = 10,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get recent triage cases for the dashboard table"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     # Get recent triage sessions and format them
     cursor.execute("""
-        SELECT id, timestamp, symptoms, severity, triage_label, session_data
-        FROM triage_sessions
-        ORDER BY timestamp DESC
+        SELECT s.id, s.timestamp, s.symptoms, s.severity, s.triage_label, s.session_data, c.status
+        FROM triage_sessions s
+        LEFT JOIN triage_cases c ON c.id = s.id
+        ORDER BY s.timestamp DESC
         LIMIT ?
     """, (limit,))
     
@@ -409,13 +419,12 @@ async def get_recent_triage_cases(
     cases = []
     
     for row in rows:
-        session_id, timestamp, symptoms, severity, triage_label, session_data = row
+        session_id, timestamp, symptoms, severity, triage_label, session_data, case_status = row
         
         # Parse session data to get patient info
         try:
-            data = eval(session_data) if session_data else {}
-            age = data.get('patient_age', 'N/A')
-        except:
+            age = decode_payload(session_data).get('patient_age') or 'N/A'
+        except (ValueError, zlib.error):
             age = 'N/A'
         
         # Calculate time ago
@@ -442,7 +451,7 @@ async def get_recent_triage_cases(
             "condition": condition,
             "severity": severity_label,
             "time_ago": time_ago,
-            "status": "pending" if severity_label in ["EMERGENCY", "URGENT"] else "completed",
+            "status": case_status or "completed",
             "triage_label": triage_label
         })
     
@@ -495,15 +504,20 @@ def map_severity_to_label(triage_label: str, severity: str) -> str:
         return "NORMAL"
 
 @admin_router.get("/triage-cases/{case_id}")
+@ADMIN_QUERY_SECONDS.labels("triage_case_detail").time()
 async def get_triage_case_detail(
     case_id: str,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get detailed information about a specific triage case"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
-    cursor.execute("SELECT * FROM triage_sessions WHERE id = ?", (case_id,))
+    cursor.execute("""
+        SELECT id, timestamp, symptoms, severity, duration, additional_factors,
+               triage_label, matched_rules, explanation, session_data, user_id
+        FROM triage_sessions WHERE id = ?
+    """, (case_id,))
     row = cursor.fetchone()
     conn.close()
     
@@ -520,42 +534,28 @@ async def get_triage_case_detail(
         "duration": row[4],
         "additional_factors": row[5],
         "triage_label": row[6],
-        "matched_rules": row[7],
+        "matched_rules": decode_matched_rules(row[7]),
         "explanation": row[8],
-        "session_data": row[9]
+        "session_data": {
+            "request": decode_request(row[0], row[2], row[3], row[4], row[5], row[9]),
+            "recorded_at": row[1],
+            "user_id": row[10],
+        }
     }
 
 @admin_router.get("/patients")
+@ADMIN_QUERY_SECONDS.labels("patients").time()
 async def get_patients(
     limit: int = 50,
     offset: int = 0,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get list of patients"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
-    # Create some sample patients from sessions if table is empty
-    cursor.execute("SELECT COUNT(*) FROM patients")
-    if cursor.fetchone()[0] == 0:
-        # Get unique sessions and create patient records
-        cursor.execute("SELECT DISTINCT id, timestamp FROM triage_sessions LIMIT 20")
-        sessions = cursor.fetchall()
-        
-        for session_id, timestamp in sessions:
-            patient_name = generate_patient_name(session_id)
-            age = 25 + (int(session_id[:4], 16) % 50)  # Age between 25-75
-            gender = "Male" if int(session_id[:2], 16) % 2 == 0 else "Female"
-            
-            cursor.execute("""
-                INSERT INTO patients (patient_name, age, gender, last_visit, total_consultations)
-                VALUES (?, ?, ?, ?, ?)
-            """, (patient_name, age, gender, timestamp, 1))
-        
-        conn.commit()
-    
     cursor.execute("""
-        SELECT id, patient_name, age, gender, total_consultations, last_visit, status
+        SELECT id, patient_name, age, gender, total_consultations, last_visit, status, user_id
         FROM patients
         ORDER BY last_visit DESC
         LIMIT ? OFFSET ?
@@ -577,7 +577,8 @@ async def get_patients(
             "gender": row[3],
             "total_consultations": row[4],
             "last_visit": row[5],
-            "status": row[6]
+            "status": row[6],
+            "user_id": row[7]
         })
     
     log_admin_activity(current_admin["id"], "VIEW_PATIENTS", f"Viewed patients list")
@@ -585,52 +586,61 @@ async def get_patients(
     return {"patients": patients, "total": total, "limit": limit, "offset": offset}
 
 @admin_router.get("/notifications")
+@ADMIN_QUERY_SECONDS.labels("notifications").time()
 async def get_notifications(
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get notifications for admin"""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, message, type, is_read, created_at
-        FROM notifications
-        WHERE admin_id = ?
-        ORDER BY created_at DESC
-        LIMIT 10
-    """, (current_admin["id"],))
-    
-    rows = cursor.fetchall()
-    
-    notifications = []
-    for row in rows:
-        notifications.append({
-            "id": row[0],
-            "message": row[1],
-            "type": row[2],
-            "is_read": bool(row[3]),
-            "created_at": row[4]
-        })
-    
-    # Get unread count
-    cursor.execute("""
-        SELECT COUNT(*) FROM notifications
-        WHERE admin_id = ? AND is_read = 0
-    """, (current_admin["id"],))
-    
-    unread_count = cursor.fetchone()[0]
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        notifications = list_notifications(conn, current_admin["id"])
+        counts = notification_counts(conn, current_admin["id"])
+    finally:
+        conn.close()
     
+    return {"notifications": notifications, **counts}
+
+@admin_router.get("/notifications/poll")
+async def poll_notifications(
+    after_id: int = 0,
+    timeout: float = Query(NOTIFICATION_LONG_POLL_SECONDS, ge=0, le=60),
+    current_admin: Dict = Depends(get_current_admin)
+):
+    """Long-poll for notifications newer than after_id (pass back the returned latest_id)"""
+    return await wait_for_notifications(
+        lambda: sqlite3.connect(DB_FILE, factory=TrackedConnection),
+        current_admin["id"],
+        after_id,
+        timeout,
+    )
+
+class DutyStatusRequest(BaseModel):
+    on_duty: bool
+
+@admin_router.put("/me/on-duty")
+async def set_on_duty(
+    body: DutyStatusRequest,
+    current_admin: Dict = Depends(get_current_admin)
+):
+    """Opt in or out of emergency notifications"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    cursor = conn.cursor()
+    cursor.execute("UPDATE admin_users SET on_duty = ? WHERE id = ?", (int(body.on_duty), current_admin["id"]))
+    conn.commit()
     conn.close()
     
-    return {"notifications": notifications, "unread_count": unread_count}
+    log_admin_activity(current_admin["id"], "SET_ON_DUTY", f"on_duty={body.on_duty}")
+    
+    return {"on_duty": body.on_duty}
 
 @admin_router.post("/notifications/{notification_id}/read")
+@ADMIN_QUERY_SECONDS.labels("mark_notification_read").time()
 async def mark_notification_read(
     notification_id: int,
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Mark notification as read"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -645,12 +655,13 @@ async def mark_notification_read(
     return {"message": "Notification marked as read"}
 
 @admin_router.get("/reports/overview")
+@ADMIN_QUERY_SECONDS.labels("reports_overview").time()
 async def get_reports_overview(
     period: str = "week",
     current_admin: Dict = Depends(get_current_admin)
 ):
     """Get overview reports for the Reports section"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     
     # Calculate date range
@@ -685,5 +696,174 @@ async def get_reports_overview(
         "start_date": start_date
     }
 
+class ResolveCaseRequest(BaseModel):
+    notes: Optional[str] = None
+
+@admin_router.post("/review-queue/claim")
+@ADMIN_QUERY_SECONDS.labels("claim_review_case").time()
+async def claim_review_case(current_admin: Dict = Depends(get_current_admin)):
+    """Lease the most urgent unclaimed case to the current reviewer"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        case = claim_next_case(conn, current_admin["id"])
+    finally:
+        conn.close()
+    
+    if case:
+        log_admin_activity(current_admin["id"], "CLAIM_CASE", f"Claimed case {case['id']}")
+    
+    return {"case": case}
+
+@admin_router.post("/review-queue/{case_id}/resolve")
+@ADMIN_QUERY_SECONDS.labels("resolve_review_case").time()
+async def resolve_review_case(
+    case_id: str,
+    body: ResolveCaseRequest,
+    current_admin: Dict = Depends(get_current_admin)
+):
+    """Resolve a case currently leased by this reviewer"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        case = resolve_case(conn, case_id, current_admin["id"], body.notes)
+    finally:
+        conn.close()
+    
+    if not case:
+        raise HTTPException(status_code=409, detail="Case is not claimed by you or the lease has expired")
+    
+    log_admin_activity(current_admin["id"], "RESOLVE_CASE", f"Resolved case {case_id}")
+    
+    return {"case": case}
+
+@admin_router.post("/review-queue/{case_id}/release")
+@ADMIN_QUERY_SECONDS.labels("release_review_case").time()
+async def release_review_case(
+    case_id: str,
+    current_admin: Dict = Depends(get_current_admin)
+):
+    """Return a claimed case to the queue"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        released = release_case(conn, case_id, current_admin["id"])
+    finally:
+        conn.close()
+    
+    if not released:
+        raise HTTPException(status_code=409, detail="Case is not claimed by you")
+    
+    return {"message": "Case released"}
+
+@admin_router.get("/review-queue/stats")
+@ADMIN_QUERY_SECONDS.labels("review_queue_stats").time()
+async def get_review_queue_stats(current_admin: Dict = Depends(get_current_admin)):
+    """Pending review count from the maintained counter"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        return {"pending": pending_count(conn)}
+    finally:
+        conn.close()
+
+class CreateAdminRequest(BaseModel):
+    username: str
+    email: str
+    password: str = Field(..., min_length=8)
+    full_name: Optional[str] = None
+    role: str = "admin"
+
+class UpdateAdminRequest(BaseModel):
+    full_name: Optional[str] = None
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+
+def _admin_summary(record: Dict) -> Dict:
+    return {**record, "is_active": bool(record["is_active"])}
+
+def _check_role(role: Optional[str]) -> None:
+    if role is not None and role not in ADMIN_ROLES:
+        raise HTTPException(status_code=400, detail=f"Role must be one of {', '.join(ADMIN_ROLES)}")
+
+@admin_router.get("/admins")
+@ADMIN_QUERY_SECONDS.labels("list_admins").time()
+async def list_admins(current_admin: Dict = Depends(require_superadmin)):
+    """All admin accounts"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, username, email, full_name, role, is_active, created_at, last_login
+        FROM admin_users
+        ORDER BY id
+    """)
+    columns = [column[0] for column in cursor.description]
+    admins = [_admin_summary(dict(zip(columns, row))) for row in cursor.fetchall()]
+    conn.close()
+    
+    return {"admins": admins, "total": len(admins)}
+
+@admin_router.post("/admins", status_code=201)
+@ADMIN_QUERY_SECONDS.labels("create_admin").time()
+async def create_admin(body: CreateAdminRequest, current_admin: Dict = Depends(require_superadmin)):
+    """Create an admin account"""
+    _check_role(body.role)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO admin_users (username, email, password_hash, full_name, role)
+            VALUES (?, ?, ?, ?, ?)
+        """, (body.username, body.email, hash_password(body.password), body.full_name, body.role))
+        conn.commit()
+    except sqlite3.IntegrityError:
+        conn.close()
+        raise HTTPException(status_code=409, detail="Username or email already in use")
+    admin = fetch_admin(conn, cursor.lastrowid)
+    conn.close()
+    
+    log_admin_activity(current_admin["id"], "CREATE_ADMIN", f"Created admin {body.username} ({body.role})")
+    
+    return _admin_summary(admin)
+
+@admin_router.patch("/admins/{admin_id}")
+@ADMIN_QUERY_SECONDS.labels("update_admin").time()
+async def update_admin(
+    admin_id: int,
+    body: UpdateAdminRequest,
+    current_admin: Dict = Depends(require_superadmin)
+):
+    """Change an admin's name, role or active flag; role and activation changes apply on the next request"""
+    _check_role(body.role)
+    if admin_id == current_admin["id"] and (body.is_active is False or body.role not in (None, current_admin["role"])):
+        raise HTTPException(status_code=400, detail="You cannot deactivate or demote yourself")
+    
+    # Only fields the client sent are written; full_name is the one column that may be cleared
+    changes = {
+        key: value for key, value in body.model_dump(exclude_unset=True).items()
+        if value is not None or key == "full_name"
+    }
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        if changes:
+            assignments = ", ".join(f"{column} = ?" for column in changes)
+            conn.execute(
+                f"UPDATE admin_users SET {assignments} WHERE id = ?",
+                [int(value) if isinstance(value, bool) else value for value in changes.values()] + [admin_id],
+            )
+            conn.commit()
+        admin = fetch_admin(conn, admin_id)
+    finally:
+        conn.close()
+    
+    if admin is None:
+        raise HTTPException(status_code=404, detail="Admin not found")
+    
+    # Revoke cached identities everywhere before anyone else can act on the old role
+    if "role" in changes or "is_active" in changes:
+        bump_revocation_stamp(revocation_stamp_path(DB_FILE))
+    admin_identity_cache.invalidate(admin_id)
+    
+    if changes:
+        log_admin_activity(current_admin["id"], "UPDATE_ADMIN", f"Admin {admin_id}: {changes}")
+    
+    return _admin_summary(admin)
+
 # Initialize admin database on import
 init_admin_db()
@@ -0,0 +1,103 @@
+"""
+Admin identity cache
+get_current_admin resolves active admin records from a bounded in-process LRU instead of
+querying admin_users on every request. Changes to is_active or role go through the admin
+management API. It evicts the record and bumps a revocation stamp file next to the database,
+and every worker checks that stamp (one stat, no query) before trusting its cache. A
+revocation therefore applies on the next request in every process.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+ADMIN_IDENTITY_CACHE_SIZE = int(os.getenv("ADMIN_IDENTITY_CACHE_SIZE", "256"))
+
+ADMIN_ROLES = ("admin", "superadmin")
+
+ADMIN_COLUMNS = ("id", "username", "email", "full_name", "role", "is_active")
+
+
+def fetch_admin(conn: sqlite3.Connection, admin_id) -> Optional[Dict]:
+    """The admin record, including inactive ones"""
+    row = conn.execute(
+        f"SELECT {', '.join(ADMIN_COLUMNS)} FROM admin_users WHERE id = ?", (admin_id,)
+    ).fetchone()
+    return dict(zip(ADMIN_COLUMNS, row)) if row else None
+
+
+def revocation_stamp_path(db_file: str) -> str:
+    return f"{db_file}-admin-revocations"
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def bump_revocation_stamp(path: str) -> None:
+    """Replace the stamp file so every process sees a new inode on its next check"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("")
+    os.replace(tmp_path, path)
+
+
+class AdminIdentityCache:
+    """Bounded LRU of active admin records keyed by admin id"""
+
+    def __init__(self, max_size: int = ADMIN_IDENTITY_CACHE_SIZE):
+        self.max_size = max_size
+        self._records: "OrderedDict[int, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._seen_stamp: Optional[Tuple[int, int]] = None
+        self._stamp_path: Optional[str] = None
+        # Bumped by every invalidation; records read before a change are not stored after it
+        self.version = 0
+
+    def sync(self, stamp_path: str) -> None:
+        """Drop everything if another process (or this one) revoked an admin since the last check"""
+        stamp = _stamp(stamp_path)
+        if stamp == self._seen_stamp and stamp_path == self._stamp_path:
+            return
+        with self._lock:
+            self.version += 1
+            self._records.clear()
+            self._seen_stamp = stamp
+            self._stamp_path = stamp_path
+
+    def get(self, admin_id: int) -> Optional[Dict]:
+        with self._lock:
+            record = self._records.get(admin_id)
+            if record is not None:
+                self._records.move_to_end(admin_id)
+            return record
+
+    def put(self, admin_id: int, record: Dict, version: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._records[admin_id] = record
+            self._records.move_to_end(admin_id)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+
+    def invalidate(self, admin_id: int) -> None:
+        with self._lock:
+            self.version += 1
+            self._records.pop(admin_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._records.clear()
+
+
+admin_identity_cache = AdminIdentityCache()
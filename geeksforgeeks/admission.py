@@ -0,0 +1,193 @@
+"""
+Admission control for /api/triage
+Requests that pre-screen as emergencies (a full match of an immediate-urgency rule, no LLM) are always admitted
+immediately and answered with template explanations. Everything else passes a per-user token
+bucket and a global concurrency cap with a short bounded queue; under pressure it degrades to
+template explanations, and past that it is shed with 429 + Retry-After.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Hashable, NamedTuple
+
+try:
+    from .metrics import Counter, Gauge
+    from .rule_index import RequestFacts
+    from .symptom_groups import entry_phrases
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter, Gauge  # type: ignore
+    from rule_index import RequestFacts  # type: ignore
+    from symptom_groups import entry_phrases  # type: ignore
+
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "32"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+ADMISSION_DEGRADE_RATIO = float(os.getenv("ADMISSION_DEGRADE_RATIO", "0.75"))
+ADMISSION_USER_RATE = float(os.getenv("ADMISSION_USER_RATE", "1.0"))
+ADMISSION_USER_BURST = float(os.getenv("ADMISSION_USER_BURST", "60"))
+ADMISSION_MAX_TRACKED_USERS = 10000
+
+EMERGENCY_URGENCY = "immediate"
+
+ADMISSION_QUEUE_DEPTH = Gauge("triage_admission_queue_depth", "Triage requests waiting for an evaluation slot")
+ADMISSION_IN_FLIGHT = Gauge("triage_admission_in_flight", "Non-emergency triage evaluations holding a slot")
+ADMISSION_SHED = Counter("triage_admission_shed_total", "Triage requests rejected with 429", ["reason"])
+ADMISSION_DEGRADED = Counter("triage_admission_degraded_total", "Triage requests answered without the LLM due to load")
+ADMISSION_BYPASSED = Counter("triage_admission_emergency_bypass_total", "Emergency triage requests that skipped admission")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the suggested Retry-After in seconds"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Admission(NamedTuple):
+    emergency: bool
+    use_llm: bool
+    holds_slot: bool
+
+
+def prescreen_emergency(evaluator, request) -> bool:
+    """True when the request fully matches a condition of an immediate-urgency rule"""
+    compiled = evaluator.compiled
+    facts = RequestFacts.from_request(request)
+    for condition_id in compiled.candidates(facts, check_duration=False):
+        rule = compiled.rules[compiled.condition_rule[condition_id]]
+        if evaluator.triage_labels.get(rule["triage_label"], {}).get("urgency") != EMERGENCY_URGENCY:
+            continue
+        condition = compiled.conditions[condition_id]
+        # Fragments like "a" or "pain" reach rules only through the reverse substring test;
+        # skipping admission needs a whole rule phrase inside a reported symptom
+        if not any(phrase.lower().strip() in symptom
+                   for phrase in entry_phrases(condition) for symptom in facts.symptoms):
+            continue
+        if evaluator.match_severity(request.severity, condition.get("severity", [])) and \
+                evaluator.match_additional_factors(
+                    request.additional_factors or [], condition.get("additional_factors", [])
+                ):
+            return True
+    return False
+
+
+class TokenBuckets:
+    """Per-key token buckets, bounded to the most recently seen keys"""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = ADMISSION_MAX_TRACKED_USERS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: Hashable) -> float:
+        """Consume a token; returns 0 on success or the seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate if self.rate > 0 else float("inf")
+            self._buckets[key] = [tokens, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionController:
+    """Token buckets plus a global concurrency cap with a bounded FIFO wait queue"""
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        degrade_ratio: float = ADMISSION_DEGRADE_RATIO,
+        user_rate: float = ADMISSION_USER_RATE,
+        user_burst: float = ADMISSION_USER_BURST,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.degrade_at = max(1, math.ceil(max_concurrent * degrade_ratio))
+        self.buckets = TokenBuckets(user_rate, user_burst)
+        self.in_flight = 0
+        # Accessed only from the event loop thread
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters))
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    async def admit(self, user_key: Hashable, emergency: bool) -> Admission:
+        if emergency:
+            ADMISSION_BYPASSED.inc()
+            return Admission(emergency=True, use_llm=False, holds_slot=False)
+
+        wait = self.buckets.take(user_key)
+        if wait:
+            ADMISSION_SHED.labels("rate_limited").inc()
+            raise AdmissionRejected("rate_limited", wait)
+
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            degraded = self.in_flight > self.degrade_at
+        else:
+            if len(self._waiters) >= self.max_queue:
+                ADMISSION_SHED.labels("overloaded").inc()
+                raise AdmissionRejected("overloaded", self.queue_timeout)
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._publish()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+                self._abandon(waiter)
+                if isinstance(exc, asyncio.CancelledError):
+                    raise
+                ADMISSION_SHED.labels("overloaded").inc()
+                raise AdmissionRejected("overloaded", self.queue_timeout)
+            # Having queued means the system is saturated
+            degraded = True
+
+        if degraded:
+            ADMISSION_DEGRADED.inc()
+        return Admission(emergency=False, use_llm=not degraded, holds_slot=True)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up; pass it on
+            self.release(Admission(emergency=False, use_llm=False, holds_slot=True))
+            return
+        waiter.cancel()
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+        self._publish()
+
+    def release(self, admission: Admission) -> None:
+        if not admission.holds_slot:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the oldest waiter
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import json
 import os
@@ -16,6 +17,11 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+try:
+    from .metrics import AUTH_SECONDS, TrackedConnection
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import AUTH_SECONDS, TrackedConnection  # type: ignore
+
 # Load environment variables
 load_dotenv()
 
@@ -31,8 +37,19 @@ COOKIE_SAMESITE = os.getenv("AUTH_COOKIE_SAMESITE", "lax")
 STATE_TTL_SECONDS = int(os.getenv("AUTH_STATE_TTL_SECONDS", "600"))
 ENABLE_DEV_LOGIN = os.getenv("ENABLE_DEV_LOGIN", "true").lower() == "true"
 
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+# Outbound OAuth HTTP: one pooled client per worker (keep-alive, HTTP/2 when h2 is installed)
+OAUTH_HTTP_TIMEOUT = float(os.getenv("OAUTH_HTTP_TIMEOUT", "10"))
+OAUTH_CONNECT_TIMEOUT = float(os.getenv("OAUTH_CONNECT_TIMEOUT", "5"))
+OAUTH_MAX_CONNECTIONS = int(os.getenv("OAUTH_MAX_CONNECTIONS", "100"))
+OAUTH_MAX_KEEPALIVE = int(os.getenv("OAUTH_MAX_KEEPALIVE", "20"))
+OAUTH_KEEPALIVE_EXPIRY = float(os.getenv("OAUTH_KEEPALIVE_EXPIRY", "30"))
+
+# Point both providers at the built-in stub (oauth_stub.py) for offline login load tests
+OAUTH_STUB_ENABLED = os.getenv("OAUTH_STUB_ENABLED", "false").lower() == "true"
+_STUB_DEFAULT = "stub" if OAUTH_STUB_ENABLED else None
+
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", _STUB_DEFAULT)
+GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", _STUB_DEFAULT)
 GOOGLE_REDIRECT_URI = os.getenv(
     "GOOGLE_REDIRECT_URI",
     f"{BACKEND_BASE_URL}/api/auth/google/callback",
@@ -42,13 +59,39 @@ GOOGLE_REDIRECT_URI = os.getenv(
 print(f"[AUTH CONFIG] Google Client ID loaded: {GOOGLE_CLIENT_ID[:20] if GOOGLE_CLIENT_ID else 'NOT SET'}...")
 print(f"[AUTH CONFIG] Google OAuth configured: {GOOGLE_CLIENT_ID is not None}")
 
-GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
-GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
+GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID", _STUB_DEFAULT)
+GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET", _STUB_DEFAULT)
 GITHUB_REDIRECT_URI = os.getenv(
     "GITHUB_REDIRECT_URI",
     f"{BACKEND_BASE_URL}/api/auth/github/callback",
 )
 
+
+def provider_endpoints(stub_base_url: Optional[str] = None) -> Dict[str, str]:
+    """Provider URLs; with a stub base URL every call goes to the local stub instead"""
+    if stub_base_url:
+        return {
+            "google_authorize": f"{stub_base_url}/google/authorize",
+            "google_token": f"{stub_base_url}/google/token",
+            "google_userinfo": f"{stub_base_url}/google/userinfo",
+            "github_authorize": f"{stub_base_url}/github/authorize",
+            "github_token": f"{stub_base_url}/github/token",
+            "github_user": f"{stub_base_url}/github/user",
+            "github_emails": f"{stub_base_url}/github/user/emails",
+        }
+    return {
+        "google_authorize": "https://accounts.google.com/o/oauth2/v2/auth",
+        "google_token": "https://oauth2.googleapis.com/token",
+        "google_userinfo": "https://www.googleapis.com/oauth2/v1/userinfo",
+        "github_authorize": "https://github.com/login/oauth/authorize",
+        "github_token": "https://github.com/login/oauth/access_token",
+        "github_user": "https://api.github.com/user",
+        "github_emails": "https://api.github.com/user/emails",
+    }
+
+
+OAUTH_ENDPOINTS = provider_endpoints(f"{BACKEND_BASE_URL}/api/oauth-stub" if OAUTH_STUB_ENABLED else None)
+
 SUPPORTED_PROVIDERS = {"google", "github"}
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
@@ -57,6 +100,51 @@ security = HTTPBearer(auto_error=False)
 _state_store: Dict[str, Dict[str, str]] = {}
 
 
+class OAuthHTTPClient:
+    """Lazily created, pooled httpx.AsyncClient shared by every OAuth exchange
+
+    The app lifespan opens it at startup and closes it at shutdown. A client is bound to
+    the event loop that created it, so a call from another loop gets a fresh one.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _build(self) -> httpx.AsyncClient:
+        try:
+            import h2  # noqa: F401
+            http2 = self._transport is None
+        except ImportError:
+            http2 = False
+        return httpx.AsyncClient(
+            http2=http2,
+            transport=self._transport,
+            timeout=httpx.Timeout(OAUTH_HTTP_TIMEOUT, connect=OAUTH_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=OAUTH_MAX_CONNECTIONS,
+                max_keepalive_connections=OAUTH_MAX_KEEPALIVE,
+                keepalive_expiry=OAUTH_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = self._build()
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+oauth_http = OAuthHTTPClient()
+
+
 class AuthUser(BaseModel):
     id: str
     provider: str
@@ -78,7 +166,7 @@ class DevLoginRequest(BaseModel):
 
 
 def _init_user_table() -> None:
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -141,23 +229,23 @@ async def _exchange_google_code(code: str) -> Tuple[Dict[str, str], Dict[str, st
         "grant_type": "authorization_code",
     }
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        token_response = await client.post("https://oauth2.googleapis.com/token", data=data)
-        if token_response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to exchange Google code")
-        token_payload = token_response.json()
-        access_token = token_payload.get("access_token")
-        if not access_token:
-            raise HTTPException(status_code=400, detail="Google token response missing access token")
-
-        user_response = await client.get(
-            "https://www.googleapis.com/oauth2/v1/userinfo",
-            params={"alt": "json"},
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        if user_response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to fetch Google user profile")
-        user_payload = user_response.json()
+    client = oauth_http.get()
+    token_response = await client.post(OAUTH_ENDPOINTS["google_token"], data=data)
+    if token_response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to exchange Google code")
+    token_payload = token_response.json()
+    access_token = token_payload.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=400, detail="Google token response missing access token")
+
+    user_response = await client.get(
+        OAUTH_ENDPOINTS["google_userinfo"],
+        params={"alt": "json"},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if user_response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to fetch Google user profile")
+    user_payload = user_response.json()
 
     return token_payload, user_payload
 
@@ -173,39 +261,39 @@ async def _exchange_github_code(code: str) -> Tuple[Dict[str, str], Dict[str, st
         "redirect_uri": GITHUB_REDIRECT_URI,
     }
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        token_response = await client.post(
-            "https://github.com/login/oauth/access_token",
-            data=data,
-            headers={"Accept": "application/json"},
-        )
-        if token_response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to exchange GitHub code")
-        token_payload = token_response.json()
-        access_token = token_payload.get("access_token")
-        if not access_token:
-            raise HTTPException(status_code=400, detail="GitHub token response missing access token")
-
-        user_response = await client.get(
-            "https://api.github.com/user",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        if user_response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to fetch GitHub profile")
-        user_payload = user_response.json()
-
-        # Fetch primary email if not public
-        email = user_payload.get("email")
-        if not email:
-            email_response = await client.get(
-                "https://api.github.com/user/emails",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            if email_response.status_code == 200:
-                for entry in email_response.json():
-                    if entry.get("primary"):
-                        user_payload["email"] = entry.get("email")
-                        break
+    client = oauth_http.get()
+    token_response = await client.post(
+        OAUTH_ENDPOINTS["github_token"],
+        data=data,
+        headers={"Accept": "application/json"},
+    )
+    if token_response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to exchange GitHub code")
+    token_payload = token_response.json()
+    access_token = token_payload.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=400, detail="GitHub token response missing access token")
+
+    # The profile and the email list are independent; fetch them concurrently
+    headers = {"Authorization": f"Bearer {access_token}"}
+    user_response, email_response = await asyncio.gather(
+        client.get(OAUTH_ENDPOINTS["github_user"], headers=headers),
+        client.get(OAUTH_ENDPOINTS["github_emails"], headers=headers),
+        return_exceptions=True,
+    )
+    if isinstance(user_response, BaseException):
+        raise user_response
+    if user_response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Failed to fetch GitHub profile")
+    user_payload = user_response.json()
+
+    # Use the primary email if the profile email is not public
+    if not user_payload.get("email") and isinstance(email_response, httpx.Response) \
+            and email_response.status_code == 200:
+        for entry in email_response.json():
+            if entry.get("primary"):
+                user_payload["email"] = entry.get("email")
+                break
 
     return token_payload, user_payload
 
@@ -223,7 +311,7 @@ def _save_user(provider: str, profile: Dict[str, str]) -> AuthUser:
     if not name and email:
         name = email.split("@")[0].replace(".", " ").title()
 
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -306,7 +394,7 @@ def _build_google_auth_url(state: str) -> str:
         "access_type": "offline",
         "prompt": "select_account",
     }
-    return f"https://accounts.google.com/o/oauth2/v2/auth?{urllib.parse.urlencode(params)}"
+    return f"{OAUTH_ENDPOINTS['google_authorize']}?{urllib.parse.urlencode(params)}"
 
 
 def _build_github_auth_url(state: str) -> str:
@@ -317,7 +405,7 @@ def _build_github_auth_url(state: str) -> str:
         "state": state,
         "allow_signup": "true",
     }
-    return f"https://github.com/login/oauth/authorize?{urllib.parse.urlencode(params)}"
+    return f"{OAUTH_ENDPOINTS['github_authorize']}?{urllib.parse.urlencode(params)}"
 
 
 def _build_auth_url(provider: str, state: str) -> str:
@@ -372,7 +460,7 @@ async def oauth_callback(provider: str, request: Request, code: Optional[str] =
 
 
 def _fetch_user_by_id(user_id: str) -> Optional[AuthUser]:
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     cursor.execute(
         "SELECT id, provider, email, name, avatar_url FROM users WHERE id = ?",
@@ -385,6 +473,7 @@ def _fetch_user_by_id(user_id: str) -> Optional[AuthUser]:
     return AuthUser(id=row[0], provider=row[1], email=row[2], name=row[3], avatar_url=row[4])
 
 
+@AUTH_SECONDS.time()
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -0,0 +1,359 @@
+"""
+NumPy bitset rule-matrix engine for bulk and offline triage
+Interns every normalized rule phrase into a bit position, encodes a batch of requests as
+bitset rows and evaluates all requests against all conditions with vectorized operations.
+Produces the same labels, matched rules and confidence scores as TriageEvaluator, including
+its correction of misspelt symptoms and factors.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .rule_index import INF, Interval, parse_duration, parse_duration_constraint, parse_temperature
+    from .symptom_groups import has_groups
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from rule_index import (  # type: ignore
+        INF,
+        Interval,
+        parse_duration,
+        parse_duration_constraint,
+        parse_temperature,
+    )
+    from symptom_groups import has_groups  # type: ignore
+
+DEFAULT_TRIAGE_LABEL = "SELF_CARE_MONITOR"
+DEFAULT_CONFIDENCE = 0.3
+DEFAULT_BATCH_SIZE = 100_000
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+_TERM_CACHE_SIZE = 100_000
+
+
+def _field(request: Any, name: str) -> Any:
+    """Read a request field from a TriageRequest or a plain payload dict"""
+    if isinstance(request, dict):
+        return request.get(name)
+    return getattr(request, name, None)
+
+
+def _normalize(text: str) -> str:
+    return text.lower().strip()
+
+
+class _PhraseVocabulary:
+    """Interned rule phrases; user terms map to bitsets of the phrases they match"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = list(dict.fromkeys(_normalize(p) for p in phrases))
+        self.ids = {phrase: i for i, phrase in enumerate(self.phrases)}
+        self.words = max(1, (len(self.phrases) + _WORD_BITS - 1) // _WORD_BITS)
+        self._term_bits: Dict[str, int] = {}
+
+    def term_bits(self, term: str) -> int:
+        """Bitset of phrases matching a normalized user term (substring either way)"""
+        bits = self._term_bits.get(term)
+        if bits is None:
+            bits = 0
+            for i, phrase in enumerate(self.phrases):
+                if phrase in term or term in phrase:
+                    bits |= 1 << i
+            if len(self._term_bits) >= _TERM_CACHE_SIZE:
+                self._term_bits.clear()
+            self._term_bits[term] = bits
+        return bits
+
+    def phrase_bits(self, phrases: Sequence[str]) -> int:
+        bits = 0
+        for phrase in phrases:
+            bits |= 1 << self.ids[_normalize(phrase)]
+        return bits
+
+    def to_words(self, values: Sequence[int]) -> np.ndarray:
+        """Split Python-int bitsets into an (n, words) uint64 matrix"""
+        matrix = np.empty((len(values), self.words), dtype=np.uint64)
+        for word in range(self.words):
+            shift = word * _WORD_BITS
+            matrix[:, word] = np.fromiter(
+                ((value >> shift) & _WORD_MASK for value in values), dtype=np.uint64, count=len(values)
+            )
+        return matrix
+
+
+def _interval_mask(values: np.ndarray, interval: Interval) -> np.ndarray:
+    """Vectorized Interval.contains; NaN never matches"""
+    low = values > interval.low if not interval.low_inclusive else values >= interval.low
+    high = values < interval.high if not interval.high_inclusive else values <= interval.high
+    return low & high
+
+
+class BulkTriageEngine:
+    """Vectorized twin of TriageEvaluator.classify for large batches of requests"""
+
+    def __init__(self, evaluator):
+        compiled = evaluator.compiled
+        self.compiled = compiled
+        self.rules = compiled.rules
+        self.labels = sorted({rule["triage_label"] for rule in self.rules} | {DEFAULT_TRIAGE_LABEL})
+        self.rule_label_index = np.array(
+            [self.labels.index(rule["triage_label"]) for rule in self.rules], dtype=np.int64
+        )
+        self.default_label_index = self.labels.index(DEFAULT_TRIAGE_LABEL)
+        # Rules are already priority ordered, so rank is the argmin key
+        self.rule_rank = np.arange(len(self.rules), dtype=np.int64)
+
+        conditions = compiled.conditions
+        self.symptoms = _PhraseVocabulary(p for c in conditions for p in c.get("symptoms", []) or [])
+        self.factors = _PhraseVocabulary(
+            p for c in conditions for p in c.get("additional_factors", []) or []
+        )
+        self.symptom_masks = self.symptoms.to_words(
+            [self.symptoms.phrase_bits(c.get("symptoms", []) or []) for c in conditions]
+        )
+        self.factor_masks = self.factors.to_words(
+            [self.factors.phrase_bits(c.get("additional_factors", []) or []) for c in conditions]
+        )
+        self.factor_required = np.array(
+            [bool(c.get("additional_factors", [])) for c in conditions], dtype=bool
+        )
+        # Conditions made only of symptom groups are decided by their compiled predicate
+        self.symptom_required = np.array(
+            [bool(c.get("symptoms", [])) or not has_groups(c) for c in conditions], dtype=bool
+        )
+        self.groups = compiled.groups
+        self.corrector = evaluator.corrector
+        self._build_severity_table(conditions)
+        self._build_duration_tables(conditions)
+
+        # condition -> rule membership as an (n_conditions, n_rules) matrix
+        self.condition_rule = np.zeros((len(conditions), len(self.rules)), dtype=bool)
+        for condition_id, rule_pos in enumerate(compiled.condition_rule):
+            self.condition_rule[condition_id, rule_pos] = True
+
+    def _build_severity_table(self, conditions: Sequence[Dict]) -> None:
+        """Rows: missing severity, unknown severity, then each interned severity"""
+        vocabulary = list(dict.fromkeys(
+            _normalize(s) for c in conditions for s in c.get("severity", []) or []
+        ))
+        self.severity_ids = {severity: i + 2 for i, severity in enumerate(vocabulary)}
+        table = np.zeros((len(vocabulary) + 2, len(conditions)), dtype=bool)
+        for condition_id, condition in enumerate(conditions):
+            rule_severity = condition.get("severity", []) or []
+            allows_any = "any" in rule_severity
+            normalized = {_normalize(s) for s in rule_severity}
+            table[0, condition_id] = allows_any or len(rule_severity) == 0
+            table[1, condition_id] = allows_any
+            for severity, row in self.severity_ids.items():
+                table[row, condition_id] = allows_any or severity in normalized
+        self.severity_table = table
+
+    def _build_duration_tables(self, conditions: Sequence[Dict]) -> None:
+        self.flag_names = sorted({
+            flag for c in conditions for term in c.get("duration", []) or []
+            for flag in parse_duration_constraint(term)[1]
+        })
+        self.flag_bits = {flag: 1 << i for i, flag in enumerate(self.flag_names)}
+        self.duration_rules: List[Tuple[int, List[Interval], int]] = []
+        for condition_id, condition in enumerate(conditions):
+            terms = condition.get("duration", []) or []
+            if not terms:
+                continue
+            intervals: List[Interval] = []
+            flags = 0
+            for term in terms:
+                term_intervals, term_flags = parse_duration_constraint(term)
+                intervals.extend(term_intervals)
+                for flag in term_flags:
+                    flags |= self.flag_bits[flag]
+            self.duration_rules.append((condition_id, intervals, flags))
+
+    def _encode(self, requests: Sequence[Any]) -> Dict[str, Any]:
+        """Per-request Python pass: intern terms and parse numeric fields once"""
+        symptom_bits: List[int] = []
+        group_bits: List[int] = []
+        factor_bits: List[int] = []
+        severity_rows = np.empty(len(requests), dtype=np.int64)
+        temperature_text: List[Optional[str]] = []
+        temperature_f = np.full(len(requests), np.nan)
+        age = np.full(len(requests), np.nan)
+        duration_low = np.full(len(requests), np.nan)
+        duration_high = np.full(len(requests), np.nan)
+        duration_flags = np.zeros(len(requests), dtype=np.int64)
+        duration_known = np.zeros(len(requests), dtype=bool)
+        confidence = np.empty(len(requests))
+        temperature_cache: Dict[str, Optional[float]] = {}
+
+        for i, request in enumerate(requests):
+            # Same typo correction as TriageEvaluator.correct_request
+            symptoms, factors, _ = self.corrector.correct(
+                list(_field(request, "symptoms") or []), list(_field(request, "additional_factors") or [])
+            )
+            symptoms = [_normalize(symptom) for symptom in symptoms]
+            bits = 0
+            for symptom in symptoms:
+                bits |= self.symptoms.term_bits(symptom)
+            symptom_bits.append(bits)
+            if self.groups.predicates:
+                group_bits.append(self.groups.request_bits(symptoms))
+
+            bits = 0
+            for factor in factors:
+                bits |= self.factors.term_bits(_normalize(factor))
+            factor_bits.append(bits)
+
+            severity = _field(request, "severity")
+            severity_rows[i] = self.severity_ids.get(_normalize(severity), 1) if severity else 0
+
+            temperature = _field(request, "temperature")
+            temperature_text.append(_normalize(temperature) if temperature else None)
+            if temperature:
+                if temperature not in temperature_cache:
+                    temperature_cache[temperature] = parse_temperature(temperature)
+                parsed = temperature_cache[temperature]
+                if parsed is not None:
+                    temperature_f[i] = parsed
+
+            patient_age = _field(request, "patient_age")
+            if patient_age is not None:
+                age[i] = float(patient_age)
+
+            info = parse_duration(_field(request, "duration"))
+            if info is not None and info.known:
+                duration_known[i] = True
+                if info.min_hours is not None:
+                    duration_low[i] = info.min_hours
+                    duration_high[i] = INF if info.max_hours is None else info.max_hours
+                flags = 0
+                for flag in info.flags:
+                    flags |= self.flag_bits.get(flag, 0)
+                duration_flags[i] = flags
+
+            # Same float operations, in the same order, as TriageEvaluator.confidence_for
+            score = 0.7
+            if severity: score += 0.1
+            if factors: score += 0.1
+            if temperature: score += 0.1
+            confidence[i] = min(score, 1.0)
+
+        return {
+            "symptoms": self.symptoms.to_words(symptom_bits),
+            "group_bits": group_bits,
+            "factors": self.factors.to_words(factor_bits),
+            "severity_rows": severity_rows,
+            "temperature_text": temperature_text,
+            "temperature_f": temperature_f,
+            "age": age,
+            "duration_low": duration_low,
+            "duration_high": duration_high,
+            "duration_flags": duration_flags,
+            "duration_known": duration_known,
+            "confidence": confidence,
+        }
+
+    @staticmethod
+    def _any_bits(rows: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """(n, words) x (conditions, words) -> (n, conditions) 'shares a bit'"""
+        result = np.zeros((rows.shape[0], masks.shape[0]), dtype=bool)
+        for condition_id in range(masks.shape[0]):
+            result[:, condition_id] = ((rows & masks[condition_id]) != 0).any(axis=1)
+        return result
+
+    def _condition_matrix(self, encoded: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """(n, conditions) boolean matrices: conditions matching on everything but duration,
+        and conditions whose duration constraint accepts the request"""
+        matched = self._any_bits(encoded["symptoms"], self.symptom_masks) | ~self.symptom_required
+        group_bits = encoded["group_bits"]
+        for condition_id, predicate in self.groups.predicates.items():
+            matched[:, condition_id] &= np.fromiter(
+                (predicate(bits) for bits in group_bits), dtype=bool, count=len(group_bits)
+            )
+        matched &= self.severity_table[encoded["severity_rows"]]
+        factors = self._any_bits(encoded["factors"], self.factor_masks)
+        matched &= factors | ~self.factor_required
+
+        has_temperature = np.array([text is not None for text in encoded["temperature_text"]], dtype=bool)
+        for constraint, values, has_value in (
+            (self.compiled.temperature, encoded["temperature_f"], has_temperature),
+            (self.compiled.age, encoded["age"], ~np.isnan(encoded["age"])),
+        ):
+            for condition_id in constraint.constrained:
+                accepted = np.zeros(len(values), dtype=bool)
+                for interval in constraint.intervals.get(condition_id, []):
+                    accepted |= _interval_mask(values, interval)
+                tokens = constraint.text_tokens.get(condition_id)
+                if tokens and constraint is self.compiled.temperature:
+                    # Non-numeric rule temperatures keep the evaluator's substring test
+                    accepted |= np.array([
+                        text is not None and any(token in text for token in tokens)
+                        for text in encoded["temperature_text"]
+                    ], dtype=bool)
+                matched[:, condition_id] &= accepted | ~has_value
+
+        timed = np.ones_like(matched)
+        low, high = encoded["duration_low"], encoded["duration_high"]
+        has_hours = ~np.isnan(low)
+        for condition_id, intervals, flags in self.duration_rules:
+            accepted = (encoded["duration_flags"] & flags) != 0
+            for interval in intervals:
+                below = (interval.high < low) | ((interval.high == low) & (not interval.high_inclusive))
+                above = (high < interval.low) | ((high == interval.low) & (not interval.low_inclusive))
+                accepted |= has_hours & ~below & ~above
+            timed[:, condition_id] = accepted | ~encoded["duration_known"]
+        return matched, timed
+
+    def _resolve_labels(self, rule_matched: np.ndarray) -> np.ndarray:
+        label_index = np.full(rule_matched.shape[0], self.default_label_index, dtype=np.int64)
+        if len(self.rules):
+            # Priority resolution: argmin over the ranks of matched rules
+            ranks = np.where(rule_matched, self.rule_rank, len(self.rules))
+            best = ranks.argmin(axis=1)
+            any_match = rule_matched.any(axis=1)
+            label_index[any_match] = self.rule_label_index[best[any_match]]
+        return label_index
+
+    def evaluate_arrays(self, requests: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (label_index, rule_matched, rule_confidence) arrays for one batch"""
+        encoded = self._encode(requests)
+        conditions, timed = self._condition_matrix(encoded)
+        membership = self.condition_rule.astype(np.uint8)
+        rule_matched = (conditions.astype(np.uint8) @ membership) > 0
+        rule_timed = ((conditions & timed).astype(np.uint8) @ membership) > 0
+
+        # As in TriageEvaluator.match_rules, durations only narrow matches that keep the label
+        label_index = self._resolve_labels(rule_matched)
+        keep_timed = self._resolve_labels(rule_timed) == label_index
+        rule_matched = np.where(keep_timed[:, None], rule_timed, rule_matched)
+        return label_index, rule_matched, encoded["confidence"]
+
+    def classify_batch(self, requests: Sequence[Any], batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict]:
+        """Label, matched rules and confidence for every request, as TriageEvaluator reports them"""
+        results: List[Dict] = []
+        for start in range(0, len(requests), batch_size):
+            batch = requests[start:start + batch_size]
+            label_index, rule_matched, rule_confidence = self.evaluate_arrays(batch)
+            for i in range(len(batch)):
+                confidence = float(rule_confidence[i])
+                matched_rules = [
+                    {
+                        "id": self.rules[rule_pos]["id"],
+                        "name": self.rules[rule_pos]["name"],
+                        "category": self.rules[rule_pos]["category"],
+                        "confidence": confidence,
+                    }
+                    for rule_pos in np.flatnonzero(rule_matched[i])
+                ]
+                results.append({
+                    "triage_label": self.labels[label_index[i]],
+                    "matched_rules": matched_rules,
+                    "confidence_score": confidence if matched_rules else DEFAULT_CONFIDENCE,
+                })
+        return results
+
+    def label_counts(self, requests: Sequence[Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """Aggregate label counts without materializing per-request results"""
+        counts = np.zeros(len(self.labels), dtype=np.int64)
+        for start in range(0, len(requests), batch_size):
+            label_index, _, _ = self.evaluate_arrays(requests[start:start + batch_size])
+            counts += np.bincount(label_index, minlength=len(self.labels))
+        return {label: int(count) for label, count in zip(self.labels, counts)}
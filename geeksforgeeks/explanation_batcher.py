@@ -0,0 +1,160 @@
+"""
+Micro-batched LLM explanations
+Explanation jobs arriving within a short window (or until the batch is full) are packed into
+one chat completion that asks for a JSON array with one explanation per case. The answers are
+split back to the waiting requests. An item the model left out or mangled fails on its own,
+and its caller falls back to the rule's explanation_template. A lone job keeps the
+single-case prompt.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .metrics import Counter
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter  # type: ignore
+
+LLM_BATCH_WINDOW_MS = float(os.getenv("LLM_BATCH_WINDOW_MS", "20"))
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
+
+# The stub in openai_stub.py looks for this marker to answer batched prompts
+CASES_MARKER = "CASES_JSON:"
+
+LLM_BATCHES = Counter("triage_llm_batches_total", "LLM explanation calls sent", ["size"])
+LLM_BATCH_ITEM_FAILURES = Counter(
+    "triage_llm_batch_item_failures_total", "Batched cases whose explanation could not be parsed"
+)
+
+
+class MissingExplanation(ValueError):
+    """The batched response had no usable explanation for this case"""
+
+
+def build_batch_prompt(cases: Sequence[Dict[str, Any]]) -> str:
+    """One prompt covering every case; the reply must be a JSON array in case order"""
+    return f"""
+As a healthcare triage assistant, write a clear, empathetic explanation for each triage
+recommendation below. For every case, acknowledge the patient's symptoms, explain why this
+triage level is recommended and give clear next steps, in 2-3 sentences. Keep the tone
+professional and reassuring while being appropriately urgent when necessary.
+
+Reply with only a JSON array of {len(cases)} strings, the explanation for case 1 first, in the
+same order as the cases. Do not add any other text.
+
+{CASES_MARKER}
+{json.dumps(list(cases), indent=1)}
+"""
+
+
+def parse_batch_response(content: Optional[str], count: int) -> List[Optional[str]]:
+    """Explanations by case position; None where the reply has no usable text for a case"""
+    if not content:
+        return [None] * count
+    start, end = content.find("["), content.rfind("]")
+    try:
+        items = json.loads(content[start:end + 1]) if start != -1 and end > start else None
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        return [None] * count
+
+    explanations: List[Optional[str]] = []
+    for position in range(count):
+        item = items[position] if position < len(items) else None
+        if isinstance(item, dict):
+            item = item.get("explanation")
+        explanations.append(item.strip() if isinstance(item, str) and item.strip() else None)
+    return explanations
+
+
+class ExplanationBatcher:
+    """Collects explanation jobs from request threads and dispatches them in batches"""
+
+    def __init__(
+        self,
+        explain_one: Callable[..., str],
+        explain_many: Callable[[List[Tuple]], List[Optional[str]]],
+        window_seconds: float = LLM_BATCH_WINDOW_MS / 1000,
+        max_size: int = LLM_BATCH_MAX_SIZE,
+        concurrency: int = LLM_BATCH_CONCURRENCY,
+    ):
+        self.explain_one = explain_one
+        self.explain_many = explain_many
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self._jobs: "queue.Queue[Tuple[Tuple, Future]]" = queue.Queue()
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0 and self.max_size > 1
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._start_lock:
+            if not self._started:
+                self._pool = ThreadPoolExecutor(self.concurrency, thread_name_prefix="llm-batch")
+                threading.Thread(target=self._collect, name="llm-batcher", daemon=True).start()
+                self._started = True
+
+    def submit(self, *args) -> Future:
+        future: Future = Future()
+        if not self.enabled:
+            self._dispatch([(args, future)])
+            return future
+        self._ensure_started()
+        self._jobs.put((args, future))
+        return future
+
+    def explain(self, *args, timeout: Optional[float] = None) -> str:
+        """Explanation for one case; raises whatever its batch (or its own item) failed with"""
+        return self.submit(*args).result(timeout)
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._jobs.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._jobs.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._pool.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[Tuple, Future]]) -> None:
+        LLM_BATCHES.labels(str(len(batch))).inc()
+        if len(batch) == 1:
+            args, future = batch[0]
+            try:
+                future.set_result(self.explain_one(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return
+
+        try:
+            explanations = self.explain_many([args for args, _ in batch])
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for position, (_, future) in enumerate(batch):
+            text = explanations[position] if position < len(explanations) else None
+            if text:
+                future.set_result(text)
+            else:
+                LLM_BATCH_ITEM_FAILURES.inc()
+                future.set_exception(MissingExplanation(f"No explanation for case {position + 1} in batch"))
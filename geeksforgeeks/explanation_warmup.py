@@ -0,0 +1,189 @@
+"""
+Pre-generated LLM explanations
+When rules load or reload, an optional background job generates one explanation per
+(rule, severity, duration bucket) through the LLM batcher, with bounded concurrency. It
+stores each one in a table keyed by rules version. The request path then serves these
+from memory with the reported symptoms merged in, so a warmed combination never waits on
+the LLM. Rows already stored for the current version are reused, so restarts and other
+workers do not regenerate them.
+"""
+
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .metrics import Counter, Gauge
+    from .rule_index import parse_duration
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter, Gauge  # type: ignore
+    from rule_index import parse_duration  # type: ignore
+
+EXPLANATION_WARMUP = os.getenv("EXPLANATION_WARMUP", "false").lower() == "true"
+EXPLANATION_WARMUP_CONCURRENCY = int(os.getenv("EXPLANATION_WARMUP_CONCURRENCY", "4"))
+
+STANDARD_SEVERITIES = ("mild", "moderate", "severe", "critical")
+UNSPECIFIED = "unspecified"
+
+# Bucket -> (upper bound in hours, representative phrase used in the warm-up prompt)
+DURATION_BUCKETS = {
+    "hours": (24.0, "a few hours"),
+    "days": (168.0, "3 days"),
+    "weeks": (730.0, "2 weeks"),
+    "months": (float("inf"), "2 months"),
+}
+
+PREGENERATED_ENTRIES = Gauge("triage_pregenerated_explanations", "Pre-generated explanations for the current rules")
+WARMUP_FAILURES = Counter("triage_explanation_warmup_failures_total", "Warm-up combinations the LLM could not explain")
+
+Key = Tuple[str, str, str]
+
+
+def init_explanation_store(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pregenerated_explanations (
+            rules_version TEXT NOT NULL,
+            rule_id TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            duration_bucket TEXT NOT NULL,
+            explanation TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (rules_version, rule_id, severity, duration_bucket)
+        )
+    """)
+
+
+def severity_key(severity: Optional[str]) -> str:
+    return severity.lower().strip() if severity and severity.strip() else UNSPECIFIED
+
+
+def duration_bucket(duration: Optional[str]) -> str:
+    info = parse_duration(duration)
+    if info is None or info.min_hours is None:
+        return UNSPECIFIED
+    for bucket, (upper, _) in DURATION_BUCKETS.items():
+        if info.min_hours < upper:
+            return bucket
+    return UNSPECIFIED
+
+
+def rule_severities(rule: Dict) -> List[str]:
+    """Severities a rule can match: its listed ones, all standard ones for 'any', plus unspecified"""
+    severities: Dict[str, None] = {}
+    for condition in rule.get("conditions", []) or []:
+        listed = [severity_key(s) for s in condition.get("severity") or []]
+        if not listed or "any" in listed:
+            severities.update(dict.fromkeys(STANDARD_SEVERITIES))
+        severities.update(dict.fromkeys(s for s in listed if s != "any"))
+    severities[UNSPECIFIED] = None
+    return list(severities)
+
+
+def enumerate_combinations(rules: Iterable[Dict]) -> List[Tuple[Dict, str, str]]:
+    buckets = [UNSPECIFIED, *DURATION_BUCKETS]
+    return [
+        (rule, severity, bucket)
+        for rule in rules
+        for severity in rule_severities(rule)
+        for bucket in buckets
+    ]
+
+
+def personalise(explanation: str, symptoms: List[str]) -> str:
+    """Merge the reported symptoms into a generic explanation, like the template path does"""
+    if symptoms:
+        return f"{explanation} Your reported symptoms include: {', '.join(symptoms)}."
+    return explanation
+
+
+class PregeneratedExplanations:
+    """In-memory explanations for one rules version"""
+
+    def __init__(self, rules_version: str, entries: Optional[Dict[Key, str]] = None):
+        self.rules_version = rules_version
+        self._entries: Dict[Key, str] = dict(entries or {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._entries
+
+    def add(self, key: Key, explanation: str) -> None:
+        self._entries[key] = explanation
+        PREGENERATED_ENTRIES.set(len(self._entries))
+
+    def lookup(self, rule_id: str, severity: Optional[str], duration: Optional[str]) -> Optional[str]:
+        return self._entries.get((rule_id, severity_key(severity), duration_bucket(duration)))
+
+
+def load_explanations(conn: sqlite3.Connection, rules_version: str) -> Dict[Key, str]:
+    rows = conn.execute("""
+        SELECT rule_id, severity, duration_bucket, explanation
+        FROM pregenerated_explanations WHERE rules_version = ?
+    """, (rules_version,)).fetchall()
+    return {(rule_id, severity, bucket): text for rule_id, severity, bucket, text in rows}
+
+
+def warm_explanations(evaluator, db_file: str, request_type,
+                      concurrency: int = EXPLANATION_WARMUP_CONCURRENCY) -> int:
+    """Fill evaluator.pregenerated for its current rules; returns how many were generated
+
+    Stops early if the rules are reloaded again while it runs.
+    """
+    version = evaluator.rules_version
+    conn = sqlite3.connect(db_file, check_same_thread=False)
+    store = PregeneratedExplanations(version, load_explanations(conn, version))
+    if evaluator.rules_version != version:
+        conn.close()
+        return 0
+    evaluator.pregenerated = store
+    PREGENERATED_ENTRIES.set(len(store))
+
+    missing = [
+        (rule, severity, bucket) for rule, severity, bucket in enumerate_combinations(evaluator.sorted_rules)
+        if (rule["id"], severity, bucket) not in store
+    ]
+    write_lock = threading.Lock()
+
+    def generate(combination) -> int:
+        rule, severity, bucket = combination
+        if evaluator.rules_version != version:
+            return 0
+        request = request_type(
+            symptoms=[f"symptoms of {rule.get('name', rule['id']).lower()}"],
+            severity=None if severity == UNSPECIFIED else severity,
+            duration=DURATION_BUCKETS[bucket][1] if bucket in DURATION_BUCKETS else None,
+        )
+        try:
+            explanation = evaluator.explanation_batcher.explain(rule, request)
+        except Exception:
+            WARMUP_FAILURES.inc()
+            return 0
+        with write_lock:
+            conn.execute("""
+                INSERT OR IGNORE INTO pregenerated_explanations
+                (rules_version, rule_id, severity, duration_bucket, explanation)
+                VALUES (?, ?, ?, ?, ?)
+            """, (version, rule["id"], severity, bucket, explanation))
+            conn.commit()
+        store.add((rule["id"], severity, bucket), explanation)
+        return 1
+
+    try:
+        with ThreadPoolExecutor(max(1, concurrency), thread_name_prefix="explanation-warmup") as pool:
+            generated = sum(pool.map(generate, missing))
+    finally:
+        conn.close()
+    return generated
+
+
+def start_warmup(evaluator, db_file: str, request_type) -> threading.Thread:
+    """Run warm_explanations in a daemon thread"""
+    thread = threading.Thread(
+        target=warm_explanations, args=(evaluator, db_file, request_type), name="explanation-warmup", daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,197 @@
+"""
+Typo-tolerant symptom matching
+A SymSpell (symmetric delete) index over every word of the rule vocabulary (symptom and
+additional-factor phrases) is built when rules load. A misspelt word is corrected by looking
+up its own deletes, which finds every vocabulary word within edit distance 1-2 without
+scanning the vocabulary. A correction must keep the word's first letter and complete a whole
+vocabulary phrase within an edit budget relative to that phrase's length, and words used
+anywhere in the rules are never rewritten, so real words like "wheezing" or "earache" do not
+turn into other symptoms. Corrections are only applied to phrases that match no rule as
+typed and do match one once corrected.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .metrics import Counter
+    from .symptom_groups import symptom_phrases
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter  # type: ignore
+    from symptom_groups import symptom_phrases  # type: ignore
+
+MAX_EDIT_DISTANCE = 2
+# Shorter words are too ambiguous to correct ("flu" vs "flue"); words up to this length allow one edit
+MIN_WORD_LENGTH = 4
+ONE_EDIT_MAX_LENGTH = 5
+# A corrected phrase may differ from the typed text by one edit per this many characters
+PHRASE_CHARS_PER_EDIT = 5
+
+SYMPTOM_CORRECTIONS = Counter(
+    "triage_symptom_corrections_total", "Misspelt symptoms/factors corrected to rule vocabulary", ["field"]
+)
+
+_WORD_RE = re.compile(r"[a-z]+|[^a-z]+")
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once); max_distance + 1 when further"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+def phrase_budget(phrase: str) -> int:
+    """Edits allowed between typed text and the vocabulary phrase it is corrected to"""
+    return min(MAX_EDIT_DISTANCE, max(1, len(phrase) // PHRASE_CHARS_PER_EDIT))
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class SymSpellIndex:
+    """Symmetric-delete index: every vocabulary word within max_distance edits of a query"""
+
+    def __init__(self, frequencies: Dict[str, int], max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        self.frequencies = frequencies
+        self._deletes: Dict[str, List[str]] = {}
+        for word in frequencies:
+            for deleted in _deletes(word, max_distance):
+                self._deletes.setdefault(deleted, []).append(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.frequencies
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[str]:
+        """Closest vocabulary word with the same first letter (then most frequent, then alphabetical), or None"""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if word in self.frequencies:
+            return word
+        best: Optional[Tuple[int, int, str]] = None
+        seen: Set[str] = set()
+        for deleted in _deletes(word, max_distance):
+            for candidate in self._deletes.get(deleted, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                # Typos rarely hit the first letter; real words often differ there ("wheezing"/"sneezing")
+                if candidate[0] != word[0]:
+                    continue
+                distance = edit_distance(word, candidate, max_distance)
+                if distance > max_distance:
+                    continue
+                key = (distance, -self.frequencies[candidate], candidate)
+                if best is None or key < best:
+                    best = key
+        return best[2] if best else None
+
+
+class SymptomCorrector:
+    """Corrects misspelt symptoms and additional factors toward the rule vocabulary"""
+
+    def __init__(self, symptom_phrases: Iterable[str], factor_phrases: Iterable[str],
+                 symptom_matches: Callable[[str], bool], known_words: Iterable[str] = ()):
+        self.symptom_phrases = sorted({p.lower().strip() for p in symptom_phrases})
+        self.factor_phrases = sorted({p.lower().strip() for p in factor_phrases})
+        self.symptom_matches = symptom_matches
+        frequencies: Dict[str, int] = {}
+        for phrase in self.symptom_phrases + self.factor_phrases:
+            for word in re.findall(r"[a-z]+", phrase):
+                frequencies[word] = frequencies.get(word, 0) + 1
+        self.index = SymSpellIndex(frequencies)
+        # Correctly spelt words that are not symptom vocabulary; never rewritten
+        self.known_words = {w for text in known_words for w in re.findall(r"[a-z]+", text.lower())}
+        self.phrase_tokens = sorted(
+            {tuple(_WORD_RE.findall(p)) for p in self.symptom_phrases + self.factor_phrases if p},
+            key=len, reverse=True,
+        )
+        # Typed words repeat across requests; each is looked up and measured once
+        self.word_correction = lru_cache(maxsize=8192)(self._word_correction)
+
+    @classmethod
+    def from_compiled(cls, compiled) -> "SymptomCorrector":
+        return cls(
+            (p for c in compiled.conditions for p in symptom_phrases(c)),
+            (p for c in compiled.conditions for p in c.get("additional_factors", []) or []),
+            compiled.recognizes,
+            (str(rule.get(key) or "") for rule in compiled.rules for key in ("name", "explanation_template")),
+        )
+
+    def factor_matches(self, factor: str) -> bool:
+        # Same containment test as TriageEvaluator.match_additional_factors
+        return any(phrase in factor or factor in phrase for phrase in self.factor_phrases)
+
+    def _word_correction(self, token: str) -> Tuple[str, int]:
+        if not token[0].isalpha() or len(token) < MIN_WORD_LENGTH or token in self.index or token in self.known_words:
+            return token, 0
+        max_distance = 1 if len(token) <= ONE_EDIT_MAX_LENGTH else MAX_EDIT_DISTANCE
+        fixed = self.index.lookup(token, max_distance)
+        if fixed is None:
+            return token, 0
+        return fixed, edit_distance(token, fixed, max_distance)
+
+    def correct_word(self, token: str) -> str:
+        """Closest vocabulary word for an out-of-vocabulary word, or the word itself"""
+        return self.word_correction(token)[0]
+
+    def correct_text(self, text: str) -> str:
+        """Apply word corrections that complete a whole vocabulary phrase within its edit budget"""
+        tokens = _WORD_RE.findall(text)
+        corrections = [self.word_correction(token) for token in tokens]
+        corrected = [fixed for fixed, _ in corrections]
+        if corrected == tokens:
+            return text
+        keep = [False] * len(tokens)
+        for phrase in self.phrase_tokens:
+            size = len(phrase)
+            for start in range(len(tokens) - size + 1):
+                if tuple(corrected[start:start + size]) != phrase:
+                    continue
+                # Separators are never corrected, so the phrase's distance is the sum of its words'
+                distance = sum(edits for _, edits in corrections[start:start + size])
+                if 0 < distance <= phrase_budget("".join(phrase)):
+                    keep[start:start + size] = [True] * size
+        return "".join(fixed if kept else token for token, fixed, kept in zip(tokens, corrected, keep))
+
+    def _correct(self, values: List[str], matches: Callable[[str], bool], field: str,
+                 corrections: List[Dict[str, str]]) -> List[str]:
+        corrected_values = []
+        for value in values:
+            normalized = value.lower().strip()
+            if normalized and not matches(normalized):
+                corrected = self.correct_text(normalized)
+                if corrected != normalized and matches(corrected):
+                    corrections.append({"field": field, "original": value, "corrected": corrected})
+                    SYMPTOM_CORRECTIONS.labels(field).inc()
+                    value = corrected
+            corrected_values.append(value)
+        return corrected_values
+
+    def correct(self, symptoms: List[str], factors: List[str]) -> Tuple[List[str], List[str], List[Dict[str, str]]]:
+        """Corrected symptoms and factors plus the corrections made (empty when nothing changed)"""
+        corrections: List[Dict[str, str]] = []
+        symptoms = self._correct(symptoms, self.symptom_matches, "symptoms", corrections)
+        factors = self._correct(factors, self.factor_matches, "additional_factors", corrections)
+        return symptoms, factors, corrections
@@ -0,0 +1,329 @@
+"""
+Prometheus-compatible metrics for the triage backend
+Low-overhead counters, gauges and histograms rendered in the text exposition format
+"""
+
+import asyncio
+import functools
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, tuned for in-process work (sub-ms) up to LLM calls (seconds)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Metric children are updated without locks. Increments rely on the GIL; under heavy
+# thread contention an occasional lost update is accepted so the hot path stays cheap
+# enough to leave instrumentation on in production.
+_create_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class handling label children and registration"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child metric for the given label values"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with _create_lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self._children[()]
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: Tuple[str, ...], child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def get(self) -> float:
+        return self.value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def get(self) -> float:
+        return self._default().get()
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def get(self) -> float:
+        return self._default().get()
+
+    def track_inprogress(self) -> "_InProgress":
+        """Context manager incrementing the gauge while a block runs"""
+        return _InProgress(self._default())
+
+
+class _InProgress:
+    __slots__ = ("_value",)
+
+    def __init__(self, value: _Value):
+        self._value = value
+
+    def __enter__(self):
+        self._value.value += 1
+
+    def __exit__(self, *exc):
+        self._value.value -= 1
+        return False
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class _Timer:
+    """Times a block or a function into a histogram; usable as context manager or decorator"""
+
+    __slots__ = ("_hist", "_start")
+
+    def __init__(self, hist: _HistogramValue):
+        self._hist = hist
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.observe(time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        hist = self._hist
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    hist.observe(time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                hist.observe(time.perf_counter() - start)
+        return wrapper
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket upper bounds"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != float("inf")))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> _Timer:
+        return _Timer(self._default())
+
+    def _render_child(self, key: Tuple[str, ...], child: _HistogramValue) -> List[str]:
+        lines = []
+        cumulative = 0
+        counts = list(child.counts)
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_latest() -> str:
+    """Render all registered metrics in the Prometheus text format"""
+    return REGISTRY.render()
+
+
+# Triage pipeline
+RULE_MATCH_SECONDS = Histogram(
+    "triage_rule_match_seconds", "Time spent matching a request against the rule set"
+)
+EXPLANATION_SECONDS = Histogram(
+    "triage_explanation_seconds", "Time spent generating an explanation", ["source"]
+)
+LOG_SESSION_SECONDS = Histogram(
+    "triage_log_session_seconds", "Time spent writing a triage session to the database"
+)
+RULE_HITS = Counter("triage_rule_hits_total", "Requests matching each rule", ["rule_id"])
+LABEL_OUTCOMES = Counter("triage_label_outcomes_total", "Final triage label per request", ["label"])
+LLM_ERRORS = Counter("triage_llm_errors_total", "Failed LLM explanation calls")
+LLM_FALLBACKS = Counter(
+    "triage_llm_fallbacks_total", "Explanations served from the template after an LLM failure"
+)
+IN_FLIGHT_REQUESTS = Gauge("triage_in_flight_requests", "HTTP requests currently being served")
+
+# Auth and admin
+AUTH_SECONDS = Histogram("auth_get_current_user_seconds", "Time spent authenticating a user request")
+ADMIN_QUERY_SECONDS = Histogram(
+    "admin_query_seconds", "Time spent serving admin dashboard queries", ["endpoint"]
+)
+
+# Database
+DB_CONNECTIONS = Gauge("db_open_connections", "SQLite connections currently open")
+
+
+class TrackedConnection(sqlite3.Connection):
+    """sqlite3 connection factory keeping the open-connection gauge up to date"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tracked_open = True
+        DB_CONNECTIONS.inc()
+
+    def close(self) -> None:
+        if getattr(self, "_tracked_open", False):
+            self._tracked_open = False
+            DB_CONNECTIONS.dec()
+        super().close()
+
+    def __del__(self):
+        if getattr(self, "_tracked_open", False):
+            self._tracked_open = False
+            DB_CONNECTIONS.dec()
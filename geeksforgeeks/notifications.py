@@ -0,0 +1,150 @@
+"""
+Admin notifications
+Emergency review cases fan out to every active, on-duty admin in one INSERT ... SELECT fired
+inside the write transaction. Per-admin unread counts and the latest notification id are kept
+in notification_counters by triggers, so unread badges and long-polls are O(1) reads.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Dict, List
+
+NOTIFICATION_POLL_INTERVAL = float(os.getenv("NOTIFICATION_POLL_INTERVAL", "0.5"))
+NOTIFICATION_LONG_POLL_SECONDS = float(os.getenv("NOTIFICATION_LONG_POLL_SECONDS", "25"))
+
+
+def init_notifications(conn: sqlite3.Connection) -> None:
+    """Create notifications, its unread index, the counters table and the fan-out triggers"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_id INTEGER,
+            message TEXT,
+            type TEXT,
+            is_read BOOLEAN DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (admin_id) REFERENCES admin_users(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_notifications_admin_unread
+        ON notifications (admin_id, is_read, created_at)
+    """)
+
+    cursor.execute("PRAGMA table_info(admin_users)")
+    if "on_duty" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE admin_users ADD COLUMN on_duty BOOLEAN DEFAULT 1")
+
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'notification_counters'")
+    backfill = cursor.fetchone() is None
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notification_counters (
+            admin_id INTEGER PRIMARY KEY,
+            unread INTEGER NOT NULL DEFAULT 0,
+            latest_id INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    if backfill:
+        cursor.execute("""
+            INSERT INTO notification_counters (admin_id, unread, latest_id)
+            SELECT admin_id, SUM(CASE WHEN is_read THEN 0 ELSE 1 END), MAX(id)
+            FROM notifications
+            WHERE admin_id IS NOT NULL
+            GROUP BY admin_id
+        """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notifications_counter_insert
+        AFTER INSERT ON notifications BEGIN
+            INSERT INTO notification_counters (admin_id, unread, latest_id)
+            VALUES (new.admin_id, CASE WHEN new.is_read THEN 0 ELSE 1 END, new.id)
+            ON CONFLICT (admin_id) DO UPDATE SET
+                unread = unread + excluded.unread,
+                latest_id = MAX(latest_id, excluded.latest_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notifications_counter_read
+        AFTER UPDATE OF is_read ON notifications WHEN old.is_read != new.is_read BEGIN
+            UPDATE notification_counters
+            SET unread = unread + CASE WHEN new.is_read THEN -1 ELSE 1 END
+            WHERE admin_id = new.admin_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notifications_counter_delete
+        AFTER DELETE ON notifications WHEN NOT old.is_read BEGIN
+            UPDATE notification_counters SET unread = unread - 1 WHERE admin_id = old.admin_id;
+        END
+    """)
+
+    # Fan out immediate-priority review cases to on-duty admins as part of the session write
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS triage_cases_emergency_fanout
+        AFTER INSERT ON triage_cases WHEN new.priority = 0 BEGIN
+            INSERT INTO notifications (admin_id, message, type)
+            SELECT id, 'Emergency case ' || new.id || ': ' || COALESCE(new.condition, 'General')
+                       || ' (' || new.triage_label || ')', 'emergency'
+            FROM admin_users
+            WHERE is_active = 1 AND on_duty = 1;
+        END
+    """)
+
+
+def _notification(row) -> Dict:
+    return {
+        "id": row[0],
+        "message": row[1],
+        "type": row[2],
+        "is_read": bool(row[3]),
+        "created_at": row[4],
+    }
+
+
+def list_notifications(conn: sqlite3.Connection, admin_id: int, limit: int = 10,
+                       after_id: int = 0) -> List[Dict]:
+    """Newest notifications for an admin, optionally only those newer than after_id"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT id, message, type, is_read, created_at
+        FROM notifications
+        WHERE admin_id = ? AND id > ?
+        ORDER BY id DESC
+        LIMIT ?
+    """, (admin_id, after_id, limit))
+    return [_notification(row) for row in cursor.fetchall()]
+
+
+def notification_counts(conn: sqlite3.Connection, admin_id: int) -> Dict[str, int]:
+    """Unread count and latest notification id from the maintained counters"""
+    row = conn.execute(
+        "SELECT unread, latest_id FROM notification_counters WHERE admin_id = ?", (admin_id,)
+    ).fetchone()
+    unread, latest_id = row if row else (0, 0)
+    return {"unread_count": unread, "latest_id": latest_id}
+
+
+async def wait_for_notifications(
+    connect,
+    admin_id: int,
+    after_id: int,
+    timeout: float = NOTIFICATION_LONG_POLL_SECONDS,
+    interval: float = NOTIFICATION_POLL_INTERVAL,
+    limit: int = 10,
+) -> Dict:
+    """Long-poll: return as soon as a notification newer than after_id exists, or on timeout"""
+    deadline = time.monotonic() + timeout
+    while True:
+        conn = connect()
+        try:
+            counts = notification_counts(conn, admin_id)
+            if counts["latest_id"] > after_id or time.monotonic() >= deadline:
+                notifications = list_notifications(conn, admin_id, limit, after_id) \
+                    if counts["latest_id"] > after_id else []
+                return {"notifications": notifications, **counts}
+        finally:
+            conn.close()
+        await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
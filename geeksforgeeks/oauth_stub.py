@@ -0,0 +1,88 @@
+"""
+Local OAuth provider stub
+Mimics the Google and GitHub endpoints the login flow calls (authorize, token exchange,
+profile, emails) so login throughput can be load-tested offline. Mounted only when
+OAUTH_STUB_ENABLED=true. The authorization code doubles as the user key: code "alice"
+always signs in the same stub user, so a load test can spread logins over many users.
+"""
+
+import hashlib
+import urllib.parse
+from typing import Dict
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse
+
+stub_router = APIRouter(prefix="/api/oauth-stub", tags=["oauth-stub"])
+
+TOKEN_PREFIX = "stub."
+
+
+def _account(code: str) -> Dict:
+    account_id = int(hashlib.sha256(code.encode("utf-8")).hexdigest()[:12], 16)
+    return {
+        "id": account_id,
+        "login": f"stub-{code}",
+        "name": f"Stub User {code}",
+        "email": f"{code}@stub.example.com",
+        "avatar_url": None,
+    }
+
+
+async def _issue_token(request: Request) -> Dict:
+    form = urllib.parse.parse_qs((await request.body()).decode("utf-8"))
+    code = (form.get("code") or [""])[0]
+    if not code:
+        raise HTTPException(status_code=400, detail="Missing code")
+    return {"access_token": f"{TOKEN_PREFIX}{code}", "token_type": "bearer", "expires_in": 3600}
+
+
+def _bearer_code(request: Request) -> str:
+    auth = request.headers.get("authorization", "")
+    token = auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+    if not token.startswith(TOKEN_PREFIX):
+        raise HTTPException(status_code=401, detail="Invalid stub token")
+    return token[len(TOKEN_PREFIX):]
+
+
+@stub_router.get("/{provider}/authorize")
+async def authorize(provider: str, redirect_uri: str, state: str, code: str = "stub-user"):
+    """Skip consent and send the browser straight back with a code (override it with ?code=)"""
+    query = urllib.parse.urlencode({"code": code, "state": state})
+    return RedirectResponse(url=f"{redirect_uri}?{query}")
+
+
+@stub_router.post("/google/token")
+async def google_token(request: Request):
+    return await _issue_token(request)
+
+
+@stub_router.get("/google/userinfo")
+async def google_userinfo(request: Request):
+    account = _account(_bearer_code(request))
+    return {
+        "id": str(account["id"]),
+        "email": account["email"],
+        "name": account["name"],
+        "picture": account["avatar_url"],
+    }
+
+
+@stub_router.post("/github/token")
+async def github_token(request: Request):
+    return await _issue_token(request)
+
+
+@stub_router.get("/github/user")
+async def github_user(request: Request):
+    # Like most GitHub accounts, the profile email is private
+    return {**_account(_bearer_code(request)), "email": None}
+
+
+@stub_router.get("/github/user/emails")
+async def github_emails(request: Request):
+    account = _account(_bearer_code(request))
+    return [
+        {"email": f"noreply-{account['id']}@stub.example.com", "primary": False, "verified": True},
+        {"email": account["email"], "primary": True, "verified": True},
+    ]
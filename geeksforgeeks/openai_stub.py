@@ -0,0 +1,112 @@
+"""
+Local OpenAI-compatible stub
+Answers POST /v1/chat/completions with deterministic explanations. This lets explanation
+batching and coalescing be tested and load-tested without network access or API keys.
+Batched prompts (see explanation_batcher.CASES_MARKER) get a JSON array with one entry
+per case.
+
+    python openai_stub.py --port 8089 --latency-ms 300
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8089/v1 uvicorn triage:app
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from .explanation_batcher import CASES_MARKER
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from explanation_batcher import CASES_MARKER  # type: ignore
+
+
+def _explain(case: Dict) -> str:
+    symptoms = ", ".join(case.get("symptoms") or []) or "your symptoms"
+    return f"Stub explanation ({case.get('triage_label', 'UNKNOWN')}): based on {symptoms}, follow the advised next steps."
+
+
+def stub_reply(prompt: str) -> str:
+    """Deterministic completion text for a single-case or batched explanation prompt"""
+    if CASES_MARKER in prompt:
+        cases = json.loads(prompt.split(CASES_MARKER, 1)[1])
+        return json.dumps([_explain(case) for case in cases])
+    return "Stub explanation: based on the reported symptoms, follow the advised next steps."
+
+
+class OpenAIStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_seconds: float = 0.0):
+        super().__init__(address, _Handler)
+        self.latency_seconds = latency_seconds
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def record(self, prompt: str) -> None:
+        with self._lock:
+            self.prompts.append(prompt)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: OpenAIStubServer
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send(404, {"error": {"message": "Not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = (body.get("messages") or [{}])[-1].get("content", "")
+        self.server.record(prompt)
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+        self._send(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": stub_reply(prompt)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    def _send(self, status: int, payload: Dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local OpenAI-compatible chat completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated completion latency")
+    args = parser.parse_args(argv)
+
+    server = OpenAIStubServer((args.host, args.port), args.latency_ms / 1000)
+    print(f"OpenAI stub listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Patients maintained from triage sessions
+Each authenticated user is one patient row. log_session upserts it (consultation count, last
+visit, latest known name and age) in the same transaction as the session, so the admin
+patient list is a plain indexed read.
+
+One-time backfill from existing sessions:
+    python patients.py [--db triage_sessions.db] [--drop-unlinked]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from typing import Optional, Sequence
+
+
+def init_patients(conn: sqlite3.Connection) -> None:
+    """Create patients with its user link and list indexes"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS patients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_name TEXT,
+            age INTEGER,
+            gender TEXT,
+            contact TEXT,
+            last_visit DATETIME DEFAULT CURRENT_TIMESTAMP,
+            total_consultations INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'active'
+        )
+    """)
+    cursor.execute("PRAGMA table_info(patients)")
+    if "user_id" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE patients ADD COLUMN user_id TEXT")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_patients_user_id ON patients (user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_last_visit ON patients (last_visit)")
+
+
+def record_visit(
+    cursor: sqlite3.Cursor,
+    user_id: str,
+    name: Optional[str] = None,
+    age: Optional[int] = None,
+    new_session: bool = True,
+) -> int:
+    """Upsert the patient for a user's session and return its id"""
+    cursor.execute("""
+        INSERT INTO patients (user_id, patient_name, age, last_visit, total_consultations)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1)
+        ON CONFLICT (user_id) DO UPDATE SET
+            patient_name = COALESCE(excluded.patient_name, patient_name),
+            age = COALESCE(excluded.age, age),
+            last_visit = excluded.last_visit,
+            total_consultations = total_consultations + ?
+        RETURNING id
+    """, (user_id, name, age, 1 if new_session else 0))
+    return cursor.fetchone()[0]
+
+
+def backfill_patients(db_file: str, drop_unlinked: bool = False) -> int:
+    """Rebuild patient counts from stored sessions; safe to re-run. Returns patients touched"""
+    conn = sqlite3.connect(db_file)
+    try:
+        init_patients(conn)
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'")
+        has_users = cursor.fetchone() is not None
+        name = "(SELECT COALESCE(u.name, u.email) FROM users u WHERE u.id = s.user_id)" if has_users else "NULL"
+        cursor.execute(f"""
+            INSERT INTO patients (user_id, patient_name, last_visit, total_consultations)
+            SELECT s.user_id, {name}, MAX(s.timestamp), COUNT(*)
+            FROM triage_sessions s
+            WHERE s.user_id IS NOT NULL
+            GROUP BY s.user_id
+            ON CONFLICT (user_id) DO UPDATE SET
+                patient_name = COALESCE(patient_name, excluded.patient_name),
+                last_visit = excluded.last_visit,
+                total_consultations = excluded.total_consultations
+        """)
+        touched = cursor.rowcount
+        if drop_unlinked:
+            # Rows seeded by older versions are not tied to any user
+            cursor.execute("DELETE FROM patients WHERE user_id IS NULL")
+        conn.commit()
+    finally:
+        conn.close()
+    return touched
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill patients from existing triage sessions")
+    parser.add_argument("--db", default=os.getenv("TRIAGE_DB_FILE", "triage_sessions.db"),
+                        help="SQLite database with triage_sessions")
+    parser.add_argument("--drop-unlinked", action="store_true",
+                        help="Delete placeholder patients that are not linked to a user")
+    args = parser.parse_args(argv)
+
+    touched = backfill_patients(args.db, args.drop_unlinked)
+    print(f"Backfilled {touched} patients")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
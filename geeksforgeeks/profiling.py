@@ -0,0 +1,255 @@
+"""
+On-demand request profiling
+Admins can flag a single /api/triage or /api/admin/* request for cProfile (and optional
+tracemalloc) capture; results are kept in a bounded ring buffer and exported as pstats files.
+cProfile only sees the thread that enabled it, so endpoints hand threadpool work to
+run_profiled, which profiles it in the worker and merges it into the request's profile.
+"""
+
+import cProfile
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, Response
+
+try:
+    from .admin_backend import get_current_admin
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from admin_backend import get_current_admin  # type: ignore
+
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "32"))
+PROFILE_TOP_FUNCTIONS = 25
+PROFILE_TOP_ALLOCATIONS = 25
+PROFILED_PATH_PREFIXES = ("/api/triage", "/api/admin/")
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-authorization"
+
+_profiles: deque = deque(maxlen=PROFILE_BUFFER_SIZE)
+# cProfile can only have one active profiler per interpreter
+_profiler_lock = threading.Lock()
+# Worker-thread profilers of the request being captured, merged into its profile
+_worker_profilers: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("worker_profilers", default=None)
+
+T = TypeVar("T")
+
+profiling_router = APIRouter(prefix="/api/admin/profiles", tags=["admin"])
+
+
+def _requested_modes(scope) -> Optional[set]:
+    """Return the requested profile modes, or None when the request is not flagged"""
+    value = None
+    for name, header_value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            value = header_value.decode("latin-1")
+            break
+    if value is None:
+        query = scope.get("query_string", b"")
+        if b"profile=" not in query:
+            return None
+        values = parse_qs(query.decode("latin-1")).get("profile")
+        if not values:
+            return None
+        value = values[0]
+
+    modes = {part.strip().lower() for part in value.split(",") if part.strip()}
+    if not modes or modes & {"0", "false", "off"}:
+        return None
+    if modes & {"1", "true", "on"}:
+        modes.add("cpu")
+    return modes
+
+
+def _admin_authorization(scope) -> Optional[str]:
+    """Admin bearer token: X-Admin-Authorization wins over Authorization"""
+    headers = dict(scope.get("headers", ()))
+    value = headers.get(ADMIN_TOKEN_HEADER) or headers.get(b"authorization")
+    return value.decode("latin-1") if value else None
+
+
+def _summarize_stats(stats_dict: Dict) -> List[Dict]:
+    rows = []
+    for (filename, lineno, funcname), (cc, nc, tt, ct, _callers) in stats_dict.items():
+        rows.append({
+            "function": f"{filename}:{lineno}({funcname})",
+            "calls": nc,
+            "primitive_calls": cc,
+            "total_time": round(tt, 6),
+            "cumulative_time": round(ct, 6),
+        })
+    rows.sort(key=lambda row: row["cumulative_time"], reverse=True)
+    return rows[:PROFILE_TOP_FUNCTIONS]
+
+
+def _summarize_snapshot(snapshot: tracemalloc.Snapshot) -> List[Dict]:
+    return [
+        {
+            "location": str(stat.traceback),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]
+    ]
+
+
+def run_profiled(func: Callable[..., T], *args) -> T:
+    """Call func, profiling it in this thread when the current request is being captured"""
+    profilers = _worker_profilers.get()
+    if profilers is None:
+        return func(*args)
+    profiler = cProfile.Profile()
+    profilers.append(profiler)
+    profiler.enable()
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling flagged requests; unflagged requests only pay a header scan"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PROFILED_PATH_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        modes = _requested_modes(scope)
+        if modes is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            admin = await get_current_admin(authorization=_admin_authorization(scope))
+        except HTTPException:
+            response = JSONResponse({"detail": "Profiling requires admin authorization"}, status_code=403)
+            return await response(scope, receive, send)
+
+        if not _profiler_lock.acquire(blocking=False):
+            return await self.app(scope, receive, self._with_headers(send, {b"x-profile-status": b"busy"}))
+
+        profile_id = uuid.uuid4().hex
+        status = {"code": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        profiler = cProfile.Profile() if "cpu" in modes else None
+        worker_profilers: List[cProfile.Profile] = []
+        token = _worker_profilers.set(worker_profilers if profiler else None)
+        trace_memory = "memory" in modes and not tracemalloc.is_tracing()
+        start = time.perf_counter()
+        try:
+            if trace_memory:
+                tracemalloc.start()
+            if profiler:
+                profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if profiler:
+                    profiler.disable()
+                _worker_profilers.reset(token)
+                snapshot = tracemalloc.take_snapshot() if trace_memory else None
+                if trace_memory:
+                    tracemalloc.stop()
+        finally:
+            _profiler_lock.release()
+        duration = time.perf_counter() - start
+
+        record = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status["code"],
+            "duration_ms": round(duration * 1000, 3),
+            "captured_at": datetime.now().isoformat(),
+            "requested_by": admin["username"],
+            "modes": sorted(modes & {"cpu", "memory"}),
+            "pstats": None,
+            "top_functions": [],
+            "top_allocations": [],
+        }
+        if profiler:
+            stats = pstats.Stats(profiler)
+            for worker_profiler in worker_profilers:
+                stats.add(worker_profiler)
+            record["pstats"] = marshal.dumps(stats.stats)
+            record["top_functions"] = _summarize_stats(stats.stats)
+        if snapshot is not None:
+            record["top_allocations"] = _summarize_snapshot(snapshot)
+        _profiles.append(record)
+
+    @staticmethod
+    def _with_headers(send, extra: Dict[bytes, bytes]):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + list(extra.items())
+            await send(message)
+        return send_wrapper
+
+
+def _find_profile(profile_id: str) -> Dict:
+    for record in _profiles:
+        if record["id"] == profile_id:
+            return record
+    raise HTTPException(status_code=404, detail="Profile not found")
+
+
+def _public_record(record: Dict, detail: bool = False) -> Dict:
+    data = {key: value for key, value in record.items() if key != "pstats"}
+    data["has_pstats"] = record["pstats"] is not None
+    if not detail:
+        data.pop("top_functions")
+        data.pop("top_allocations")
+    return data
+
+
+@profiling_router.get("")
+async def list_profiles(current_admin: Dict = Depends(get_current_admin)):
+    """List captured request profiles, newest first"""
+    profiles = [_public_record(record) for record in reversed(_profiles)]
+    return {"profiles": profiles, "capacity": PROFILE_BUFFER_SIZE}
+
+
+@profiling_router.get("/{profile_id}")
+async def get_profile(profile_id: str, current_admin: Dict = Depends(get_current_admin)):
+    """Get the hottest functions and allocation sites of a captured profile"""
+    return _public_record(_find_profile(profile_id), detail=True)
+
+
+@profiling_router.get("/{profile_id}/pstats")
+async def download_profile(profile_id: str, current_admin: Dict = Depends(get_current_admin)):
+    """Download the raw profile; load with pstats, snakeviz or flameprof"""
+    record = _find_profile(profile_id)
+    if record["pstats"] is None:
+        raise HTTPException(status_code=404, detail="Profile has no CPU stats")
+    return Response(
+        content=record["pstats"],
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'},
+    )
+
+
+@profiling_router.delete("")
+async def clear_profiles(current_admin: Dict = Depends(get_current_admin)):
+    """Drop all captured profiles"""
+    _profiles.clear()
+    return {"message": "Profiles cleared"}
@@ -0,0 +1,95 @@
+"""
+Deterministic triage result cache
+Identical requests (after normalization, ignoring symptom/factor order) under the same rules
+version reuse the label, matched rules and explanation of the first evaluation.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .metrics import Counter, Gauge
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter, Gauge  # type: ignore
+
+RESULT_CACHE_SIZE = int(os.getenv("TRIAGE_RESULT_CACHE_SIZE", "1024"))
+
+CACHE_HITS = Counter("triage_result_cache_hits_total", "Triage requests served from the result cache")
+CACHE_MISSES = Counter("triage_result_cache_misses_total", "Triage requests evaluated from scratch")
+CACHE_HIT_RATIO = Gauge("triage_result_cache_hit_ratio", "Result cache hits / lookups since start")
+CACHE_ENTRIES = Gauge("triage_result_cache_entries", "Entries currently held in the result cache")
+
+
+class CachedResult(NamedTuple):
+    triage_label: str
+    matched_rules: Tuple[Dict[str, Any], ...]
+    explanation: str
+    confidence_score: float
+
+
+def _text_key(value: Optional[str]) -> Optional[str]:
+    return value.lower().strip() if value else None
+
+
+def _list_key(values: Optional[List[str]]) -> Tuple[str, ...]:
+    return tuple(sorted({value.lower().strip() for value in values or []}))
+
+
+def request_fingerprint(request, rules_version: str) -> Hashable:
+    """Canonical key: normalized, order-insensitive request fields plus the rules version"""
+    return (
+        rules_version,
+        _list_key(request.symptoms),
+        _text_key(request.severity),
+        _text_key(request.duration),
+        _list_key(request.additional_factors),
+        _text_key(request.temperature),
+        request.patient_age,
+    )
+
+
+class TriageResultCache:
+    """Bounded LRU of evaluated triage results"""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            hits, lookups = self.hits, self.hits + self.misses
+        (CACHE_HITS if result is not None else CACHE_MISSES).inc()
+        CACHE_HIT_RATIO.set(hits / lookups)
+        return result
+
+    def put(self, key: Hashable, result: CachedResult) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        CACHE_ENTRIES.set(size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,227 @@
+"""
+Offline re-triage / backtesting over historical sessions
+Replays every triage_sessions row under an old and a new rules file and reports how labels and
+rule hits would change. Rows are streamed in chunks and evaluated across a process pool, so
+memory stays bounded no matter how many sessions are stored.
+
+Usage:
+    python retriage.py --new rules_candidate.yaml [--old rules.yaml] [--db triage_sessions.db]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .session_codec import decode_request
+    from .triage_engine import DB_FILE, TriageEngine, TriageRequest
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from session_codec import decode_request  # type: ignore
+    from triage_engine import DB_FILE, TriageEngine, TriageRequest  # type: ignore
+
+DEFAULT_CHUNK_SIZE = 2000
+MAX_CHANGED_SAMPLES = 20
+
+# (session_id, session_data, symptoms, severity, duration, additional_factors)
+SessionRow = Tuple[str, Union[bytes, str, None], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+_worker_evaluators: Dict[str, TriageEngine] = {}
+
+
+def request_from_row(row: SessionRow) -> TriageRequest:
+    """Rebuild the original TriageRequest from a compact or legacy session row"""
+    session_id, session_data, symptoms, severity, duration, additional_factors = row
+    return TriageRequest(**decode_request(session_id, symptoms, severity, duration, additional_factors, session_data))
+
+
+def stream_sessions(db_file: str, chunk_size: int, limit: Optional[int] = None) -> Iterator[List[SessionRow]]:
+    """Yield triage_sessions rows in chunks without materializing the table"""
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        cursor = conn.cursor()
+        query = """
+            SELECT id, session_data, symptoms, severity, duration, additional_factors
+            FROM triage_sessions
+        """
+        params: Tuple = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+def _init_worker(old_rules: str, new_rules: str) -> None:
+    _worker_evaluators["old"] = TriageEngine(old_rules)
+    _worker_evaluators["new"] = TriageEngine(new_rules)
+
+
+def evaluate_chunk(rows: Sequence[SessionRow]) -> Dict:
+    """Evaluate one chunk under both rule sets and return mergeable aggregates"""
+    old, new = _worker_evaluators["old"], _worker_evaluators["new"]
+    transitions: Counter = Counter()
+    old_hits: Counter = Counter()
+    new_hits: Counter = Counter()
+    changed: List[Dict] = []
+    errors = 0
+
+    for row in rows:
+        try:
+            request = request_from_row(row)
+            old_label, old_matched = old.classify(request)
+            new_label, new_matched = new.classify(request)
+        except Exception:
+            errors += 1
+            continue
+        transitions[(old_label, new_label)] += 1
+        old_hits.update(rule["id"] for rule in old_matched)
+        new_hits.update(rule["id"] for rule in new_matched)
+        if old_label != new_label and len(changed) < MAX_CHANGED_SAMPLES:
+            changed.append({"session_id": row[0], "old": old_label, "new": new_label})
+
+    return {
+        "sessions": len(rows) - errors,
+        "errors": errors,
+        "transitions": transitions,
+        "old_hits": old_hits,
+        "new_hits": new_hits,
+        "changed": changed,
+    }
+
+
+class BacktestReport:
+    """Merged results of a backtest run"""
+
+    def __init__(self):
+        self.sessions = 0
+        self.errors = 0
+        self.transitions: Counter = Counter()
+        self.old_hits: Counter = Counter()
+        self.new_hits: Counter = Counter()
+        self.changed_samples: List[Dict] = []
+
+    def merge(self, partial: Dict) -> None:
+        self.sessions += partial["sessions"]
+        self.errors += partial["errors"]
+        self.transitions.update(partial["transitions"])
+        self.old_hits.update(partial["old_hits"])
+        self.new_hits.update(partial["new_hits"])
+        room = MAX_CHANGED_SAMPLES - len(self.changed_samples)
+        self.changed_samples.extend(partial["changed"][:room])
+
+    @property
+    def changed(self) -> int:
+        return sum(count for (old, new), count in self.transitions.items() if old != new)
+
+    def labels(self) -> List[str]:
+        return sorted({label for pair in self.transitions for label in pair})
+
+    def rule_deltas(self) -> List[Dict]:
+        rule_ids = sorted(set(self.old_hits) | set(self.new_hits))
+        return [
+            {
+                "rule_id": rule_id,
+                "old_hits": self.old_hits[rule_id],
+                "new_hits": self.new_hits[rule_id],
+                "delta": self.new_hits[rule_id] - self.old_hits[rule_id],
+            }
+            for rule_id in rule_ids
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "sessions": self.sessions,
+            "errors": self.errors,
+            "changed": self.changed,
+            "transition_matrix": {
+                old: {new: self.transitions[(old, new)] for new in self.labels()}
+                for old in self.labels()
+            },
+            "rule_deltas": self.rule_deltas(),
+            "changed_samples": self.changed_samples,
+        }
+
+    def format_text(self) -> str:
+        labels = self.labels()
+        width = max([len(label) for label in labels] + [10])
+        lines = [
+            f"Sessions evaluated: {self.sessions}  (errors: {self.errors})",
+            f"Label changes:      {self.changed}",
+            "",
+            "Label transitions (rows: old rules, columns: new rules)",
+            " " * width + "".join(f" {label:>{width}}" for label in labels),
+        ]
+        for old in labels:
+            counts = "".join(f" {self.transitions[(old, new)]:>{width}}" for new in labels)
+            lines.append(f"{old:<{width}}{counts}")
+        lines += ["", "Per-rule deltas", f"{'rule':<12} {'old':>10} {'new':>10} {'delta':>10}"]
+        for row in self.rule_deltas():
+            lines.append(f"{row['rule_id']:<12} {row['old_hits']:>10} {row['new_hits']:>10} {row['delta']:>+10}")
+        return "\n".join(lines)
+
+
+def run_backtest(
+    db_file: str,
+    old_rules: str,
+    new_rules: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    limit: Optional[int] = None,
+) -> BacktestReport:
+    """Replay stored sessions under both rule files; workers=0 evaluates in-process"""
+    report = BacktestReport()
+    chunks = stream_sessions(db_file, chunk_size, limit)
+
+    if workers == 0:
+        _init_worker(old_rules, new_rules)
+        for chunk in chunks:
+            report.merge(evaluate_chunk(chunk))
+        return report
+
+    workers = workers or os.cpu_count() or 1
+    # Keep a bounded number of chunks in flight so memory does not grow with the table
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(old_rules, new_rules)) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(evaluate_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.merge(future.result())
+        for future in pending:
+            report.merge(future.result())
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Backtest a rules file against historical triage sessions")
+    parser.add_argument("--new", required=True, help="Candidate rules file")
+    parser.add_argument("--old", default=os.path.join(script_dir, "rules.yaml"), help="Current rules file")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database with triage_sessions")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Sessions per work unit")
+    parser.add_argument("--limit", type=int, default=None, help="Only replay the first N sessions")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_backtest(args.db, args.old, args.new, args.workers, args.chunk_size, args.limit)
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format_text())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
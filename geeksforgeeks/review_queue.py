@@ -0,0 +1,175 @@
+"""
+Clinician review queue
+EMERGENCY/URGENT sessions become triage_cases ordered by urgency and age. Reviewers claim the
+next case with one indexed UPDATE ... RETURNING; a claim is a lease that lapses on its own, so
+abandoned cases return to the queue. The pending count is a trigger-maintained counter.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+REVIEW_LEASE_SECONDS = int(os.getenv("REVIEW_LEASE_SECONDS", "900"))
+
+# Label urgency -> queue priority (lower is reviewed first); other urgencies are not queued
+REVIEW_PRIORITIES = {"immediate": 0, "urgent": 1}
+
+CASE_COLUMNS = (
+    "id", "patient_id", "patient_name", "age", "condition", "symptoms", "severity", "triage_label",
+    "status", "created_at", "reviewed_by", "notes", "priority", "lease_expires_at", "resolved_at",
+)
+
+_ADDED_COLUMNS = {
+    "priority": "INTEGER DEFAULT 1",
+    "lease_expires_at": "REAL DEFAULT 0",
+    "resolved_at": "DATETIME",
+}
+
+
+def init_review_queue(conn: sqlite3.Connection) -> None:
+    """Create triage_cases with its queue index and the pending counter triggers"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS triage_cases (
+            id TEXT PRIMARY KEY,
+            patient_id INTEGER,
+            patient_name TEXT,
+            age INTEGER,
+            condition TEXT,
+            symptoms TEXT,
+            severity TEXT,
+            triage_label TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            reviewed_by INTEGER,
+            notes TEXT,
+            FOREIGN KEY (patient_id) REFERENCES patients(id),
+            FOREIGN KEY (reviewed_by) REFERENCES admin_users(id)
+        )
+    """)
+    cursor.execute("PRAGMA table_info(triage_cases)")
+    columns = {row[1] for row in cursor.fetchall()}
+    for name, definition in _ADDED_COLUMNS.items():
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE triage_cases ADD COLUMN {name} {definition}")
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triage_cases_queue
+        ON triage_cases (status, priority, created_at)
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS review_queue_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("SELECT 1 FROM review_queue_counters WHERE name = 'pending'")
+    if cursor.fetchone() is None:
+        cursor.execute("""
+            INSERT INTO review_queue_counters (name, value)
+            SELECT 'pending', COUNT(*) FROM triage_cases WHERE status = 'pending'
+        """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS triage_cases_pending_insert
+        AFTER INSERT ON triage_cases WHEN new.status = 'pending' BEGIN
+            UPDATE review_queue_counters SET value = value + 1 WHERE name = 'pending';
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS triage_cases_pending_delete
+        AFTER DELETE ON triage_cases WHEN old.status = 'pending' BEGIN
+            UPDATE review_queue_counters SET value = value - 1 WHERE name = 'pending';
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS triage_cases_pending_update
+        AFTER UPDATE OF status ON triage_cases WHEN (old.status = 'pending') != (new.status = 'pending') BEGIN
+            UPDATE review_queue_counters
+            SET value = value + CASE WHEN new.status = 'pending' THEN 1 ELSE -1 END
+            WHERE name = 'pending';
+        END
+    """)
+
+
+def enqueue_case(
+    cursor: sqlite3.Cursor,
+    session_id: str,
+    triage_label: str,
+    urgency: Optional[str],
+    symptoms: str,
+    severity: str,
+    age: Optional[int] = None,
+    patient_id: Optional[int] = None,
+    patient_name: Optional[str] = None,
+) -> bool:
+    """Queue a session for review if its urgency warrants it; returns whether it was queued"""
+    priority = REVIEW_PRIORITIES.get(urgency or "")
+    if priority is None:
+        return False
+    condition = symptoms.split(",")[0].strip().title() if symptoms else "General"
+    cursor.execute("""
+        INSERT OR IGNORE INTO triage_cases
+        (id, patient_id, patient_name, age, condition, symptoms, severity, triage_label, status, priority)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
+    """, (session_id, patient_id, patient_name, age, condition, symptoms, severity, triage_label, priority))
+    return cursor.rowcount > 0
+
+
+def _case(row) -> Dict:
+    return dict(zip(CASE_COLUMNS, row))
+
+
+def claim_next_case(conn: sqlite3.Connection, reviewer_id: int,
+                    lease_seconds: int = REVIEW_LEASE_SECONDS) -> Optional[Dict]:
+    """Atomically lease the most urgent, oldest unclaimed case to a reviewer"""
+    now = time.time()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        UPDATE triage_cases
+        SET reviewed_by = ?, lease_expires_at = ?
+        WHERE id = (
+            SELECT id FROM triage_cases
+            WHERE status = 'pending' AND lease_expires_at <= ?
+            ORDER BY priority, created_at
+            LIMIT 1
+        )
+        RETURNING {', '.join(CASE_COLUMNS)}
+    """, (reviewer_id, now + lease_seconds, now))
+    row = cursor.fetchone()
+    conn.commit()
+    return _case(row) if row else None
+
+
+def release_case(conn: sqlite3.Connection, case_id: str, reviewer_id: int) -> bool:
+    """Give a claimed case back to the queue before its lease runs out"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE triage_cases SET reviewed_by = NULL, lease_expires_at = 0
+        WHERE id = ? AND status = 'pending' AND reviewed_by = ? AND lease_expires_at > ?
+    """, (case_id, reviewer_id, time.time()))
+    conn.commit()
+    return cursor.rowcount > 0
+
+
+def resolve_case(conn: sqlite3.Connection, case_id: str, reviewer_id: int,
+                 notes: Optional[str] = None) -> Optional[Dict]:
+    """Close a case; only the reviewer currently holding the lease may do so"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        UPDATE triage_cases
+        SET status = 'resolved', notes = COALESCE(?, notes), resolved_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND status = 'pending' AND reviewed_by = ? AND lease_expires_at > ?
+        RETURNING {', '.join(CASE_COLUMNS)}
+    """, (notes, case_id, reviewer_id, time.time()))
+    row = cursor.fetchone()
+    conn.commit()
+    return _case(row) if row else None
+
+
+def pending_count(conn: sqlite3.Connection) -> int:
+    """Cases awaiting review (claimed or not), read from the maintained counter"""
+    row = conn.execute("SELECT value FROM review_queue_counters WHERE name = 'pending'").fetchone()
+    return row[0] if row else 0
@@ -0,0 +1,250 @@
+"""
+Precompiled, memory-mapped rule artifact
+rules.yaml is compiled once into a versioned binary file keyed by the source's content hash:
+the rules as compact JSON (no YAML parse at worker start) plus flat uint32 tables for the
+symptom vocabulary, its condition postings, the condition -> rule map and the priority order.
+Workers mmap the file read-only, so those tables live in shared page-cache pages and are read
+in place. Everything else is still per worker: the rules JSON is decoded and CompiledRules
+builds its own conditions, interval indexes and symptom groups from it.
+
+Build ahead of time (workers otherwise compile on first load):
+    python rule_artifact.py [--rules rules.yaml] [--out-dir .rules_cache]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+try:
+    from .symptom_groups import entry_phrases
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from symptom_groups import entry_phrases  # type: ignore
+
+# v2: postings of conditions without symptoms come from their all_of / at_least groups
+ARTIFACT_VERSION = 2
+MAGIC = b"TRIAGERA"
+RULES_ARTIFACT_DIR = os.getenv(
+    "RULES_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rules_cache"),
+)
+
+# magic, format version, little-endian flag, source sha256, section count
+_HEADER = struct.Struct("<8sHH32sI")
+# section name, offset, length
+_SECTION = struct.Struct("<8sQQ")
+_ALIGN = 8
+
+SECTIONS = ("rules", "vocab", "vocaboff", "postoff", "postings", "condrule", "order")
+
+
+class ArtifactError(ValueError):
+    """The file is not a usable artifact for this build (corrupt, stale format or other byte order)"""
+
+
+def source_digest(source: bytes) -> bytes:
+    return hashlib.sha256(source).digest()
+
+
+def artifact_path(source: bytes, out_dir: str = RULES_ARTIFACT_DIR) -> str:
+    return os.path.join(out_dir, f"rules-{source_digest(source).hex()[:16]}.v{ARTIFACT_VERSION}.bin")
+
+
+def _u32(values: Sequence[int]) -> bytes:
+    return array("I", values).tobytes()
+
+
+def build_artifact(source: bytes) -> bytes:
+    """Compile rules.yaml source into artifact bytes"""
+    rules_data = yaml.safe_load(source) or {}
+    rules = rules_data.get("rules", []) or []
+    # Same stable ordering the evaluator has always used
+    order = sorted(range(len(rules)), key=lambda i: rules[i].get("priority", 999))
+
+    condition_rule: List[int] = []
+    postings: Dict[str, Dict[int, None]] = {}
+    for rule_pos, rule_index in enumerate(order):
+        for condition in rules[rule_index].get("conditions", []) or []:
+            condition_id = len(condition_rule)
+            condition_rule.append(rule_pos)
+            for phrase in entry_phrases(condition):
+                postings.setdefault(phrase.lower().strip(), {})[condition_id] = None
+
+    vocabulary = sorted(postings)
+    vocab = bytearray()
+    vocab_offsets = [0]
+    posting_offsets = [0]
+    posting_ids: List[int] = []
+    for phrase in vocabulary:
+        vocab += phrase.encode("utf-8")
+        vocab_offsets.append(len(vocab))
+        posting_ids.extend(postings[phrase])
+        posting_offsets.append(len(posting_ids))
+
+    sections = {
+        "rules": json.dumps(rules_data, default=str, separators=(",", ":")).encode("utf-8"),
+        "vocab": bytes(vocab),
+        "vocaboff": _u32(vocab_offsets),
+        "postoff": _u32(posting_offsets),
+        "postings": _u32(posting_ids),
+        "condrule": _u32(condition_rule),
+        "order": _u32(order),
+    }
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray()
+    body = bytearray()
+    for name, data in sections.items():
+        padding = -(offset + len(body)) % _ALIGN
+        body += b"\0" * padding
+        table += _SECTION.pack(name.encode(), offset + len(body), len(data))
+        body += data
+    header = _HEADER.pack(
+        MAGIC, ARTIFACT_VERSION, sys.byteorder == "little", source_digest(source), len(sections)
+    )
+    return header + bytes(table) + bytes(body)
+
+
+class SymptomPostings(Mapping):
+    """Read-only phrase -> condition ids mapping over the artifact's vocabulary tables"""
+
+    def __init__(self, vocab: memoryview, vocab_offsets: memoryview,
+                 posting_offsets: memoryview, postings: memoryview):
+        self._vocab = vocab
+        self._vocab_offsets = vocab_offsets
+        self._posting_offsets = posting_offsets
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._vocab_offsets) - 1
+
+    def _phrase(self, i: int) -> str:
+        return str(self._vocab[self._vocab_offsets[i]:self._vocab_offsets[i + 1]], "utf-8")
+
+    def _ids(self, i: int) -> Tuple[int, ...]:
+        return tuple(self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]])
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._phrase(i) for i in range(len(self)))
+
+    def __getitem__(self, phrase: str) -> Tuple[int, ...]:
+        phrases = _PhraseView(self)
+        i = bisect_left(phrases, phrase)
+        if i < len(self) and phrases[i] == phrase:
+            return self._ids(i)
+        raise KeyError(phrase)
+
+    def items(self) -> Iterator[Tuple[str, Tuple[int, ...]]]:  # type: ignore[override]
+        return ((self._phrase(i), self._ids(i)) for i in range(len(self)))
+
+
+class _PhraseView(Sequence):
+    """Sorted vocabulary as a sequence, for bisect"""
+
+    def __init__(self, postings: SymptomPostings):
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def __getitem__(self, i):
+        return self._postings._phrase(i)
+
+
+class RuleArtifact:
+    """An artifact file mapped read-only; tables are memoryviews into the shared mapping"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < _HEADER.size:
+            raise ArtifactError(f"{path} is truncated")
+        magic, version, little_endian, digest, count = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != ARTIFACT_VERSION:
+            raise ArtifactError(f"{path} is not a v{ARTIFACT_VERSION} rule artifact")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ArtifactError(f"{path} was built on a machine with another byte order")
+        self.source_digest = digest
+
+        sections: Dict[str, memoryview] = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(view):
+                raise ArtifactError(f"{path} is truncated")
+            sections[name.rstrip(b"\0").decode()] = view[offset:offset + length]
+        missing = set(SECTIONS) - set(sections)
+        if missing:
+            raise ArtifactError(f"{path} lacks sections {sorted(missing)}")
+
+        self._rules_json = sections["rules"]
+        self.condition_rule = sections["condrule"].cast("I")
+        self.priority_order = sections["order"].cast("I")
+        self.symptom_postings = SymptomPostings(
+            sections["vocab"],
+            sections["vocaboff"].cast("I"),
+            sections["postoff"].cast("I"),
+            sections["postings"].cast("I"),
+        )
+
+    def rules_data(self) -> Dict:
+        """The parsed rules document, a private copy per worker (JSON decode; much cheaper than the YAML parse)"""
+        return json.loads(str(self._rules_json, "utf-8"))
+
+
+def compile_rules(rules_file: str, out_dir: str = RULES_ARTIFACT_DIR) -> str:
+    """Build the artifact for a rules file unless one for the same content exists; returns its path"""
+    with open(rules_file, "rb") as f:
+        source = f.read()
+    path = artifact_path(source, out_dir)
+    if os.path.exists(path):
+        try:
+            if RuleArtifact(path).source_digest == source_digest(source):
+                return path
+        except ArtifactError:
+            pass
+
+    data = build_artifact(source)
+    os.makedirs(out_dir, exist_ok=True)
+    # Workers may compile concurrently; each writes a private file and renames it into place
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".rules-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_artifact(rules_file: str, out_dir: str = RULES_ARTIFACT_DIR) -> RuleArtifact:
+    """Compile if needed, then map the artifact for a rules file"""
+    return RuleArtifact(compile_rules(rules_file, out_dir))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile rules.yaml into a memory-mappable artifact")
+    parser.add_argument("--rules", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.yaml"),
+                        help="Rules file to compile")
+    parser.add_argument("--out-dir", default=RULES_ARTIFACT_DIR, help="Artifact cache directory")
+    args = parser.parse_args(argv)
+
+    print(compile_rules(args.rules, args.out_dir))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""
+Compiled rule indexes for the triage evaluator
+Parses numeric request facts once and answers "which conditions accept this value" with
+interval indexes instead of re-scanning every rule condition per request
+"""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+try:
+    from .symptom_groups import CompiledGroups, entry_phrases
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from symptom_groups import CompiledGroups, entry_phrases  # type: ignore
+
+INF = float("inf")
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_UNIT = r"\s*(?:°|º|deg(?:rees?)?)?\s*([fc])?"
+_TEMPERATURE_RE = re.compile(_NUMBER + _UNIT + r"\b", re.IGNORECASE)
+_RANGE_RE = re.compile(
+    r"^\s*" + _NUMBER + _UNIT + r"\s*(?:-|–|to)\s*" + _NUMBER + _UNIT + r"\s*$",
+    re.IGNORECASE,
+)
+_BOUND_RE = re.compile(r"^\s*(>=|<=|≥|≤|>|<)?\s*" + _NUMBER + _UNIT + r"\s*(\+)?\s*$", re.IGNORECASE)
+
+# Readings without a unit at or below this value are taken to be Celsius
+_CELSIUS_CUTOFF = 45.0
+
+
+class Interval(NamedTuple):
+    low: float
+    high: float
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+
+    def contains(self, value: float) -> bool:
+        if value < self.low or (value == self.low and not self.low_inclusive):
+            return False
+        if value > self.high or (value == self.high and not self.high_inclusive):
+            return False
+        return True
+
+    def overlaps(self, other: "Interval") -> bool:
+        if self.high < other.low or (
+            self.high == other.low and not (self.high_inclusive and other.low_inclusive)
+        ):
+            return False
+        if other.high < self.low or (
+            other.high == self.low and not (other.high_inclusive and self.low_inclusive)
+        ):
+            return False
+        return True
+
+
+def _to_fahrenheit(value: float, unit: Optional[str]) -> float:
+    if unit is None:
+        unit = "c" if value <= _CELSIUS_CUTOFF else "f"
+    if unit.lower() == "c":
+        return round(value * 9 / 5 + 32, 2)
+    return value
+
+
+def parse_temperature(text: Optional[str]) -> Optional[float]:
+    """Parse a free-text temperature reading into °F; None when no number is present"""
+    if not text:
+        return None
+    match = _TEMPERATURE_RE.search(text)
+    if not match:
+        return None
+    return _to_fahrenheit(float(match.group(1)), match.group(2))
+
+
+def _parse_range(expr: str, convert) -> Optional[Interval]:
+    """Parse '>103°F', '<=2', '65+', '100.4°F-103°F' style expressions; bare values are thresholds"""
+    match = _RANGE_RE.match(expr)
+    if match:
+        low = convert(float(match.group(1)), match.group(2) or match.group(4))
+        high = convert(float(match.group(3)), match.group(4) or match.group(2))
+        return Interval(min(low, high), max(low, high))
+
+    match = _BOUND_RE.match(expr)
+    if not match:
+        return None
+    op, number, unit, _plus = match.groups()
+    value = convert(float(number), unit)
+    if op == ">":
+        return Interval(value, INF, low_inclusive=False)
+    if op == "<":
+        return Interval(-INF, value, high_inclusive=False)
+    if op in ("<=", "≤"):
+        return Interval(-INF, value)
+    return Interval(value, INF)
+
+
+def parse_temperature_range(expr: str) -> Optional[Interval]:
+    """Parse a rule temperature expression into an interval in °F"""
+    return _parse_range(expr, _to_fahrenheit)
+
+
+def parse_age_range(expr: Any) -> Optional[Interval]:
+    """Parse a rule age expression (years) into an interval"""
+    if isinstance(expr, (int, float)):
+        return Interval(float(expr), INF)
+    return _parse_range(str(expr), lambda value, unit: value)
+
+
+_UNIT_HOURS = {
+    "minute": 1 / 60, "min": 1 / 60,
+    "hour": 1.0, "hr": 1.0, "h": 1.0,
+    "day": 24.0, "d": 24.0, "night": 24.0,
+    "week": 168.0, "wk": 168.0, "w": 168.0,
+    "month": 730.0, "mo": 730.0,
+    "year": 8760.0, "yr": 8760.0, "y": 8760.0,
+}
+_WORD_QUANTITIES = {
+    "a": (1, 1), "an": (1, 1), "one": (1, 1), "two": (2, 2), "three": (3, 3),
+    "four": (4, 4), "five": (5, 5), "six": (6, 6), "seven": (7, 7), "eight": (8, 8),
+    "nine": (9, 9), "ten": (10, 10), "couple": (2, 2), "few": (2, 4), "several": (3, 7),
+}
+_QUANTITY = r"(\d+(?:\.\d+)?|" + "|".join(sorted(_WORD_QUANTITIES, key=len, reverse=True)) + r")"
+_DURATION_RE = re.compile(
+    r"\b" + _QUANTITY + r"(?:(?<=\d)|\b)(?:\s+of)?\s*(?:(?:-|–|to|or)\s*(\d+(?:\.\d+)?))?\s*"
+    r"(minutes?|mins?|hours?|hrs?|h|days?|d|nights?|weeks?|wks?|w|months?|mos?|years?|yrs?|y)\b"
+)
+_AT_LEAST_RE = re.compile(r"(?:>=?|≥|over|more than|longer than|at least|since|for over)\s*$")
+_AT_MOST_RE = re.compile(r"(?:<=?|≤|under|less than|within|up to|no more than)\s*$")
+_PHRASE_HOURS = {
+    "just now": (0.0, 1.0), "just started": (0.0, 1.0), "today": (0.0, 12.0),
+    "this morning": (0.0, 12.0), "since this morning": (0.0, 12.0), "tonight": (0.0, 12.0),
+    "overnight": (6.0, 24.0), "last night": (6.0, 24.0), "yesterday": (12.0, 36.0),
+}
+_ONSET_FLAGS = {
+    "sudden": ("sudden", "abrupt", "acute", "just started", "out of nowhere", "all of a sudden"),
+    "gradual": ("gradual", "slowly", "over time"),
+    "persistent": (
+        "persistent", "constant", "ongoing", "continuous", "chronic",
+        "won't go away", "not going away", "all the time",
+    ),
+    "recurring": (
+        "recurring", "recurrent", "comes and goes", "on and off", "intermittent",
+        "keeps coming back", "episodes", "episodic",
+    ),
+    "worsening": ("worsening", "getting worse", "worse", "progressive", "increasing"),
+}
+# Rule qualifiers that are also implied by a long enough reported duration
+_QUALIFIER_MIN_HOURS = {"persistent": 24.0}
+
+
+class DurationInfo(NamedTuple):
+    """Canonical duration: an interval in hours (None when unknown) plus onset flags"""
+
+    min_hours: Optional[float]
+    max_hours: Optional[float]
+    flags: FrozenSet[str]
+
+    @property
+    def known(self) -> bool:
+        return self.min_hours is not None or bool(self.flags)
+
+    def interval(self) -> Optional[Interval]:
+        if self.min_hours is None:
+            return None
+        return Interval(self.min_hours, INF if self.max_hours is None else self.max_hours)
+
+
+def _onset_flags(text: str) -> FrozenSet[str]:
+    return frozenset(
+        flag for flag, phrases in _ONSET_FLAGS.items()
+        if any(phrase in text for phrase in phrases)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _parse_duration_normalized(text: str) -> DurationInfo:
+    flags = _onset_flags(text)
+    for phrase, (low, high) in _PHRASE_HOURS.items():
+        if phrase in text:
+            return DurationInfo(low, high, flags)
+
+    match = _DURATION_RE.search(text)
+    if not match:
+        return DurationInfo(None, None, flags)
+
+    quantity, upper, unit = match.groups()
+    unit_hours = _UNIT_HOURS.get(unit.rstrip("s"), _UNIT_HOURS.get(unit))
+    if quantity in _WORD_QUANTITIES:
+        low, high = _WORD_QUANTITIES[quantity]
+    else:
+        low = high = float(quantity)
+    if upper is not None:
+        high = float(upper)
+    low, high = low * unit_hours, high * unit_hours
+
+    prefix = text[:match.start()]
+    if _AT_LEAST_RE.search(prefix):
+        return DurationInfo(low, None, flags)
+    if _AT_MOST_RE.search(prefix):
+        return DurationInfo(0.0, high, flags)
+    return DurationInfo(low, high, flags)
+
+
+def parse_duration(text: Optional[str]) -> Optional[DurationInfo]:
+    """Normalize free-text durations ('3 weeks', 'few hours', 'sudden onset'); memoized per phrase"""
+    if not text:
+        return None
+    return _parse_duration_normalized(text.lower().strip())
+
+
+def parse_duration_constraint(expr: str) -> Tuple[List[Interval], FrozenSet[str]]:
+    """Compile a rule duration term ('>48 hours', '<1 week', 'persistent') to hour ranges and flags"""
+    text = str(expr).lower().strip()
+    comparator = re.match(r"^(>=|<=|≥|≤|>|<)\s*", text)
+    info = _parse_duration_normalized(text[comparator.end():] if comparator else text)
+    intervals: List[Interval] = []
+    if info.min_hours is not None:
+        op = comparator.group(1) if comparator else None
+        if op == ">":
+            intervals.append(Interval(info.min_hours, INF, low_inclusive=False))
+        elif op in (">=", "≥"):
+            intervals.append(Interval(info.min_hours, INF))
+        elif op == "<":
+            intervals.append(Interval(-INF, info.min_hours, high_inclusive=False))
+        elif op in ("<=", "≤"):
+            intervals.append(Interval(-INF, info.min_hours))
+        else:
+            intervals.append(info.interval())
+    for flag in info.flags:
+        if flag in _QUALIFIER_MIN_HOURS:
+            intervals.append(Interval(_QUALIFIER_MIN_HOURS[flag], INF))
+    return intervals, info.flags
+
+
+class IntervalIndex:
+    """Static stabbing index: all intervals containing a point in O(log n + k)
+
+    Interval endpoints split the number line into elementary slots (each endpoint and
+    each open gap between endpoints); every slot stores the payloads covering it.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Interval, Any]]):
+        entries = list(entries)
+        points = sorted({
+            bound
+            for interval, _ in entries
+            for bound in (interval.low, interval.high)
+            if bound not in (INF, -INF)
+        })
+        self._points = points
+        slots: List[Dict[Any, None]] = [{} for _ in range(2 * len(points) + 1)]
+        for interval, payload in entries:
+            first, last = self._slot_span(interval)
+            for slot in range(first, last + 1):
+                slots[slot][payload] = None
+        self._slots: List[Tuple[Any, ...]] = [tuple(slot) for slot in slots]
+
+    def _slot_span(self, interval: Interval) -> Tuple[int, int]:
+        if interval.low == -INF:
+            first = 0
+        else:
+            i = bisect_left(self._points, interval.low)
+            first = 2 * i + 1 if interval.low_inclusive else 2 * i + 2
+        if interval.high == INF:
+            last = 2 * len(self._points)
+        else:
+            j = bisect_left(self._points, interval.high)
+            last = 2 * j + 1 if interval.high_inclusive else 2 * j
+        return first, last
+
+    def overlapping(self, interval: Interval) -> Set[Any]:
+        """Return the payloads of every interval overlapping the given one"""
+        first, last = self._query_span(interval)
+        found: Set[Any] = set()
+        for slot in range(first, last + 1):
+            found.update(self._slots[slot])
+        return found
+
+    def _query_span(self, interval: Interval) -> Tuple[int, int]:
+        n = len(self._points)
+        if interval.low == -INF:
+            first = 0
+        else:
+            i = bisect_left(self._points, interval.low)
+            on_point = i < n and self._points[i] == interval.low
+            first = 2 * i + (1 if on_point and interval.low_inclusive else 2 if on_point else 0)
+        if interval.high == INF:
+            last = 2 * n
+        else:
+            j = bisect_left(self._points, interval.high)
+            on_point = j < n and self._points[j] == interval.high
+            last = 2 * j + (1 if on_point and interval.high_inclusive else 0)
+        return first, last
+
+    def stab(self, value: float) -> Tuple[Any, ...]:
+        """Return the payloads of every interval containing value"""
+        i = bisect_left(self._points, value)
+        if i < len(self._points) and self._points[i] == value:
+            return self._slots[2 * i + 1]
+        return self._slots[2 * i]
+
+
+class RequestFacts:
+    """Values parsed from a triage request once, shared by every index lookup"""
+
+    __slots__ = ("symptoms", "temperature_text", "temperature_f", "age", "duration")
+
+    def __init__(self, symptoms: Sequence[str] = (), temperature: Optional[str] = None,
+                 patient_age: Optional[int] = None, duration: Optional[str] = None):
+        self.symptoms = tuple(dict.fromkeys(s.lower().strip() for s in symptoms))
+        self.temperature_text = temperature.lower().strip() if temperature else None
+        self.temperature_f = parse_temperature(temperature)
+        self.age = float(patient_age) if patient_age is not None else None
+        self.duration = parse_duration(duration)
+
+    @classmethod
+    def from_request(cls, request) -> "RequestFacts":
+        return cls(
+            symptoms=request.symptoms,
+            temperature=request.temperature,
+            patient_age=request.patient_age,
+            duration=request.duration,
+        )
+
+
+class _NumericConstraint:
+    """Interval index for one numeric condition field (temperature or age)"""
+
+    def __init__(self, field: str, parser, conditions: Sequence[Dict]):
+        self.field = field
+        self.constrained: Set[int] = set()
+        # Expressions that do not parse numerically keep the legacy substring behaviour
+        self.text_tokens: Dict[int, List[str]] = {}
+        self.intervals: Dict[int, List[Interval]] = {}
+        entries = []
+        for condition_id, condition in enumerate(conditions):
+            expressions = condition.get(field) or []
+            if not expressions:
+                continue
+            self.constrained.add(condition_id)
+            for expr in expressions:
+                interval = parser(expr)
+                if interval is None:
+                    self.text_tokens.setdefault(condition_id, []).append(str(expr).lower().strip())
+                else:
+                    self.intervals.setdefault(condition_id, []).append(interval)
+                    entries.append((interval, condition_id))
+        self.index = IntervalIndex(entries)
+
+    def accepted(self, value: Optional[float], text: Optional[str]) -> Optional[Set[int]]:
+        """Constrained conditions the value satisfies; None when the request has no value"""
+        if value is None and text is None:
+            return None
+        accepted = set(self.index.stab(value)) if value is not None else set()
+        if text is not None:
+            for condition_id, tokens in self.text_tokens.items():
+                if any(token in text for token in tokens):
+                    accepted.add(condition_id)
+        return accepted
+
+    def allows(self, condition_id: int, accepted: Optional[Set[int]]) -> bool:
+        return accepted is None or condition_id not in self.constrained or condition_id in accepted
+
+
+class _DurationConstraint:
+    """Hour-range interval index plus onset-flag postings for condition durations"""
+
+    def __init__(self, conditions: Sequence[Dict]):
+        self.constrained: Set[int] = set()
+        self.flag_postings: Dict[str, Set[int]] = {}
+        entries = []
+        for condition_id, condition in enumerate(conditions):
+            terms = condition.get("duration") or []
+            if not terms:
+                continue
+            self.constrained.add(condition_id)
+            for term in terms:
+                intervals, flags = parse_duration_constraint(term)
+                entries.extend((interval, condition_id) for interval in intervals)
+                for flag in flags:
+                    self.flag_postings.setdefault(flag, set()).add(condition_id)
+        self.index = IntervalIndex(entries)
+
+    def accepted(self, info: Optional[DurationInfo]) -> Optional[Set[int]]:
+        """Constrained conditions the duration satisfies; None when the duration is unknown"""
+        if info is None or not info.known:
+            return None
+        interval = info.interval()
+        accepted = self.index.overlapping(interval) if interval is not None else set()
+        for flag in info.flags:
+            accepted |= self.flag_postings.get(flag, set())
+        return accepted
+
+    def allows(self, condition_id: int, accepted: Optional[Set[int]]) -> bool:
+        return accepted is None or condition_id not in self.constrained or condition_id in accepted
+
+
+class CompiledRules:
+    """Rules flattened into priority-ordered conditions with symptom, numeric and duration indexes"""
+
+    def __init__(self, sorted_rules: Sequence[Dict], tables=None):
+        """tables, when given, is a RuleArtifact whose condition_rule and symptom_postings
+        were compiled from these same sorted rules; they are used in place instead of rebuilt
+        """
+        self.rules = list(sorted_rules)
+        # conditions[i] belongs to rules[condition_rule[i]]; rule_conditions is the inverse
+        self.conditions: List[Dict] = []
+        condition_rule: List[int] = []
+        self.rule_conditions: List[Tuple[int, ...]] = []
+        for rule_pos, rule in enumerate(self.rules):
+            ids = []
+            for condition in rule.get("conditions", []) or []:
+                ids.append(len(self.conditions))
+                self.conditions.append(condition)
+                condition_rule.append(rule_pos)
+            self.rule_conditions.append(tuple(ids))
+
+        if tables is not None:
+            self.condition_rule: Sequence[int] = tables.condition_rule
+            self.symptom_postings: Mapping[str, Tuple[int, ...]] = tables.symptom_postings
+        else:
+            self.condition_rule = condition_rule
+            # Normalized symptom phrase -> conditions listing it
+            postings: Dict[str, Dict[int, None]] = {}
+            for condition_id, condition in enumerate(self.conditions):
+                for phrase in entry_phrases(condition):
+                    postings.setdefault(phrase.lower().strip(), {})[condition_id] = None
+            self.symptom_postings = {phrase: tuple(ids) for phrase, ids in postings.items()}
+        self.conditions_for_symptom = lru_cache(maxsize=8192)(self._scan_symptom)
+        # all_of / none_of / at_least clauses, compiled to predicates over matched group terms
+        self.groups = CompiledGroups(self.conditions)
+
+        self.temperature = _NumericConstraint("temperature", parse_temperature_range, self.conditions)
+        self.age = _NumericConstraint("age", parse_age_range, self.conditions)
+        self.duration = _DurationConstraint(self.conditions)
+
+    def _scan_symptom(self, symptom: str) -> FrozenSet[int]:
+        """Conditions whose symptom phrases contain, or are contained in, a normalized user symptom"""
+        found: Set[int] = set()
+        for phrase, ids in self.symptom_postings.items():
+            if phrase in symptom or symptom in phrase:
+                found.update(ids)
+        return frozenset(found)
+
+    def recognizes(self, symptom: str) -> bool:
+        """Whether a normalized user symptom matches any phrase of any condition"""
+        return bool(self.conditions_for_symptom(symptom)) or bool(self.groups.bits_for_symptom(symptom))
+
+    def candidates(self, facts: RequestFacts, check_duration: bool = True) -> List[int]:
+        """Condition ids, in priority order, passing the symptom, symptom group, temperature, age and duration indexes
+
+        Severity and additional factors are left to the caller. With check_duration=False the
+        duration index is skipped, so the caller can apply self.duration itself.
+        """
+        matched: Set[int] = set()
+        for symptom in facts.symptoms:
+            matched |= self.conditions_for_symptom(symptom)
+        if not matched:
+            return []
+        if self.groups.predicates:
+            bits = self.groups.request_bits(facts.symptoms)
+            matched = {condition_id for condition_id in matched if self.groups.allows(condition_id, bits)}
+
+        temperatures = self.temperature.accepted(facts.temperature_f, facts.temperature_text)
+        ages = self.age.accepted(facts.age, None)
+        durations = self.duration.accepted(facts.duration) if check_duration else None
+        temperature, age, duration = self.temperature, self.age, self.duration
+        return sorted(
+            condition_id for condition_id in matched
+            if temperature.allows(condition_id, temperatures)
+            and age.allows(condition_id, ages)
+            and duration.allows(condition_id, durations)
+        )
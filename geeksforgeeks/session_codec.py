@@ -0,0 +1,197 @@
+"""
+Compact triage_sessions row format
+Each fact is stored once: symptoms, severity, duration and factors live in their columns,
+matched rules are stored as comma-separated rule ids, and only the remaining request fields go
+into session_data as a versioned blob (version byte, flags byte, compact and optionally
+zlib-compressed JSON). Legacy rows (JSON/repr text) are still decoded transparently.
+
+Migrate existing rows:
+    python session_codec.py [--db triage_sessions.db] [--batch-size 5000] [--vacuum]
+"""
+
+import argparse
+import ast
+import json
+import os
+import sqlite3
+import sys
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+COMPRESS_THRESHOLD = 96
+DEFAULT_BATCH_SIZE = 5000
+LIST_SEPARATOR = ", "
+
+# Request fields persisted as their own columns
+COLUMN_FIELDS = ("symptoms", "severity", "duration", "additional_factors")
+# Envelope keys of legacy JSON payloads that are already columns
+LEGACY_META_FIELDS = ("recorded_at", "user_id")
+
+
+def encode_matched_rules(matched_rules: Iterable[Dict[str, Any]]) -> str:
+    return ",".join(rule["id"] for rule in matched_rules)
+
+
+def decode_matched_rules(value: Optional[str]) -> List[str]:
+    """Rule ids from either the compact id list or a legacy str() repr of the rule dicts"""
+    if not value:
+        return []
+    if value.lstrip().startswith("["):
+        try:
+            return [rule["id"] for rule in ast.literal_eval(value)]
+        except (ValueError, SyntaxError, TypeError, KeyError):
+            return []
+    return [rule_id for rule_id in value.split(",") if rule_id]
+
+
+def _join(values: Optional[List[str]]) -> str:
+    return LIST_SEPARATOR.join(values or [])
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def encode_columns(request: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "symptoms": _join(request.get("symptoms")),
+        "severity": request.get("severity") or "",
+        "duration": request.get("duration") or "",
+        "additional_factors": _join(request.get("additional_factors")),
+    }
+
+
+def encode_payload(request: Dict[str, Any], session_id: Optional[str] = None) -> Optional[bytes]:
+    """Blob for the request fields the columns cannot reproduce, or None if there are none"""
+    extras = {
+        key: value for key, value in request.items()
+        if value is not None and key not in COLUMN_FIELDS and not (key == "session_id" and value == session_id)
+    }
+    # Lists only round-trip through their column when no item contains the separator
+    for key in ("symptoms", "additional_factors"):
+        values = request.get(key) or []
+        if _split(_join(values)) != [value.strip() for value in values]:
+            extras[key] = values
+    if not extras:
+        return None
+
+    body = json.dumps(extras, separators=(",", ":")).encode("utf-8")
+    flags = 0
+    if len(body) > COMPRESS_THRESHOLD:
+        compressed = zlib.compress(body, 9)
+        if len(compressed) < len(body):
+            body, flags = compressed, FLAG_ZLIB
+    return bytes((FORMAT_VERSION, flags)) + body
+
+
+def decode_payload(session_data: Union[bytes, str, None]) -> Dict[str, Any]:
+    """Extra request fields from a compact blob, or the request from a legacy text payload"""
+    if not session_data:
+        return {}
+    if isinstance(session_data, (bytes, memoryview)):
+        blob = bytes(session_data)
+        if len(blob) < 2:
+            raise ValueError("Truncated session payload")
+        version, flags, body = blob[0], blob[1], blob[2:]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unknown session payload version: {version}")
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        return json.loads(body)
+    try:
+        legacy = json.loads(session_data)
+    except ValueError:
+        try:
+            legacy = ast.literal_eval(session_data)
+        except (ValueError, SyntaxError):
+            return {}
+    if not isinstance(legacy, dict):
+        return {}
+    if "request" in legacy:
+        return legacy["request"] or {}
+    return {key: value for key, value in legacy.items() if key not in LEGACY_META_FIELDS}
+
+
+def decode_request(
+    session_id: Optional[str],
+    symptoms: Optional[str],
+    severity: Optional[str],
+    duration: Optional[str],
+    additional_factors: Optional[str],
+    session_data: Union[bytes, str, None],
+) -> Dict[str, Any]:
+    """Rebuild the original request dict from a row in either format"""
+    request: Dict[str, Any] = {
+        "symptoms": _split(symptoms),
+        "severity": severity or None,
+        "duration": duration or None,
+        "additional_factors": _split(additional_factors),
+        "session_id": session_id,
+    }
+    request.update(decode_payload(session_data))
+    return request
+
+
+def migrate_sessions(db_file: str, batch_size: int = DEFAULT_BATCH_SIZE, vacuum: bool = False) -> int:
+    """Rewrite legacy rows into the compact format in batches; returns rows converted"""
+    conn = sqlite3.connect(db_file)
+    converted = 0
+    try:
+        cursor = conn.cursor()
+        while True:
+            cursor.execute("""
+                SELECT id, symptoms, severity, duration, additional_factors, matched_rules, session_data
+                FROM triage_sessions
+                WHERE typeof(session_data) = 'text' OR matched_rules LIKE '[%'
+                LIMIT ?
+            """, (batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for session_id, symptoms, severity, duration, factors, matched_rules, session_data in rows:
+                request = decode_request(session_id, symptoms, severity, duration, factors, session_data)
+                columns = encode_columns(request)
+                updates.append((
+                    columns["symptoms"], columns["severity"], columns["duration"], columns["additional_factors"],
+                    ",".join(decode_matched_rules(matched_rules)),
+                    encode_payload(request, session_id),
+                    session_id,
+                ))
+            cursor.executemany("""
+                UPDATE triage_sessions
+                SET symptoms = ?, severity = ?, duration = ?, additional_factors = ?,
+                    matched_rules = ?, session_data = ?
+                WHERE id = ?
+            """, updates)
+            conn.commit()
+            converted += len(updates)
+        if vacuum:
+            conn.execute("VACUUM")
+            # VACUUM may renumber rowids, which the external-content search index is keyed on
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'triage_sessions_fts'")
+            if cursor.fetchone():
+                conn.execute("INSERT INTO triage_sessions_fts (triage_sessions_fts) VALUES ('rebuild')")
+                conn.commit()
+    finally:
+        conn.close()
+    return converted
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert triage_sessions rows to the compact format")
+    parser.add_argument("--db", default=os.getenv("TRIAGE_DB_FILE", "triage_sessions.db"),
+                        help="SQLite database with triage_sessions")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to reclaim space")
+    args = parser.parse_args(argv)
+
+    converted = migrate_sessions(args.db, args.batch_size, args.vacuum)
+    print(f"Converted {converted} session rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
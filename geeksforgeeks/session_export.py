@@ -0,0 +1,224 @@
+"""
+Streaming export of triage sessions
+Streams triage_sessions as CSV or JSONL (optionally gzip-compressed) in keyset order, so
+memory use stays constant regardless of export size and interrupted exports can resume.
+
+CLI usage:
+    python session_export.py --format jsonl --gzip --out sessions.jsonl.gz [--start 2025-01-01]
+"""
+
+import argparse
+import base64
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import zlib
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+try:
+    from .admin_backend import get_current_admin, log_admin_activity
+    from .metrics import TrackedConnection
+    from .session_codec import decode_matched_rules
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from admin_backend import get_current_admin, log_admin_activity  # type: ignore
+    from metrics import TrackedConnection  # type: ignore
+    from session_codec import decode_matched_rules  # type: ignore
+
+DB_FILE = os.getenv("TRIAGE_DB_FILE", "triage_sessions.db")
+
+EXPORT_COLUMNS = [
+    "id", "timestamp", "user_id", "symptoms", "severity", "duration",
+    "additional_factors", "triage_label", "matched_rules", "explanation",
+]
+FETCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+export_router = APIRouter(prefix="/api/admin/export", tags=["admin"])
+
+
+def encode_cursor(timestamp: str, session_id: str) -> str:
+    """Opaque keyset cursor for the (timestamp, id) position of a row"""
+    return base64.urlsafe_b64encode(f"{timestamp}|{session_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        timestamp, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid export cursor")
+    return timestamp, session_id
+
+
+def _normalize_bound(value: Optional[str]) -> Optional[str]:
+    return value.replace("T", " ") if value else None
+
+
+def iter_sessions(
+    conn: sqlite3.Connection,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    label: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Yield session rows in (timestamp, id) order, fetching FETCH_SIZE rows at a time"""
+    clauses: List[str] = []
+    params: List = []
+    if start:
+        clauses.append("timestamp >= ?")
+        params.append(_normalize_bound(start))
+    if end:
+        clauses.append("timestamp < ?")
+        params.append(_normalize_bound(end))
+    if label:
+        clauses.append("triage_label = ?")
+        params.append(label)
+    if after:
+        clauses.append("(timestamp, id) > (?, ?)")
+        params.extend(decode_cursor(after))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT {', '.join(EXPORT_COLUMNS)}
+        FROM triage_sessions
+        {where}
+        ORDER BY timestamp, id
+    """, params)
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record["matched_rules"] = ",".join(decode_matched_rules(record["matched_rules"]))
+            record["cursor"] = encode_cursor(record["timestamp"], record["id"])
+            yield record
+
+
+def render_csv(records: Iterator[Dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS + ["cursor"])
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def render_jsonl(records: Iterator[Dict]) -> Iterator[str]:
+    parts: List[str] = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, default=str) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(parts)
+            parts, size = [], 0
+    yield "".join(parts)
+
+
+def encode_stream(chunks: Iterator[str], compress: bool) -> Iterator[bytes]:
+    """UTF-8 encode text chunks, gzip-compressing incrementally when requested"""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def export_sessions(
+    db_file: str,
+    fmt: str = "jsonl",
+    compress: bool = False,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    label: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Iterator[bytes]:
+    """Byte stream of an export; owns its connection for the lifetime of the generator"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if after:
+        decode_cursor(after)
+    # Streaming responses may resume the generator on different worker threads
+    conn = sqlite3.connect(db_file, check_same_thread=False, factory=TrackedConnection)
+    try:
+        records = iter_sessions(conn, start, end, label, after)
+        render = render_csv if fmt == "csv" else render_jsonl
+        yield from encode_stream(render(records), compress)
+    finally:
+        conn.close()
+
+
+@export_router.get("/sessions")
+async def export_sessions_endpoint(
+    format: str = Query("jsonl", pattern="^(csv|jsonl)$"),
+    gzip: bool = False,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    label: Optional[str] = None,
+    after: Optional[str] = None,
+    current_admin: Dict = Depends(get_current_admin),
+):
+    """Stream triage sessions as CSV or JSONL; resume with the last row's cursor as ?after="""
+    if after:
+        try:
+            decode_cursor(after)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    log_admin_activity(
+        current_admin["id"], "EXPORT_SESSIONS",
+        f"Exported sessions as {format} (start={start}, end={end}, label={label})",
+    )
+
+    filename = f"triage_sessions.{format}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(
+        export_sessions(DB_FILE, format, gzip, start, end, label, after),
+        media_type="application/gzip" if gzip else FORMATS[format],
+        headers=headers,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream triage sessions to CSV or JSONL")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite database with triage_sessions")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jsonl")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress the output")
+    parser.add_argument("--start", help="Only sessions at or after this date/time")
+    parser.add_argument("--end", help="Only sessions before this date/time")
+    parser.add_argument("--label", help="Only sessions with this triage label")
+    parser.add_argument("--after", help="Resume after this cursor (from the last exported row)")
+    parser.add_argument("--out", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    stream = export_sessions(args.db, args.format, args.gzip, args.start, args.end, args.label, args.after)
+    if args.out:
+        with open(args.out, "wb") as out:
+            for chunk in stream:
+                out.write(chunk)
+    else:
+        for chunk in stream:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Full-text search over triage sessions
+An external-content FTS5 index over symptoms, additional_factors and explanation, kept in sync
+with triage_sessions by triggers, exposed as a ranked admin search with snippets, date/label
+filters and keyset pagination.
+"""
+
+import base64
+import json
+import re
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+try:
+    from .admin_backend import get_current_admin
+    from .metrics import ADMIN_QUERY_SECONDS, TrackedConnection
+    from .session_export import DB_FILE
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from admin_backend import get_current_admin  # type: ignore
+    from metrics import ADMIN_QUERY_SECONDS, TrackedConnection  # type: ignore
+    from session_export import DB_FILE  # type: ignore
+
+FTS_TABLE = "triage_sessions_fts"
+FTS_COLUMNS = ("symptoms", "additional_factors", "explanation")
+# bm25 column weights: symptom hits matter most, explanation text least
+BM25_WEIGHTS = (4.0, 2.0, 1.0)
+MAX_PAGE_SIZE = 100
+
+search_router = APIRouter(prefix="/api/admin/search", tags=["admin"])
+
+_columns = ", ".join(FTS_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+
+_TRIGGERS = {
+    # INSERT OR REPLACE deletes the old row without firing delete triggers, so drop its entry first
+    "triage_sessions_fts_before_insert": f"""
+        BEFORE INSERT ON triage_sessions BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_columns})
+            SELECT 'delete', rowid, {_columns} FROM triage_sessions WHERE id = new.id;
+        END
+    """,
+    "triage_sessions_fts_after_insert": f"""
+        AFTER INSERT ON triage_sessions BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, {_columns}) VALUES (new.rowid, {_new_values});
+        END
+    """,
+    "triage_sessions_fts_after_delete": f"""
+        AFTER DELETE ON triage_sessions BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.rowid, {_old_values});
+        END
+    """,
+    "triage_sessions_fts_after_update": f"""
+        AFTER UPDATE OF {_columns} ON triage_sessions BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.rowid, {_old_values});
+            INSERT INTO {FTS_TABLE} (rowid, {_columns}) VALUES (new.rowid, {_new_values});
+        END
+    """,
+}
+
+
+def init_search_index(conn: sqlite3.Connection) -> None:
+    """Create the FTS5 index and its sync triggers, backfilling existing sessions once"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,))
+    exists = cursor.fetchone() is not None
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {_columns},
+            content='triage_sessions',
+            content_rowid='rowid',
+            tokenize='porter unicode61'
+        )
+    """)
+    for name, body in _TRIGGERS.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    if not exists:
+        rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """Re-derive the index from triage_sessions (needed after VACUUM renumbers rowids)"""
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: comma/'and'-separated phrases that must all match"""
+    phrases = [phrase.strip() for phrase in re.split(r",|\band\b", text, flags=re.IGNORECASE)]
+    terms = []
+    for phrase in phrases:
+        words = re.findall(r"\w+", phrase)
+        if words:
+            terms.append('"' + " ".join(words) + '"')
+    if not terms:
+        raise ValueError("Search query has no searchable terms")
+    return " AND ".join(terms)
+
+
+def encode_cursor(values: Tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError("Invalid search cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid search cursor")
+    return values
+
+
+def search_sessions(
+    conn: sqlite3.Connection,
+    text: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    label: Optional[str] = None,
+    order: str = "rank",
+    limit: int = 20,
+    after: Optional[str] = None,
+) -> Dict:
+    """One page of matching sessions plus the cursor for the next page"""
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    clauses = [f"{FTS_TABLE} MATCH ?"]
+    params: List = [build_match_query(text)]
+    if start:
+        clauses.append("s.timestamp >= ?")
+        params.append(start.replace("T", " "))
+    if end:
+        clauses.append("s.timestamp < ?")
+        params.append(end.replace("T", " "))
+    if label:
+        clauses.append("s.triage_label = ?")
+        params.append(label)
+
+    if order == "recent":
+        # rowid order lets FTS5 stream matches instead of ranking the whole result set
+        sort_key = f"{FTS_TABLE}.rowid"
+        order_by = f"{FTS_TABLE}.rowid DESC"
+        if after:
+            clauses.append(f"{FTS_TABLE}.rowid < ?")
+            params.append(decode_cursor(after)[1])
+    else:
+        sort_key = f"bm25({FTS_TABLE}, {weights})"
+        order_by = f"score, {FTS_TABLE}.rowid"
+        if after:
+            clauses.append(f"({sort_key}, {FTS_TABLE}.rowid) > (?, ?)")
+            params.extend(decode_cursor(after))
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT s.id, s.timestamp, s.triage_label, s.symptoms,
+               snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+               {sort_key} AS score, {FTS_TABLE}.rowid
+        FROM {FTS_TABLE}
+        JOIN triage_sessions s ON s.rowid = {FTS_TABLE}.rowid
+        WHERE {' AND '.join(clauses)}
+        ORDER BY {order_by}
+        LIMIT ?
+    """, params + [limit + 1])
+    rows = cursor.fetchall()
+
+    results = [
+        {
+            "id": row[0],
+            "timestamp": row[1],
+            "triage_label": row[2],
+            "symptoms": row[3],
+            "snippet": row[4],
+            "score": row[5] if order != "recent" else None,
+        }
+        for row in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor((last[5], last[6]))
+    return {"results": results, "next_cursor": next_cursor}
+
+
+@search_router.get("/sessions")
+@ADMIN_QUERY_SECONDS.labels("search_sessions").time()
+async def search_sessions_endpoint(
+    q: str = Query(..., min_length=1),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    label: Optional[str] = None,
+    order: str = Query("rank", pattern="^(rank|recent)$"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    current_admin: Dict = Depends(get_current_admin),
+):
+    """Ranked full-text search over symptoms, factors and explanations"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        return search_sessions(conn, q, start, end, label, order, limit, after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        conn.close()
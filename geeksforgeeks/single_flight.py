@@ -0,0 +1,73 @@
+"""
+Single-flight call coalescing
+Concurrent calls for the same key share one execution. The first caller runs the function;
+duplicates that arrive while it is in flight wait for its result, or for its exception,
+instead of repeating the work. Nothing is cached once the call completes.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+try:
+    from .metrics import Counter, Gauge
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Counter, Gauge  # type: ignore
+
+T = TypeVar("T")
+
+LLM_IN_FLIGHT = Gauge("triage_llm_calls_in_flight", "Distinct LLM explanation calls currently running")
+LLM_COALESCED = Counter("triage_llm_calls_coalesced_total", "LLM explanation requests that joined an in-flight call")
+
+
+class SingleFlight:
+    """Thread-safe per-key call coalescing"""
+
+    def __init__(self, in_flight_gauge: Optional[Gauge] = None, coalesced_counter: Optional[Counter] = None):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._in_flight_gauge = in_flight_gauge
+        self._coalesced_counter = coalesced_counter
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _publish(self) -> None:
+        if self._in_flight_gauge is not None:
+            self._in_flight_gauge.set(len(self._calls))
+
+    def do(self, key: Hashable, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """Run fn once per key at a time; joiners wait at most timeout seconds
+
+        Every caller sees the same outcome: the leader's return value or its exception.
+        A joiner that waits too long gets concurrent.futures.TimeoutError.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._publish()
+
+        if not leader:
+            if self._coalesced_counter is not None:
+                self._coalesced_counter.inc()
+            return future.result(timeout)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self._publish()
+
+
+llm_flights = SingleFlight(LLM_IN_FLIGHT, LLM_COALESCED)
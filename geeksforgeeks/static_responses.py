@@ -0,0 +1,41 @@
+"""
+Prebuilt responses for static-ish endpoints
+Bodies are serialized once (at startup and on rule reload) and served as bytes with a strong
+ETag; a matching If-None-Match short-circuits to 304 Not Modified.
+"""
+
+import hashlib
+import json
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Clients may cache but must revalidate, which is what makes If-None-Match polling cheap
+CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored and * matches anything"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class PrebuiltResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+    def respond(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def prebuilt_json(content: Any, version: Optional[str] = None) -> PrebuiltResponse:
+    """Serialize once; the ETag is the given version or else a hash of the body"""
+    body = json.dumps(content, default=str, separators=(",", ":")).encode("utf-8")
+    tag = version or hashlib.sha256(body).hexdigest()[:16]
+    return PrebuiltResponse(body, f'"{tag}"')
@@ -0,0 +1,177 @@
+"""
+Boolean symptom-group conditions
+Besides `symptoms` (any one phrase matches), a rule condition may list symptom groups:
+
+    all_of: ["fever", ["stiff neck", "neck stiffness"]]   # every group matches
+    none_of: ["rash"]                                     # no group matches
+    at_least: {count: 2, of: ["fever", "cough", "fatigue"]}
+
+A group is a phrase or a list of alternative phrases, matched against user symptoms with the
+same substring test as `symptoms`. Every group phrase is interned to a bit at load. Each
+condition compiles once into a flat closure over the request's matched-term bitset, so a
+request pays one cached lookup per symptom plus a few integer ANDs per candidate condition.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+GROUP_KEYS = ("all_of", "none_of", "at_least")
+
+Group = Tuple[str, ...]
+Predicate = Callable[[int], bool]
+
+
+class ConditionError(ValueError):
+    """A rule condition's symptom groups are malformed"""
+
+
+def _normalize(text: str) -> str:
+    return str(text).lower().strip()
+
+
+def _groups(value: Any, where: str) -> List[Group]:
+    if isinstance(value, str) or not isinstance(value, Sequence):
+        raise ConditionError(f"{where} must be a list of phrases or phrase lists")
+    groups = []
+    for item in value:
+        phrases = (item,) if isinstance(item, str) else tuple(item) if isinstance(item, Sequence) else ()
+        group = tuple(dict.fromkeys(_normalize(p) for p in phrases if isinstance(p, str) and p.strip()))
+        if not group:
+            raise ConditionError(f"{where} has an empty or non-text group: {item!r}")
+        groups.append(group)
+    return groups
+
+
+class ParsedGroups:
+    """A condition's all_of / none_of / at_least clauses, normalized"""
+
+    __slots__ = ("all_of", "none_of", "at_least", "at_least_of")
+
+    def __init__(self, condition: Mapping):
+        self.all_of = _groups(condition.get("all_of") or [], "all_of")
+        self.none_of = _groups(condition.get("none_of") or [], "none_of")
+        self.at_least = 0
+        self.at_least_of: List[Group] = []
+        spec = condition.get("at_least")
+        if spec is not None:
+            if not isinstance(spec, Mapping) or "count" not in spec or "of" not in spec:
+                raise ConditionError("at_least must be a mapping with 'count' and 'of'")
+            self.at_least_of = _groups(spec["of"], "at_least.of")
+            count = spec["count"]
+            if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= len(self.at_least_of):
+                raise ConditionError(f"at_least.count must be between 1 and {len(self.at_least_of)}, got {count!r}")
+            self.at_least = count
+        if not condition.get("symptoms") and not self.positive:
+            raise ConditionError("a condition without symptoms needs all_of or at_least")
+
+    @property
+    def positive(self) -> List[Group]:
+        """Groups of which at least one must match"""
+        return self.all_of + self.at_least_of
+
+    def phrases(self) -> List[str]:
+        return [p for group in self.all_of + self.none_of + self.at_least_of for p in group]
+
+
+def has_groups(condition: Mapping) -> bool:
+    return any(condition.get(key) is not None for key in GROUP_KEYS)
+
+
+def entry_phrases(condition: Mapping) -> List[str]:
+    """Phrases that make a condition a candidate: its symptoms, else its all_of/at_least phrases"""
+    symptoms = condition.get("symptoms") or []
+    if symptoms or not has_groups(condition):
+        return list(symptoms)
+    return [p for group in ParsedGroups(condition).positive for p in group]
+
+
+def symptom_phrases(condition: Mapping) -> List[str]:
+    """Every symptom phrase a condition mentions, in its symptoms or any group"""
+    phrases = list(condition.get("symptoms") or [])
+    if has_groups(condition):
+        phrases.extend(ParsedGroups(condition).phrases())
+    return phrases
+
+
+def _phrase_matches(phrase: str, symptoms: Iterable[str]) -> bool:
+    return any(phrase in symptom or symptom in phrase for symptom in symptoms)
+
+
+def groups_match(condition: Mapping, symptoms: Sequence[str]) -> bool:
+    """Interpreted check of a condition's groups against normalized user symptoms"""
+    if not has_groups(condition):
+        return True
+    parsed = ParsedGroups(condition)
+
+    def hit(group: Group) -> bool:
+        return any(_phrase_matches(phrase, symptoms) for phrase in group)
+
+    return (
+        all(hit(group) for group in parsed.all_of)
+        and not any(hit(group) for group in parsed.none_of)
+        and sum(hit(group) for group in parsed.at_least_of) >= parsed.at_least
+    )
+
+
+def _compile(all_masks: Tuple[int, ...], none_mask: int, count: int, of_masks: Tuple[int, ...]) -> Predicate:
+    def predicate(bits: int) -> bool:
+        for mask in all_masks:
+            if not bits & mask:
+                return False
+        if bits & none_mask:
+            return False
+        if count:
+            hits = 0
+            for mask in of_masks:
+                if bits & mask:
+                    hits += 1
+                    if hits == count:
+                        break
+            else:
+                return False
+        return True
+
+    return predicate
+
+
+class CompiledGroups:
+    """Interned group phrases and one compiled predicate per condition that has groups"""
+
+    def __init__(self, conditions: Sequence[Mapping]):
+        self.terms: Dict[str, int] = {}
+        self.predicates: Dict[int, Predicate] = {}
+        for condition_id, condition in enumerate(conditions):
+            if not has_groups(condition):
+                continue
+            parsed = ParsedGroups(condition)
+            self.predicates[condition_id] = _compile(
+                tuple(self._mask(group) for group in parsed.all_of),
+                self._mask(p for group in parsed.none_of for p in group),
+                parsed.at_least,
+                tuple(self._mask(group) for group in parsed.at_least_of),
+            )
+        self.bits_for_symptom = lru_cache(maxsize=8192)(self._scan_symptom)
+
+    def _mask(self, phrases: Iterable[str]) -> int:
+        mask = 0
+        for phrase in phrases:
+            mask |= 1 << self.terms.setdefault(phrase, len(self.terms))
+        return mask
+
+    def _scan_symptom(self, symptom: str) -> int:
+        """Bitset of the group phrases a normalized user symptom matches"""
+        bits = 0
+        for phrase, bit in self.terms.items():
+            if phrase in symptom or symptom in phrase:
+                bits |= 1 << bit
+        return bits
+
+    def request_bits(self, symptoms: Iterable[str]) -> int:
+        bits = 0
+        for symptom in symptoms:
+            bits |= self.bits_for_symptom(symptom)
+        return bits
+
+    def allows(self, condition_id: int, bits: int) -> bool:
+        predicate: Optional[Predicate] = self.predicates.get(condition_id)
+        return predicate is None or predicate(bits)
@@ -0,0 +1,211 @@
+"""
+Symptom autocomplete
+A compressed prefix (radix) trie over every symptom and additional-factor phrase in the rules.
+Each phrase is inserted at its start and at every later word, so "bre" finds "shortness of
+breath". Every node keeps its ranked top suggestions, so a lookup is a walk down the typed
+prefix with no subtree scan. Ranking puts phrases that start with the query first, then
+phrases reported more often in triage_sessions, then higher rule priority. The trie is rebuilt
+on rules reload, and the counts are refreshed incrementally by a background thread.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter as Tally
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .metrics import Gauge
+    from .symptom_groups import symptom_phrases
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import Gauge  # type: ignore
+    from symptom_groups import symptom_phrases  # type: ignore
+
+SYMPTOM_SUGGEST_REFRESH_SECONDS = float(os.getenv("SYMPTOM_SUGGEST_REFRESH_SECONDS", "300"))
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+
+SUGGEST_PHRASES = Gauge("triage_symptom_suggest_phrases", "Phrases in the symptom autocomplete trie")
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_phrase(text: str) -> str:
+    return _SPACES.sub(" ", text.lower()).strip()
+
+
+class Suggestion(NamedTuple):
+    phrase: str
+    priority: int
+    frequency: int
+
+
+# (mid-phrase match, -frequency, priority, phrase): smaller ranks first
+RankKey = Tuple[bool, int, int, str]
+
+
+class _Node:
+    __slots__ = ("edges", "entries", "top")
+
+    def __init__(self):
+        # First character -> (edge label, child)
+        self.edges: Dict[str, Tuple[str, "_Node"]] = {}
+        self.entries: List[RankKey] = []
+        self.top: Tuple[Suggestion, ...] = ()
+
+
+class SuggestionTrie:
+    """Radix trie answering prefix queries from per-node precomputed rankings"""
+
+    def __init__(self, priorities: Dict[str, int], frequencies: Optional[Dict[str, int]] = None,
+                 top_k: int = MAX_SUGGESTIONS):
+        self.top_k = top_k
+        self.size = len(priorities)
+        self._root = _Node()
+        frequencies = frequencies or {}
+        for phrase, priority in priorities.items():
+            frequency = frequencies.get(phrase, 0)
+            words = list(re.finditer(r"\S+", phrase))
+            for position, word in enumerate(words):
+                self._insert(phrase[word.start():], (position > 0, -frequency, priority, phrase))
+        self._rank(self._root)
+
+    def _insert(self, key: str, entry: RankKey) -> None:
+        node = self._root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.edges[key[0]] = (key, child)
+                node = child
+                break
+            label, child = edge
+            common = 0
+            while common < min(len(label), len(key)) and label[common] == key[common]:
+                common += 1
+            if common < len(label):
+                # Split the edge where the new key diverges
+                middle = _Node()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[key[0]] = (label[:common], middle)
+                child = middle
+            node, key = child, key[common:]
+        node.entries.append(entry)
+
+    def _rank(self, node: _Node) -> List[RankKey]:
+        best: Dict[str, RankKey] = {}
+        candidates = list(node.entries)
+        for _, child in node.edges.values():
+            candidates.extend(self._rank(child))
+        for entry in candidates:
+            phrase = entry[3]
+            if phrase not in best or entry < best[phrase]:
+                best[phrase] = entry
+        ranked = sorted(best.values())[:self.top_k]
+        node.top = tuple(Suggestion(phrase, priority, -negative) for _, negative, priority, phrase in ranked)
+        node.entries = []
+        return ranked
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Suggestion]:
+        key = normalize_phrase(query)
+        if not key:
+            return []
+        node = self._root
+        while key:
+            edge = node.edges.get(key[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if key.startswith(label):
+                node, key = child, key[len(label):]
+            elif label.startswith(key):
+                node, key = child, ""
+            else:
+                return []
+        return list(node.top[:limit])
+
+
+def rule_phrases(rules: Iterable[Dict]) -> Dict[str, int]:
+    """Every symptom/factor phrase mapped to the best (lowest) priority of the rules using it"""
+    priorities: Dict[str, int] = {}
+    for rule in rules:
+        priority = rule.get("priority", 999)
+        for condition in rule.get("conditions", []) or []:
+            for phrase in symptom_phrases(condition) + (condition.get("additional_factors") or []):
+                phrase = normalize_phrase(phrase)
+                if phrase:
+                    priorities[phrase] = min(priority, priorities.get(phrase, priority))
+    return priorities
+
+
+class SessionFrequencies:
+    """Running counts of reported symptoms/factors, read incrementally by rowid"""
+
+    def __init__(self):
+        self.counts: Tally = Tally()
+        self.last_rowid = 0
+
+    def refresh(self, db_file: str) -> bool:
+        """Count rows logged since the last refresh; True if any were found"""
+        conn = sqlite3.connect(db_file)
+        try:
+            rows = conn.execute("""
+                SELECT rowid, symptoms, additional_factors FROM triage_sessions
+                WHERE rowid > ? ORDER BY rowid
+            """, (self.last_rowid,)).fetchall()
+        except sqlite3.OperationalError:
+            return False
+        finally:
+            conn.close()
+        for rowid, symptoms, factors in rows:
+            # Columns hold comma-joined lists; a session counts each phrase once
+            items = f"{symptoms or ''},{factors or ''}".split(",")
+            self.counts.update({normalize_phrase(item) for item in items} - {""})
+            self.last_rowid = rowid
+        return bool(rows)
+
+
+class SymptomSuggester:
+    """Current suggestion trie, rebuilt on rules reload and when session counts change"""
+
+    def __init__(self):
+        self.frequencies = SessionFrequencies()
+        self.priorities: Dict[str, int] = {}
+        self.trie = SuggestionTrie({})
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Suggestion]:
+        return self.trie.suggest(query, limit)
+
+    def _rebuild(self) -> None:
+        self.trie = SuggestionTrie(self.priorities, self.frequencies.counts)
+        SUGGEST_PHRASES.set(self.trie.size)
+
+    def load_rules(self, rules: Iterable[Dict]) -> None:
+        with self._lock:
+            self.priorities = rule_phrases(rules)
+            self._rebuild()
+
+    def refresh(self, db_file: str) -> None:
+        with self._lock:
+            if self.frequencies.refresh(db_file):
+                self._rebuild()
+
+    def start_refresh(self, db_file: str, interval: float = SYMPTOM_SUGGEST_REFRESH_SECONDS) -> threading.Thread:
+        """Refresh now and then every interval seconds in a daemon thread, until stop()"""
+        self._stop.clear()
+
+        def run() -> None:
+            while True:
+                self.refresh(db_file)
+                if self._stop.wait(interval):
+                    return
+
+        thread = threading.Thread(target=run, name="symptom-suggest-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,87 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import admin_backend
+from admin_identity import AdminIdentityCache, bump_revocation_stamp, revocation_stamp_path
+from triage import app, init_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def admin_db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "admins.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    monkeypatch.setattr(admin_backend, "DB_FILE", db_file)
+    init_db()
+    admin_backend.init_admin_db()
+    return db_file
+
+
+def _login(username, password):
+    response = client.post("/api/admin/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_cached_identity_skips_the_database(admin_db, monkeypatch):
+    headers = _login("admin", "admin123")
+    assert client.get("/api/admin/review-queue/stats", headers=headers).status_code == 200
+
+    def no_lookup(*args):
+        raise AssertionError("admin_users queried for a cached admin")
+
+    monkeypatch.setattr(admin_backend, "fetch_admin", no_lookup)
+    assert client.get("/api/admin/review-queue/stats", headers=headers).status_code == 200
+
+
+def test_revocations_apply_on_next_request(admin_db):
+    root = _login("admin", "admin123")
+    created = client.post(
+        "/api/admin/admins",
+        json={"username": "nurse", "email": "nurse@example.com", "password": "nurse-pass", "role": "superadmin"},
+        headers=root,
+    )
+    assert created.status_code == 201
+    nurse_id = created.json()["id"]
+    nurse = _login("nurse", "nurse-pass")
+    assert client.get("/api/admin/admins", headers=nurse).json()["total"] == 2
+
+    demoted = client.patch(f"/api/admin/admins/{nurse_id}", json={"role": "admin"}, headers=root)
+    assert demoted.json()["role"] == "admin"
+    assert client.get("/api/admin/admins", headers=nurse).status_code == 403
+
+    client.patch(f"/api/admin/admins/{nurse_id}", json={"is_active": False}, headers=root)
+    assert client.get("/api/admin/review-queue/stats", headers=nurse).status_code == 401
+
+    assert client.patch("/api/admin/admins/1", json={"is_active": False}, headers=root).status_code == 400
+    assert client.get("/api/admin/admins", headers=root).json()["admins"][1]["is_active"] is False
+
+
+def test_stamp_clears_caches_in_other_processes(tmp_path):
+    stamp = revocation_stamp_path(str(tmp_path / "x.db"))
+    other_worker = AdminIdentityCache()
+    other_worker.sync(stamp)
+    other_worker.put(1, {"id": 1, "role": "superadmin"}, other_worker.version)
+    other_worker.sync(stamp)
+    assert other_worker.get(1) is not None
+
+    bump_revocation_stamp(stamp)
+    other_worker.sync(stamp)
+    assert other_worker.get(1) is None
+
+
+def test_update_admin_writes_only_sent_fields(admin_db):
+    root = _login("admin", "admin123")
+    created = client.post(
+        "/api/admin/admins",
+        json={"username": "clerk", "email": "clerk@example.com", "password": "clerk-pass", "full_name": "Clerk One"},
+        headers=root,
+    )
+    clerk_id = created.json()["id"]
+
+    promoted = client.patch(f"/api/admin/admins/{clerk_id}", json={"role": "superadmin"}, headers=root).json()
+    assert (promoted["full_name"], promoted["role"], promoted["is_active"]) == ("Clerk One", "superadmin", True)
+
+    cleared = client.patch(f"/api/admin/admins/{clerk_id}", json={"full_name": None, "role": None}, headers=root).json()
+    assert cleared["full_name"] is None and cleared["role"] == "superadmin"
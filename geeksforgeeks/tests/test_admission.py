@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import triage
+from admission import AdmissionController, AdmissionRejected, TokenBuckets, prescreen_emergency
+from auth_backend import get_current_user, AuthUser
+from triage import TriageRequest, app, evaluator
+
+client = TestClient(app)
+
+
+def test_token_bucket_limits_per_key():
+    buckets = TokenBuckets(rate=1.0, burst=2)
+    assert buckets.take("a") == 0
+    assert buckets.take("a") == 0
+    assert 0 < buckets.take("a") <= 1
+    assert buckets.take("b") == 0
+
+
+def test_prescreen_flags_emergency_symptoms():
+    assert prescreen_emergency(evaluator, TriageRequest(symptoms=["Chest pain"], severity="severe"))
+    assert not prescreen_emergency(evaluator, TriageRequest(symptoms=["mild cough"]))
+
+
+@pytest.mark.parametrize("symptoms,severity", [
+    (["a"], None),
+    (["e"], None),
+    (["pain"], None),
+    (["headache"], "mild"),
+    (["chest pain"], "mild"),
+])
+def test_prescreen_needs_a_full_emergency_match(symptoms, severity):
+    assert not prescreen_emergency(evaluator, TriageRequest(symptoms=symptoms, severity=severity))
+
+def test_queue_degrades_then_sheds():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05, degrade_ratio=1)
+        first = await controller.admit("u1", emergency=False)
+        assert first.use_llm
+
+        # Emergencies never wait, even when every slot is taken
+        emergency = await controller.admit("u2", emergency=True)
+        assert not emergency.holds_slot and not emergency.use_llm
+
+        queued = asyncio.ensure_future(controller.admit("u3", emergency=False))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+        with pytest.raises(AdmissionRejected) as full:
+            await controller.admit("u4", emergency=False)
+        assert full.value.reason == "overloaded" and full.value.retry_after >= 1
+
+        controller.release(first)
+        second = await queued
+        assert second.holds_slot and not second.use_llm
+
+        # A waiter that times out leaves the queue
+        with pytest.raises(AdmissionRejected):
+            await controller.admit("u5", emergency=False)
+        assert controller.queue_depth == 0
+        controller.release(second)
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_endpoint_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(triage, "admission_controller", AdmissionController(user_rate=0.01, user_burst=1))
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(
+        id="admission-tester", provider="google", email="a@example.com", name="A"
+    )
+    try:
+        payload = {"symptoms": ["mild cough"], "severity": "mild"}
+        assert client.post("/api/triage", json=payload).status_code == 200
+        limited = client.post("/api/triage", json=payload)
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) >= 1
+        # Emergencies are still answered
+        emergency = client.post("/api/triage", json={"symptoms": ["chest pain"], "severity": "severe"})
+        assert emergency.status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,94 @@
+import json
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bulk_engine import BulkTriageEngine
+from triage import TriageRequest, evaluator, init_db
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return BulkTriageEngine(evaluator)
+
+
+def _expected(request):
+    label, matched = evaluator.classify(request)
+    return {
+        "triage_label": label,
+        "matched_rules": matched,
+        "confidence_score": matched[0]["confidence"] if matched else 0.3,
+    }
+
+
+def _random_requests(count, seed=7):
+    phrases = sorted({
+        phrase
+        for rule in evaluator.rules
+        for condition in rule["conditions"]
+        for phrase in condition.get("symptoms", []) + condition.get("additional_factors", [])
+    }) + ["nausea", "rash", "pain", "Chest Pain "]
+    rng = random.Random(seed)
+    return [
+        TriageRequest(
+            symptoms=rng.sample(phrases, rng.randint(1, 3)),
+            severity=rng.choice([None, "mild", "moderate", "severe", "high", "Critical", "odd"]),
+            duration=rng.choice([None, "2 days", "3 weeks", "sudden onset", "persistent", "few hours"]),
+            additional_factors=rng.sample(phrases, rng.randint(0, 2)),
+            temperature=rng.choice([None, "104°F", "99.8°F", "101.5°F", "39.5°C", "normal"]),
+            patient_age=rng.choice([None, 1, 30, 70]),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_demo_payloads_match_evaluator(engine):
+    with open("demo_payloads.json", "r") as f:
+        demos = json.load(f)["demo_payloads"]
+    requests = [TriageRequest(**demo["payload"]) for demo in demos.values()]
+    assert engine.classify_batch(requests) == [_expected(request) for request in requests]
+
+
+def test_random_requests_match_evaluator(engine):
+    requests = _random_requests(3000)
+    results = engine.classify_batch(requests, batch_size=1000)
+    assert results == [_expected(request) for request in requests]
+
+
+def test_misspelt_requests_match_live_triage(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr("triage.DB_FILE", str(tmp_path / "bulk.db"))
+    init_db()
+    requests = [
+        TriageRequest(symptoms=["chset pain"], severity="severe"),
+        TriageRequest(symptoms=["shortnes of breath"], severity="severe"),
+        TriageRequest(symptoms=["cough"], severity="mild", additional_factors=["dizzyness"]),
+        TriageRequest(symptoms=["wheezing"], severity="severe"),
+    ]
+    results = engine.classify_batch(requests)
+    live = [evaluator.evaluate_triage(request, use_llm=False) for request in requests]
+    assert [r["triage_label"] for r in results] == [r.triage_label for r in live]
+    assert [[m["id"] for m in r["matched_rules"]] for r in results] == [
+        [m["id"] for m in r.matched_rules] for r in live
+    ]
+    assert results[0]["triage_label"] == results[1]["triage_label"] == "EMERGENCY_911"
+    assert [evaluator.classify(request)[0] for request in requests] == [r.triage_label for r in live]
+
+
+def test_accepts_plain_payload_dicts(engine):
+    requests = _random_requests(200, seed=11)
+    from_models = engine.classify_batch(requests)
+    from_dicts = engine.classify_batch([request.model_dump() for request in requests])
+    assert from_models == from_dicts
+
+
+def test_label_counts(engine):
+    requests = _random_requests(500, seed=3)
+    counts = engine.label_counts(requests, batch_size=128)
+    assert sum(counts.values()) == 500
+    expected = {}
+    for request in requests:
+        label = _expected(request)["triage_label"]
+        expected[label] = expected.get(label, 0) + 1
+    assert {label: n for label, n in counts.items() if n} == expected
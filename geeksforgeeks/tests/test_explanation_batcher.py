@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from explanation_batcher import ExplanationBatcher, MissingExplanation, parse_batch_response
+from openai_stub import OpenAIStubServer
+from triage import TriageRequest, evaluator
+
+RULE = next(rule for rule in evaluator.sorted_rules if rule["id"] == "RED_001")
+
+
+def test_parse_batch_response_tolerates_wrapping_and_bad_items():
+    content = 'Here you go:\n```json\n["first", {"explanation": "second"}, 3, "  "]\n```'
+    assert parse_batch_response(content, 5) == ["first", "second", None, None, None]
+    assert parse_batch_response("not json", 2) == [None, None]
+    assert parse_batch_response(None, 1) == [None]
+
+
+def test_jobs_in_one_window_share_a_call_and_fail_per_item():
+    batches = []
+    batcher = ExplanationBatcher(
+        explain_one=lambda case: f"single {case}",
+        explain_many=lambda jobs: batches.append(jobs) or [f"batched {case}" if case != 2 else None for (case,) in jobs],
+        window_seconds=0.2,
+        max_size=8,
+    )
+    futures = [batcher.submit(case) for case in range(4)]
+    assert [future.exception(2) is None for future in futures] == [True, True, False, True]
+    assert isinstance(futures[2].exception(), MissingExplanation)
+    assert futures[0].result() == "batched 0"
+    assert batches == [[(0,), (1,), (2,), (3,)]]
+
+    # A job alone in its window keeps the single-case call
+    assert batcher.explain("solo", timeout=2) == "single solo"
+
+
+@pytest.fixture
+def openai_stub(monkeypatch):
+    server = OpenAIStubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setattr(evaluator.explanation_batcher, "window_seconds", 0.2)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_explanations_are_batched_against_stub(openai_stub):
+    requests = [TriageRequest(symptoms=["chest pain", f"symptom {i}"], severity="severe") for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        explanations = list(pool.map(lambda request: evaluator.generate_explanation(RULE, request), requests))
+
+    assert len(openai_stub.prompts) == 1
+    for i, explanation in enumerate(explanations):
+        assert explanation.startswith("Stub explanation (EMERGENCY_911)")
+        assert f"symptom {i}" in explanation
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from explanation_warmup import duration_bucket, enumerate_combinations, init_explanation_store, warm_explanations
+from triage import TriageEvaluator, TriageRequest
+
+
+def _evaluator(monkeypatch, calls):
+    evaluator = TriageEvaluator(result_cache_size=0)
+    evaluator.explanation_batcher.window_seconds = 0
+
+    def fake_llm(rule, request):
+        calls.append((rule["id"], request.severity, request.duration))
+        return f"Generic {rule['id']} advice."
+
+    monkeypatch.setattr(evaluator, "generate_openai_explanation", fake_llm)
+    return evaluator
+
+
+def test_duration_buckets():
+    assert [duration_bucket(text) for text in (None, "sudden", "2 hours", "4 days", "3 weeks", "1 year")] == [
+        "unspecified", "unspecified", "hours", "days", "weeks", "months",
+    ]
+
+
+def test_warmup_serves_explanations_without_llm(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "warm.db")
+    conn = sqlite3.connect(db_file)
+    init_explanation_store(conn)
+    conn.close()
+
+    calls = []
+    evaluator = _evaluator(monkeypatch, calls)
+    combinations = enumerate_combinations(evaluator.sorted_rules)
+    assert warm_explanations(evaluator, db_file, TriageRequest, concurrency=4) == len(combinations)
+    assert len(calls) == len(combinations)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    rule = next(rule for rule in evaluator.sorted_rules if rule["id"] == "RED_001")
+    request = TriageRequest(symptoms=["chest pain"], severity="Severe", duration="2 days")
+    assert evaluator.generate_explanation(rule, request) == (
+        "Generic RED_001 advice. Your reported symptoms include: chest pain."
+    )
+    assert len(calls) == len(combinations)
+
+    # Another worker (or a restart) reuses the stored rows for the same rules version
+    restarted = _evaluator(monkeypatch, calls)
+    assert warm_explanations(restarted, db_file, TriageRequest) == 0
+    assert len(restarted.pregenerated) == len(combinations)
+
+    # A reload drops explanations generated for the previous rules
+    restarted.reload_rules()
+    assert len(restarted.pregenerated) == 0
+
+
+def test_warmup_starts_with_the_app_only_when_an_llm_is_configured(tmp_path, monkeypatch):
+    import triage
+
+    monkeypatch.setattr("triage.DB_FILE", str(tmp_path / "warm.db"))
+    triage.init_db()
+    started = []
+    monkeypatch.setattr(triage, "EXPLANATION_WARMUP", True)
+    monkeypatch.setattr(triage, "start_warmup", lambda *args: started.append(args))
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with TestClient(triage.app):
+        triage.evaluator.reload_rules()
+    assert started == []
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    with TestClient(triage.app):
+        assert len(started) == 1
+        triage.evaluator.reload_rules()
+        assert len(started) == 2
+    triage.evaluator.reload_rules()
+    assert len(started) == 2
+
+
+def test_importing_the_app_does_not_start_warmup(tmp_path):
+    script = (
+        "import threading, triage; "
+        "assert 'explanation-warmup' not in [t.name for t in threading.enumerate()]"
+    )
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+           "EXPLANATION_WARMUP": "true", "OPENAI_API_KEY": "test-key",
+           "OPENAI_BASE_URL": "http://127.0.0.1:9", "TRIAGE_DB_FILE": str(tmp_path / "warm.db")}
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, check=True, capture_output=True)
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from auth_backend import AuthUser, get_current_user
+from fuzzy_index import SymSpellIndex, edit_distance
+from triage import TriageRequest, app, evaluator, init_db
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("chset", "chest", 2) == 1
+    assert edit_distance("breth", "breath", 2) == 1
+    assert edit_distance("headache", "headache", 2) == 0
+    assert edit_distance("rash", "shortness", 2) == 3
+
+
+def test_lookup_prefers_closest_then_most_frequent():
+    index = SymSpellIndex({"pain": 5, "paint": 1, "rain": 1})
+    assert index.lookup("pian") == "pain"
+    assert index.lookup("pains") == "pain"
+    assert index.lookup("xyzzy") is None
+    # A different first letter is a different word, not a typo
+    assert SymSpellIndex({"sneezing": 1}).lookup("wheezing") is None
+
+
+def test_misspelt_symptoms_are_corrected():
+    request = TriageRequest(
+        symptoms=["chset pain", "shortnes of breath", "mild cough"],
+        additional_factors=["dizzyness"],
+    )
+    corrected, corrections = evaluator.correct_request(request)
+    assert corrected.symptoms == ["chest pain", "shortness of breath", "mild cough"]
+    assert corrected.additional_factors == ["dizziness"]
+    assert [c["original"] for c in corrections] == ["chset pain", "shortnes of breath", "dizzyness"]
+    assert request.symptoms[0] == "chset pain"
+
+
+def test_unknown_words_are_left_alone():
+    request = TriageRequest(symptoms=["knee pain", "flu"], additional_factors=["smoker"])
+    corrected, corrections = evaluator.correct_request(request)
+    assert corrected is request
+    assert corrections == []
+
+
+@pytest.mark.parametrize("symptom", ["wheezing", "earache"])
+def test_real_words_are_not_turned_into_other_symptoms(symptom):
+    request = TriageRequest(symptoms=[symptom], severity="severe")
+    corrected, corrections = evaluator.correct_request(request)
+    assert corrected is request
+    assert corrections == []
+    assert evaluator.classify(corrected)[0] != "EMERGENCY_911"
+
+
+def test_corrections_stay_within_the_phrase_budget():
+    corrector = evaluator.corrector
+    assert corrector.correct_text("shortnes of braeth") == "shortness of breath"
+    # The word is within two edits of "headache", but one per five characters is the phrase limit
+    assert corrector.correct_word("hedace") == "headache"
+    assert corrector.correct_text("hedace") == "hedace"
+
+
+def test_correction_is_sub_millisecond():
+    request = TriageRequest(symptoms=["difficulty breathng", "severe hedache"])
+    evaluator.correct_request(request)
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        evaluator.correct_request(request)
+    assert (time.perf_counter() - started) / runs < 0.001
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr("triage.DB_FILE", str(tmp_path / "fuzzy.db"))
+    init_db()
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(
+        id="dev_tester@example.com", provider="dev", email="tester@example.com", name="Tester", avatar_url=None
+    )
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_triage_response_reports_corrections(client):
+    typo = client.post("/api/triage", json={"symptoms": ["chset pain"], "severity": "severe"}).json()
+    exact = client.post("/api/triage", json={"symptoms": ["chest pain"], "severity": "severe"}).json()
+
+    assert typo["corrections"] == [{"field": "symptoms", "original": "chset pain", "corrected": "chest pain"}]
+    assert exact["corrections"] == []
+    assert typo["triage_label"] == exact["triage_label"]
+    assert [r["id"] for r in typo["matched_rules"]] == [r["id"] for r in exact["matched_rules"]]
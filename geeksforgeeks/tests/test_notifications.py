@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import admin_backend
+from notifications import notification_counts, wait_for_notifications
+from triage import TriageRequest, app, evaluator, init_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def admin_db(tmp_path, monkeypatch):
+    """A throwaway database with the default admin plus an off-duty one"""
+    db_file = str(tmp_path / "admin.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    monkeypatch.setattr(admin_backend, "DB_FILE", db_file)
+    init_db()
+    admin_backend.init_admin_db()
+    conn = sqlite3.connect(db_file)
+    conn.execute("""
+        INSERT INTO admin_users (username, email, password_hash, on_duty)
+        VALUES ('offduty', 'off@example.com', 'x', 0)
+    """)
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+@pytest.fixture
+def headers(admin_db):
+    token = client.post(
+        "/api/admin/auth/login",
+        json={"username": "admin", "password": "admin123"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _log(session_id, label):
+    evaluator.log_session(session_id, TriageRequest(symptoms=["chest pain"]), label, [], "")
+
+
+def test_emergencies_fan_out_to_on_duty_admins(admin_db):
+    _log("e-1", "EMERGENCY_911")
+    _log("u-1", "URGENT_CARE")
+    conn = sqlite3.connect(admin_db)
+    rows = conn.execute("SELECT admin_id, type, message FROM notifications").fetchall()
+    assert len(rows) == 1
+    assert rows[0][1] == "emergency" and "e-1" in rows[0][2]
+    assert notification_counts(conn, rows[0][0])["unread_count"] == 1
+    conn.close()
+
+
+def test_unread_counter_follows_reads(admin_db, headers):
+    _log("e-1", "EMERGENCY_911")
+    _log("e-2", "EMERGENCY_911")
+    body = client.get("/api/admin/notifications", headers=headers).json()
+    assert body["unread_count"] == 2
+    client.post(f"/api/admin/notifications/{body['notifications'][0]['id']}/read", headers=headers)
+    assert client.get("/api/admin/notifications", headers=headers).json()["unread_count"] == 1
+
+
+def test_long_poll_returns_new_notifications(admin_db, headers):
+    latest = client.get("/api/admin/notifications/poll?timeout=0", headers=headers).json()
+    assert latest["notifications"] == []
+
+    _log("e-1", "EMERGENCY_911")
+    body = client.get(f"/api/admin/notifications/poll?after_id={latest['latest_id']}", headers=headers).json()
+    assert [n["type"] for n in body["notifications"]] == ["emergency"]
+    assert body["latest_id"] > latest["latest_id"]
+
+
+def test_long_poll_wakes_on_write(admin_db):
+    async def scenario():
+        waiter = asyncio.ensure_future(wait_for_notifications(
+            lambda: sqlite3.connect(admin_db), 1, 0, timeout=5, interval=0.01,
+        ))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        _log("e-1", "EMERGENCY_911")
+        return await asyncio.wait_for(waiter, 2)
+
+    result = asyncio.run(scenario())
+    assert len(result["notifications"]) == 1
@@ -0,0 +1,70 @@
+import asyncio
+import urllib.parse
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import auth_backend
+from auth_backend import OAuthHTTPClient, provider_endpoints
+from oauth_stub import stub_router
+from triage import app
+
+client = TestClient(app)
+
+
+class CountingTransport(httpx.ASGITransport):
+    def __init__(self, app):
+        super().__init__(app=app)
+        self.paths = []
+
+    async def handle_async_request(self, request):
+        self.paths.append(request.url.path)
+        return await super().handle_async_request(request)
+
+
+@pytest.fixture
+def stub_provider(tmp_path, monkeypatch):
+    stub_app = FastAPI()
+    stub_app.include_router(stub_router)
+    transport = CountingTransport(stub_app)
+    monkeypatch.setattr(auth_backend, "DB_FILE", str(tmp_path / "auth.db"))
+    monkeypatch.setattr(auth_backend, "oauth_http", OAuthHTTPClient(transport=transport))
+    monkeypatch.setattr(auth_backend, "OAUTH_ENDPOINTS", provider_endpoints("http://stub/api/oauth-stub"))
+    for name in ("GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GITHUB_CLIENT_ID", "GITHUB_CLIENT_SECRET"):
+        monkeypatch.setattr(auth_backend, name, "stub")
+    auth_backend._init_user_table()
+    return transport
+
+
+@pytest.mark.parametrize("provider", ["google", "github"])
+def test_login_against_stub_provider(stub_provider, provider):
+    auth_url = client.get(f"/api/auth/{provider}/login").json()["auth_url"]
+    assert auth_url.startswith(f"http://stub/api/oauth-stub/{provider}/authorize?")
+    state = urllib.parse.parse_qs(urllib.parse.urlsplit(auth_url).query)["state"][0]
+
+    response = client.get(
+        f"/api/auth/{provider}/callback",
+        params={"code": "alice", "state": state},
+        follow_redirects=False,
+    )
+    assert response.status_code == 307
+    assert auth_backend.AUTH_COOKIE_NAME in response.cookies
+    token = response.cookies[auth_backend.AUTH_COOKIE_NAME]
+    session = client.get("/api/auth/session", headers={"Authorization": f"Bearer {token}"}).json()
+    # GitHub's private profile email is filled in from the concurrently fetched email list
+    assert session["user"]["email"] == "alice@stub.example.com"
+
+
+def test_exchanges_share_one_pooled_client(stub_provider):
+    async def two_logins():
+        await auth_backend._exchange_github_code("bob")
+        first = auth_backend.oauth_http.get()
+        await auth_backend._exchange_github_code("carol")
+        assert auth_backend.oauth_http.get() is first
+        await auth_backend.oauth_http.aclose()
+
+    asyncio.run(two_logins())
+    assert stub_provider.paths.count("/api/oauth-stub/github/token") == 2
+    assert stub_provider.paths.count("/api/oauth-stub/github/user/emails") == 2
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import admin_backend
+from auth_backend import AuthUser
+from patients import backfill_patients
+from triage import TriageRequest, app, evaluator, init_db
+
+client = TestClient(app)
+
+ALICE = AuthUser(id="user-alice", provider="google", email="alice@example.com", name="Alice")
+
+
+@pytest.fixture
+def patients_db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "patients.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    monkeypatch.setattr(admin_backend, "DB_FILE", db_file)
+    init_db()
+    admin_backend.init_admin_db()
+    return db_file
+
+
+def _patients(db_file):
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute(
+        "SELECT id, user_id, patient_name, age, total_consultations FROM patients ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_log_session_upserts_patient(patients_db):
+    evaluator.log_session("s-1", TriageRequest(symptoms=["cough"]), "SELF_CARE_MONITOR", [], "", ALICE)
+    evaluator.log_session("s-2", TriageRequest(symptoms=["cough"], patient_age=34), "SELF_CARE_MONITOR", [], "", ALICE)
+    # Re-logging the same session id is not another consultation
+    evaluator.log_session("s-2", TriageRequest(symptoms=["cough"]), "SELF_CARE_MONITOR", [], "", ALICE)
+    evaluator.log_session("anon", TriageRequest(symptoms=["cough"]), "SELF_CARE_MONITOR", [], "")
+
+    [(patient_id, user_id, name, age, total)] = _patients(patients_db)
+    assert (user_id, name, age, total) == ("user-alice", "Alice", 34, 2)
+
+    evaluator.log_session("s-3", TriageRequest(symptoms=["chest pain"]), "EMERGENCY_911", [], "", ALICE)
+    conn = sqlite3.connect(patients_db)
+    assert conn.execute("SELECT patient_id FROM triage_cases WHERE id = 's-3'").fetchone()[0] == patient_id
+    conn.close()
+
+
+def test_backfill_from_existing_sessions(patients_db):
+    conn = sqlite3.connect(patients_db)
+    conn.executemany(
+        "INSERT INTO triage_sessions (id, timestamp, user_id) VALUES (?, ?, ?)",
+        [("a", "2025-01-01 00:00:00", "u-1"), ("b", "2025-02-01 00:00:00", "u-1"), ("c", "2025-01-05 00:00:00", "u-2")],
+    )
+    conn.execute("INSERT INTO patients (patient_name) VALUES ('Placeholder')")
+    conn.commit()
+    conn.close()
+
+    assert backfill_patients(patients_db, drop_unlinked=True) == 2
+    backfill_patients(patients_db)
+    rows = {row[1]: row[4] for row in _patients(patients_db)}
+    assert rows == {"u-1": 2, "u-2": 1}
+
+
+def test_patients_endpoint_lists_linked_patients(patients_db):
+    evaluator.log_session("s-1", TriageRequest(symptoms=["cough"]), "SELF_CARE_MONITOR", [], "", ALICE)
+    token = client.post(
+        "/api/admin/auth/login",
+        json={"username": "admin", "password": "admin123"},
+    ).json()["access_token"]
+    body = client.get("/api/admin/patients", headers={"Authorization": f"Bearer {token}"}).json()
+    assert body["total"] == 1
+    assert body["patients"][0]["user_id"] == "user-alice"
@@ -0,0 +1,90 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+from retriage import main, run_backtest
+from triage import init_db, evaluator
+
+
+@pytest.fixture
+def sessions_db(tmp_path, monkeypatch):
+    """A throwaway database holding a few historical sessions"""
+    db_file = str(tmp_path / "sessions.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    init_db()
+    payloads = [
+        {"symptoms": ["runny nose", "sneezing"], "severity": "mild", "duration": "2 days"},
+        {"symptoms": ["chest pain"], "severity": "severe"},
+        {"symptoms": ["sore throat"], "severity": "mild", "duration": "2 days"},
+    ]
+    conn = sqlite3.connect(db_file)
+    for i, payload in enumerate(payloads):
+        conn.execute(
+            "INSERT INTO triage_sessions (id, symptoms, session_data) VALUES (?, ?, ?)",
+            (f"session-{i}", ", ".join(payload["symptoms"]), json.dumps({"request": payload})),
+        )
+    # Legacy row without a stored request payload
+    conn.execute(
+        "INSERT INTO triage_sessions (id, symptoms, severity) VALUES (?, ?, ?)",
+        ("legacy", "stroke", "severe"),
+    )
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+@pytest.fixture
+def rules_files(tmp_path):
+    old_file = tmp_path / "old.yaml"
+    new_file = tmp_path / "new.yaml"
+    old_file.write_text(yaml.safe_dump(evaluator.rules_data))
+    changed = json.loads(json.dumps(evaluator.rules_data))
+    for rule in changed["rules"]:
+        if rule["id"] == "SC_001":
+            rule["triage_label"] = "SEE_DOCTOR_24H"
+    new_file.write_text(yaml.safe_dump(changed))
+    return str(old_file), str(new_file)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_backtest_reports_transitions_and_rule_deltas(sessions_db, rules_files, workers):
+    old_rules, new_rules = rules_files
+    report = run_backtest(sessions_db, old_rules, new_rules, workers=workers, chunk_size=2)
+
+    assert report.sessions == 4
+    assert report.errors == 0
+    assert report.transitions[("SELF_CARE_MONITOR", "SEE_DOCTOR_24H")] == 2
+    assert report.transitions[("EMERGENCY_911", "EMERGENCY_911")] == 2
+    assert report.changed == 2
+    deltas = {row["rule_id"]: row for row in report.rule_deltas()}
+    assert deltas["SC_001"]["delta"] == 0
+    assert deltas["RED_002"]["old_hits"] == 1
+
+
+def test_cli_prints_json_report(sessions_db, rules_files, capsys):
+    old_rules, new_rules = rules_files
+    assert main(["--db", sessions_db, "--old", old_rules, "--new", new_rules, "--workers", "0", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["transition_matrix"]["SELF_CARE_MONITOR"]["SEE_DOCTOR_24H"] == 2
+
+
+def test_backtest_skips_app_startup(sessions_db, rules_files, tmp_path):
+    """Backtests import only the engine: no app databases, warm-up or LLM client in the workers"""
+    old_rules, new_rules = rules_files
+    workdir = tmp_path / "cwd"
+    workdir.mkdir()
+    script = (
+        "import sys, retriage; "
+        f"retriage.main(['--db', {sessions_db!r}, '--old', {old_rules!r}, '--new', {new_rules!r}, '--workers', '1']); "
+        "assert not {'triage', 'auth_backend', 'admin_backend'} & set(sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+           "EXPLANATION_WARMUP": "true"}
+    env.pop("TRIAGE_DB_FILE", None)
+    subprocess.run([sys.executable, "-c", script], cwd=workdir, env=env, check=True, capture_output=True)
+    assert list(workdir.iterdir()) == []
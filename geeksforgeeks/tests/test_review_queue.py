@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import admin_backend
+from review_queue import claim_next_case, pending_count, release_case, resolve_case
+from triage import TriageRequest, app, evaluator, init_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    """Sessions of mixed urgency logged into a throwaway database"""
+    db_file = str(tmp_path / "queue.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    monkeypatch.setattr(admin_backend, "DB_FILE", db_file)
+    init_db()
+    admin_backend.init_admin_db()
+    for session_id, label in [
+        ("urgent-old", "URGENT_CARE"),
+        ("self-care", "SELF_CARE_MONITOR"),
+        ("emergency", "EMERGENCY_911"),
+        ("urgent-new", "URGENT_CARE"),
+    ]:
+        evaluator.log_session(session_id, TriageRequest(symptoms=["chest pain"]), label, [], "")
+    conn = sqlite3.connect(db_file)
+    conn.execute("UPDATE triage_cases SET created_at = '2025-01-01 00:00:00' WHERE id = 'urgent-old'")
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _connect(db_file):
+    return sqlite3.connect(db_file, check_same_thread=False)
+
+
+def test_only_urgent_sessions_are_queued_in_priority_order(queue_db):
+    conn = _connect(queue_db)
+    assert pending_count(conn) == 3
+    claimed = [claim_next_case(conn, reviewer_id=1)["id"] for _ in range(3)]
+    assert claimed == ["emergency", "urgent-old", "urgent-new"]
+    assert claim_next_case(conn, reviewer_id=1) is None
+    conn.close()
+
+
+def test_concurrent_reviewers_never_share_a_case(queue_db):
+    claims = []
+
+    def reviewer(reviewer_id):
+        conn = sqlite3.connect(queue_db, timeout=10)
+        while True:
+            case = claim_next_case(conn, reviewer_id)
+            if case is None:
+                break
+            claims.append(case["id"])
+        conn.close()
+
+    threads = [threading.Thread(target=reviewer, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claims) == ["emergency", "urgent-new", "urgent-old"]
+
+
+def test_expired_lease_returns_case_and_counter_tracks_resolution(queue_db):
+    conn = _connect(queue_db)
+    first = claim_next_case(conn, reviewer_id=1, lease_seconds=-1)
+    assert claim_next_case(conn, reviewer_id=2)["id"] == first["id"]
+    assert resolve_case(conn, first["id"], reviewer_id=1) is None
+
+    resolved = resolve_case(conn, first["id"], reviewer_id=2, notes="Called patient")
+    assert resolved["status"] == "resolved" and resolved["notes"] == "Called patient"
+    assert pending_count(conn) == 2
+
+    case = claim_next_case(conn, reviewer_id=3)
+    assert release_case(conn, case["id"], reviewer_id=3)
+    assert claim_next_case(conn, reviewer_id=4)["id"] == case["id"]
+    conn.close()
+
+
+def test_review_queue_endpoints(queue_db):
+    token = client.post(
+        "/api/admin/auth/login",
+        json={"username": "admin", "password": "admin123"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/admin/review-queue/stats", headers=headers).json() == {"pending": 3}
+    case = client.post("/api/admin/review-queue/claim", headers=headers).json()["case"]
+    assert case["id"] == "emergency"
+
+    response = client.post(f"/api/admin/review-queue/{case['id']}/resolve", json={"notes": "ok"}, headers=headers)
+    assert response.status_code == 200
+    again = client.post(f"/api/admin/review-queue/{case['id']}/resolve", json={}, headers=headers)
+    assert again.status_code == 409
+    assert client.get("/api/admin/dashboard/stats", headers=headers).json()["pending_reviews"] == 2
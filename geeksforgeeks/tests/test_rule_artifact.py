@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from rule_artifact import ArtifactError, RuleArtifact, compile_rules, load_artifact
+from rule_index import CompiledRules, RequestFacts
+from triage import TriageEvaluator, TriageRequest
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules.yaml")
+
+REQUESTS = [
+    TriageRequest(symptoms=["chest pain"], severity="severe"),
+    TriageRequest(symptoms=["fever", "cough"], temperature="101.5F", duration="3 days"),
+    TriageRequest(symptoms=["headache"], patient_age=70, duration="2 weeks"),
+    TriageRequest(symptoms=["rash"]),
+]
+
+
+def test_artifact_tables_match_compiled_rules(tmp_path):
+    artifact = load_artifact(RULES_FILE, str(tmp_path))
+    rules_data = artifact.rules_data()
+    rules = rules_data["rules"]
+    sorted_rules = sorted(rules, key=lambda r: r.get("priority", 999))
+    assert [rules[i] for i in artifact.priority_order] == sorted_rules
+
+    plain = CompiledRules(sorted_rules)
+    mapped = CompiledRules([rules[i] for i in artifact.priority_order], artifact)
+    assert list(mapped.condition_rule) == plain.condition_rule
+    assert dict(mapped.symptom_postings.items()) == plain.symptom_postings
+    assert mapped.symptom_postings["chest pain"] == plain.symptom_postings["chest pain"]
+    for request in REQUESTS:
+        facts = RequestFacts.from_request(request)
+        assert mapped.candidates(facts) == plain.candidates(facts)
+
+
+def test_compile_is_cached_by_content_hash(tmp_path):
+    path = compile_rules(RULES_FILE, str(tmp_path))
+    mtime = os.stat(path).st_mtime_ns
+    assert compile_rules(RULES_FILE, str(tmp_path)) == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+    # A damaged artifact is rejected on load and rebuilt by the next compile
+    with open(path, "r+b") as f:
+        f.write(b"garbage!")
+    with pytest.raises(ArtifactError):
+        RuleArtifact(path)
+    assert compile_rules(RULES_FILE, str(tmp_path)) == path
+    RuleArtifact(path)
+
+
+def test_evaluator_results_match_yaml_loading(tmp_path, monkeypatch):
+    monkeypatch.setattr("triage_engine.RULES_ARTIFACT_DIR", str(tmp_path))
+    mapped = TriageEvaluator(result_cache_size=0)
+    monkeypatch.setattr("triage_engine.RULES_ARTIFACT_DIR", "")
+    parsed = TriageEvaluator(result_cache_size=0)
+    assert mapped.rules_version == parsed.rules_version
+    for request in REQUESTS:
+        assert mapped.classify(request) == parsed.classify(request)
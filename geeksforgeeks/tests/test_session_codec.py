@@ -0,0 +1,92 @@
+import json
+import sqlite3
+
+import pytest
+
+from session_codec import (
+    FORMAT_VERSION,
+    decode_matched_rules,
+    decode_request,
+    encode_columns,
+    encode_payload,
+    migrate_sessions,
+)
+from triage import TriageRequest, evaluator, init_db
+
+
+def _roundtrip(request, session_id="s-1"):
+    columns = encode_columns(request)
+    blob = encode_payload(request, session_id)
+    return decode_request(session_id, columns["symptoms"], columns["severity"], columns["duration"],
+                          columns["additional_factors"], blob)
+
+
+def test_columns_only_request_has_no_payload():
+    request = {"symptoms": ["cough", "fever"], "severity": "mild", "duration": "2 days",
+               "additional_factors": [], "temperature": None, "patient_age": None, "session_id": "s-1"}
+    assert encode_payload(request, "s-1") is None
+    assert TriageRequest(**_roundtrip(request)) == TriageRequest(**request)
+
+
+def test_payload_keeps_remaining_fields_and_unsplittable_lists():
+    request = {"symptoms": ["pain, sharp", "nausea"], "severity": None, "duration": None,
+               "additional_factors": ["diabetes"], "temperature": "101F", "patient_age": 70,
+               "session_id": "s-1"}
+    blob = encode_payload(request, "s-1")
+    assert blob[0] == FORMAT_VERSION
+    assert _roundtrip(request) == request
+
+
+def test_legacy_rows_decode():
+    legacy = json.dumps({"request": {"symptoms": ["cough"], "patient_age": 30}, "recorded_at": "x"})
+    assert decode_request("s-1", "cough", "", "", "", legacy)["patient_age"] == 30
+    assert decode_matched_rules("[{'id': 'SC_001', 'triage_label': 'SELF_CARE'}]") == ["SC_001"]
+    assert decode_matched_rules("SC_001,GP_002") == ["SC_001", "GP_002"]
+
+
+@pytest.fixture
+def sessions_db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "sessions.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    init_db()
+    return db_file
+
+
+def test_log_session_writes_compact_rows(sessions_db):
+    request = TriageRequest(symptoms=["chest pain"], severity="severe", patient_age=60)
+    evaluator.log_session("s-new", request, "EMERGENCY", [{"id": "EM_001"}], "Call 911")
+    conn = sqlite3.connect(sessions_db)
+    matched, blob = conn.execute(
+        "SELECT matched_rules, session_data FROM triage_sessions WHERE id = 's-new'"
+    ).fetchone()
+    conn.close()
+    assert matched == "EM_001"
+    assert isinstance(blob, bytes) and json.loads(blob[2:]) == {"patient_age": 60}
+
+
+def test_migration_converts_legacy_rows(sessions_db):
+    legacy_request = {"symptoms": ["cough"], "severity": "mild", "duration": None,
+                      "additional_factors": [], "temperature": "99F", "patient_age": None,
+                      "session_id": None}
+    conn = sqlite3.connect(sessions_db)
+    conn.execute(
+        "INSERT INTO triage_sessions (id, symptoms, severity, matched_rules, session_data) VALUES (?, ?, ?, ?, ?)",
+        ("old", "cough", "mild", str([{"id": "SC_001", "triage_label": "SELF_CARE"}]),
+         json.dumps({"request": legacy_request, "recorded_at": "2025-01-01T00:00:00", "user_id": None})),
+    )
+    conn.commit()
+    conn.close()
+
+    assert migrate_sessions(sessions_db, batch_size=1) == 1
+    assert migrate_sessions(sessions_db) == 0
+
+    conn = sqlite3.connect(sessions_db)
+    row = conn.execute(
+        "SELECT symptoms, severity, duration, additional_factors, matched_rules, session_data "
+        "FROM triage_sessions WHERE id = 'old'"
+    ).fetchone()
+    conn.close()
+    assert row[4] == "SC_001"
+    request = decode_request("old", row[0], row[1], row[2], row[3], row[5])
+    assert request["temperature"] == "99F"
+    assert request["symptoms"] == ["cough"]
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import session_search
+from session_search import build_match_query, search_sessions
+from triage import TriageRequest, app, evaluator, init_db
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def search_db(tmp_path, monkeypatch):
+    """A throwaway database with sessions written through the normal write path"""
+    db_file = str(tmp_path / "sessions.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    monkeypatch.setattr(session_search, "DB_FILE", db_file)
+    init_db()
+    sessions = [
+        ("s-1", ["chest pain", "sweating"], "EMERGENCY", "Chest pain with sweating can signal a heart attack."),
+        ("s-2", ["chest pain"], "URGENT_CARE", "Chest pain should be checked today."),
+        ("s-3", ["headache"], "SELF_CARE", "Rest and hydrate."),
+        ("s-4", ["sweating", "chest tightness", "chest pain"], "EMERGENCY", "Call emergency services."),
+    ]
+    for session_id, symptoms, label, explanation in sessions:
+        evaluator.log_session(session_id, TriageRequest(symptoms=symptoms), label, [], explanation)
+    return db_file
+
+
+def _search(db_file, *args, **kwargs):
+    conn = sqlite3.connect(db_file)
+    try:
+        return search_sessions(conn, *args, **kwargs)
+    finally:
+        conn.close()
+
+
+def test_match_query_requires_every_phrase():
+    assert build_match_query("chest pain and sweating") == '"chest pain" AND "sweating"'
+    with pytest.raises(ValueError):
+        build_match_query(" , ")
+
+
+def test_search_ranks_and_snippets(search_db):
+    page = _search(search_db, "chest pain and sweating")
+    assert {result["id"] for result in page["results"]} == {"s-1", "s-4"}
+    assert "<mark>" in page["results"][0]["snippet"]
+    assert _search(search_db, "headache", label="EMERGENCY")["results"] == []
+
+
+@pytest.mark.parametrize("order", ["rank", "recent"])
+def test_keyset_pagination_covers_all_matches(search_db, order):
+    seen, after = [], None
+    while True:
+        page = _search(search_db, "chest pain", order=order, limit=1, after=after)
+        seen += [result["id"] for result in page["results"]]
+        after = page["next_cursor"]
+        if not after:
+            break
+    assert sorted(seen) == ["s-1", "s-2", "s-4"]
+
+
+def test_index_follows_replace_and_delete(search_db):
+    evaluator.log_session("s-3", TriageRequest(symptoms=["migraine"]), "SELF_CARE", [], "Rest.")
+    assert _search(search_db, "headache")["results"] == []
+    assert [r["id"] for r in _search(search_db, "migraine")["results"]] == ["s-3"]
+
+    conn = sqlite3.connect(search_db)
+    conn.execute("DELETE FROM triage_sessions WHERE id = 's-3'")
+    conn.commit()
+    conn.execute("INSERT INTO triage_sessions_fts (triage_sessions_fts) VALUES ('integrity-check')")
+    conn.close()
+    assert _search(search_db, "migraine")["results"] == []
+
+
+def test_search_endpoint(search_db):
+    token = client.post(
+        "/api/admin/auth/login",
+        json={"username": "admin", "password": "admin123"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/admin/search/sessions", params={"q": "sweating"}, headers=headers)
+    assert response.status_code == 200
+    assert {r["id"] for r in response.json()["results"]} == {"s-1", "s-4"}
+
+    bad = client.get("/api/admin/search/sessions", params={"q": "!!"}, headers=headers)
+    assert bad.status_code == 400
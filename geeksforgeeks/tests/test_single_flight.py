@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+from triage import TriageRequest, evaluator
+
+RULE = next(rule for rule in evaluator.sorted_rules if rule["id"] == "RED_001")
+
+
+def _run_concurrently(fn, count=8):
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return [future.result() for future in [pool.submit(fn) for _ in range(count)]]
+
+
+def test_duplicates_share_one_call_and_its_failure():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flights.do, "key", slow) for _ in range(4)]
+        while flights.in_flight == 0 or len(calls) == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        assert [future.result() for future in futures] == ["done"] * 4
+    assert len(calls) == 1 and flights.in_flight == 0
+
+    def failing():
+        time.sleep(0.05)
+        raise RuntimeError("upstream timeout")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flights.do, "key", failing) for _ in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="upstream timeout"):
+                future.result()
+
+
+def test_concurrent_identical_explanations_make_one_llm_call(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    calls = []
+
+    def fake_llm(rule, request):
+        calls.append(rule["id"])
+        time.sleep(0.1)
+        return "LLM explanation"
+
+    monkeypatch.setattr(evaluator, "generate_openai_explanation", fake_llm)
+    results = _run_concurrently(lambda: evaluator.generate_explanation(
+        RULE, TriageRequest(symptoms=["Chest pain", "sweating"], severity="severe")
+    ))
+    assert results == ["LLM explanation"] * 8
+    assert calls == ["RED_001"]
+
+
+def test_llm_failure_falls_back_to_template_for_every_waiter(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    calls = []
+
+    def broken_llm(rule, request):
+        calls.append(1)
+        time.sleep(0.1)
+        raise TimeoutError("LLM timed out")
+
+    monkeypatch.setattr(evaluator, "generate_openai_explanation", broken_llm)
+    request = TriageRequest(symptoms=["chest pain"], severity="severe")
+    results = _run_concurrently(lambda: evaluator.generate_explanation(RULE, request))
+    assert set(results) == {evaluator.generate_template_explanation(RULE, request)}
+    assert len(calls) == 1
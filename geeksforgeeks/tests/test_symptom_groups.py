@@ -0,0 +1,107 @@
+import itertools
+
+import pytest
+import yaml
+
+from symptom_groups import ConditionError, CompiledGroups
+from triage import TriageEvaluator, TriageRequest
+
+RULES = {
+    "triage_labels": {},
+    "rules": [
+        {
+            "id": "MEN_001", "priority": 1, "category": "RED", "triage_label": "EMERGENCY_911",
+            "name": "Possible Meningitis",
+            "conditions": [{
+                "all_of": ["fever", ["stiff neck", "neck stiffness"]],
+                "none_of": ["rash"],
+                "severity": ["any"],
+            }],
+        },
+        {
+            "id": "FLU_001", "priority": 2, "category": "GP", "triage_label": "GP_CARE",
+            "name": "Flu-like Illness",
+            "conditions": [{
+                "symptoms": ["fever"],
+                "at_least": {"count": 2, "of": ["cough", "body aches", "fatigue"]},
+            }],
+        },
+        {
+            "id": "COLD_001", "priority": 3, "category": "SELF", "triage_label": "SELF_CARE",
+            "name": "Common Cold",
+            "conditions": [{"at_least": {"count": 2, "of": ["runny nose", "sneezing", "sore throat"]}}],
+        },
+    ],
+}
+
+SYMPTOMS = ["fever", "stiff neck", "neck stiffness", "rash", "cough", "body aches", "fatigue",
+            "runny nose", "sneezing", "sore throat", "headache"]
+
+
+def _evaluator(tmp_path, monkeypatch, rules=RULES, artifact=False):
+    rules_file = tmp_path / "rules.yaml"
+    rules_file.write_text(yaml.safe_dump(rules))
+    monkeypatch.setattr("triage_engine.RULES_ARTIFACT_DIR", str(tmp_path / "cache") if artifact else "")
+    return TriageEvaluator(str(rules_file), result_cache_size=0)
+
+
+def _requests():
+    for size in (1, 2, 3):
+        for symptoms in itertools.combinations(SYMPTOMS, size):
+            yield TriageRequest(symptoms=list(symptoms))
+
+
+def _label(evaluator, *symptoms):
+    return evaluator.classify(TriageRequest(symptoms=list(symptoms)))[0]
+
+
+@pytest.mark.parametrize("artifact", [False, True])
+def test_groups_decide_matches(tmp_path, monkeypatch, artifact):
+    evaluator = _evaluator(tmp_path, monkeypatch, artifact=artifact)
+    assert _label(evaluator, "fever", "Neck stiffness") == "EMERGENCY_911"
+    assert _label(evaluator, "fever", "stiff neck", "rash") == "SELF_CARE_MONITOR"
+    assert _label(evaluator, "fever", "cough", "fatigue") == "GP_CARE"
+    assert _label(evaluator, "fever", "cough") == "SELF_CARE_MONITOR"
+    assert _label(evaluator, "cough", "fatigue") == "SELF_CARE_MONITOR"
+    assert _label(evaluator, "sneezing", "sore throat") == "SELF_CARE"
+    assert _label(evaluator, "sneezing") == "SELF_CARE_MONITOR"
+
+
+def test_compiled_predicates_match_interpreted_rules(tmp_path, monkeypatch):
+    evaluator = _evaluator(tmp_path, monkeypatch)
+    for request in _requests():
+        expected = [rule["id"] for rule in evaluator.sorted_rules if evaluator.evaluate_rule(request, rule)[0]]
+        assert [rule["id"] for rule in evaluator.match_rules(request)] == expected, request.symptoms
+
+
+def test_bulk_engine_agrees(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    from bulk_engine import BulkTriageEngine
+
+    evaluator = _evaluator(tmp_path, monkeypatch)
+    requests = list(_requests())
+    results = BulkTriageEngine(evaluator).classify_batch(requests)
+    assert [r["triage_label"] for r in results] == [evaluator.classify(r)[0] for r in requests]
+
+
+@pytest.mark.parametrize("condition", [
+    {"none_of": ["rash"]},
+    {"symptoms": ["fever"], "at_least": {"count": 3, "of": ["cough", "fatigue"]}},
+    {"symptoms": ["fever"], "at_least": 2},
+    {"symptoms": ["fever"], "all_of": "cough"},
+    {"symptoms": ["fever"], "all_of": [[]]},
+])
+def test_malformed_groups_are_rejected(condition):
+    with pytest.raises(ConditionError):
+        CompiledGroups([condition])
+
+
+def test_bad_reload_keeps_current_rules(tmp_path, monkeypatch):
+    evaluator = _evaluator(tmp_path, monkeypatch)
+    version = evaluator.rules_version
+    broken = {"rules": [{**RULES["rules"][0], "conditions": [{"none_of": ["rash"]}]}]}
+    (tmp_path / "rules.yaml").write_text(yaml.safe_dump(broken))
+    with pytest.raises(ConditionError):
+        evaluator.reload_rules()
+    assert evaluator.rules_version == version
+    assert _label(evaluator, "fever", "stiff neck") == "EMERGENCY_911"
@@ -0,0 +1,75 @@
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+import triage
+from symptom_suggest import SuggestionTrie, SymptomSuggester
+from triage import app, init_db
+
+client = TestClient(app)
+
+
+def test_trie_matches_phrase_and_word_prefixes():
+    trie = SuggestionTrie({"chest pain": 1, "chills": 5, "shortness of breath": 1, "back pain": 4})
+    assert [s.phrase for s in trie.suggest("ch")] == ["chest pain", "chills"]
+    assert [s.phrase for s in trie.suggest("Chest  P")] == ["chest pain"]
+    # Phrases starting with the query come before mid-phrase matches
+    assert [s.phrase for s in trie.suggest("b")] == ["back pain", "shortness of breath"]
+    assert [s.phrase for s in trie.suggest("pain")] == ["chest pain", "back pain"]
+    assert trie.suggest("chx") == []
+    assert trie.suggest("   ") == []
+
+
+def test_frequency_outranks_priority():
+    trie = SuggestionTrie({"chest pain": 1, "chills": 5}, {"chills": 3})
+    suggestions = trie.suggest("ch")
+    assert [s.phrase for s in suggestions] == ["chills", "chest pain"]
+    assert suggestions[0].frequency == 3
+
+
+def test_refresh_counts_logged_sessions(tmp_path, monkeypatch):
+    db_file = str(tmp_path / "suggest.db")
+    monkeypatch.setattr("triage.DB_FILE", db_file)
+    init_db()
+    suggester = SymptomSuggester()
+    suggester.load_rules(triage.evaluator.sorted_rules)
+    assert suggester.suggest("ch")[0].phrase == "chest pain"
+
+    conn = sqlite3.connect(db_file)
+    for session_id in ("a", "b"):
+        conn.execute(
+            "INSERT INTO triage_sessions (id, symptoms, additional_factors) VALUES (?, ?, ?)",
+            (session_id, "Choking, cough", "choking"),
+        )
+    conn.commit()
+    conn.close()
+
+    suggester.refresh(db_file)
+    top = suggester.suggest("ch")[0]
+    assert (top.phrase, top.frequency) == ("choking", 2)
+    # Already-counted rows are not counted again
+    suggester.refresh(db_file)
+    assert suggester.suggest("ch")[0].frequency == 2
+
+
+def test_suggest_endpoint_is_fast():
+    response = client.get("/api/symptoms/suggest", params={"q": "shortn", "limit": 3})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "shortn"
+    assert body["suggestions"][0]["phrase"] == "shortness of breath"
+    assert client.get("/api/symptoms/suggest", params={"q": "ch", "limit": 50}).status_code == 422
+
+    runs = 1000
+    started = time.perf_counter()
+    for _ in range(runs):
+        triage.symptom_suggester.suggest("ch")
+    assert (time.perf_counter() - started) / runs < 0.0005
+
+
+def test_suggestions_follow_rule_reload():
+    original = triage.symptom_suggester.trie
+    triage.evaluator.reload_rules()
+    assert triage.symptom_suggester.trie is not original
+    assert triage.symptom_suggester.suggest("chest")
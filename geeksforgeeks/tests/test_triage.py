@@ -239,6 +239,88 @@ class TestTriageEvaluator:
         assert matches == True
         assert confidence > 0.7
 
+    def test_match_temperature_numeric(self):
+        """Temperatures are compared numerically across °F and °C"""
+        assert evaluator.match_temperature("104°F", [">103°F"]) == True
+        assert evaluator.match_temperature("40.1°C", [">103°F"]) == True
+        assert evaluator.match_temperature("101.5°F", ["100.4°F-103°F"]) == True
+        assert evaluator.match_temperature("99.8°F", [">103°F", ">39.4°C"]) == False
+        assert evaluator.match_temperature("104°F", ["103"]) == True
+
+    def test_match_age_ranges(self):
+        """Patient age is matched against numeric ranges"""
+        assert evaluator.match_age(70, [">=65"]) == True
+        assert evaluator.match_age(40, [">=65", "<2"]) == False
+        assert evaluator.match_age(1, ["0-2"]) == True
+        assert evaluator.match_age(None, [">=65"]) == True
+
+    def test_high_temperature_matches_fever_threshold_rule(self):
+        """A 104°F fever satisfies the >103°F urgent care condition"""
+        request = TriageRequest(symptoms=["fever"], temperature="104°F")
+        matched_ids = [rule["id"] for rule in evaluator.match_rules(request)]
+        assert "URG_002" in matched_ids
+
+    def test_parse_duration(self):
+        """Free-text durations normalize to hours plus onset flags"""
+        from rule_index import parse_duration
+
+        assert parse_duration("3 weeks").min_hours == 504
+        assert parse_duration("few hours").max_hours < 24
+        assert parse_duration("over 2 weeks").max_hours is None
+        assert "sudden" in parse_duration("sudden onset").flags
+        assert "recurring" in parse_duration("comes and goes").flags
+        assert parse_duration("sometime") is not None and not parse_duration("sometime").known
+
+    def test_match_duration(self):
+        """Rule duration terms are matched against the parsed duration"""
+        assert evaluator.match_duration("3 weeks", [">2 weeks"]) == True
+        assert evaluator.match_duration("2 days", [">2 weeks"]) == False
+        assert evaluator.match_duration("2 days", ["<1 week"]) == True
+        assert evaluator.match_duration("persistent", ["persistent", "recurring"]) == True
+        assert evaluator.match_duration("sudden onset", ["persistent", "recurring"]) == False
+        assert evaluator.match_duration(None, [">2 weeks"]) == True
+
+    def test_duration_filters_rule_candidates(self):
+        """A sore throat past the <5 days cold rule no longer matches it"""
+        request = TriageRequest(symptoms=["sore throat"], severity="mild", duration="2 days")
+        assert "SC_001" in [rule["id"] for rule in evaluator.match_rules(request)]
+        request = TriageRequest(symptoms=["sore throat"], severity="mild", duration="10 days")
+        assert "SC_001" not in [rule["id"] for rule in evaluator.match_rules(request)]
+
+    @pytest.mark.parametrize("symptoms,severity,duration,label", [
+        (["chest pain"], "moderate", "2 hours", "URGENT_CARE"),
+        (["chest pain"], "moderate", "sudden onset", "URGENT_CARE"),
+        (["abdominal pain"], "severe", "1 hour", "URGENT_CARE"),
+        (["cough"], None, "3 days", "SEE_DOCTOR_24H"),
+    ])
+    def test_duration_never_lowers_urgency(self, symptoms, severity, duration, label):
+        """Acute onsets keep the label the symptoms alone would get"""
+        request = TriageRequest(symptoms=symptoms, severity=severity, duration=duration)
+        assert evaluator.classify(request)[0] == label
+
+    @pytest.mark.parametrize("duration", [None, "2 hours", "2 days", "10 days", "3 weeks", "sudden onset", "persistent"])
+    def test_evaluate_rule_agrees_with_match_rules_on_durations(self, duration):
+        """The interpreted evaluator applies durations the same label-preserving way"""
+        for symptoms in (["chest pain"], ["sore throat"], ["cough"], ["abdominal pain"], ["headache", "fever"]):
+            for severity in (None, "mild", "moderate", "severe"):
+                request = TriageRequest(symptoms=symptoms, severity=severity, duration=duration)
+                expected = [r["id"] for r in evaluator.sorted_rules if evaluator.evaluate_rule(request, r)[0]]
+                assert [r["id"] for r in evaluator.match_rules(request)] == expected, (symptoms, severity)
+
+    def test_interval_index_stabbing(self):
+        """Interval index returns exactly the intervals containing a point"""
+        from rule_index import INF, Interval, IntervalIndex
+
+        index = IntervalIndex([
+            (Interval(100.4, 103.0), "moderate"),
+            (Interval(103.0, INF, low_inclusive=False), "high"),
+            (Interval(-INF, 100.4, high_inclusive=False), "low"),
+        ])
+        assert index.stab(99.0) == ("low",)
+        assert index.stab(100.4) == ("moderate",)
+        assert index.stab(103.0) == ("moderate",)
+        assert index.stab(103.5) == ("high",)
+
 
 class TestAuthenticationRoutes:
     """Verify authentication helper routes are functional"""
@@ -297,6 +379,262 @@ class TestAuthenticationRoutes:
         assert response.json()["message"] == "Logged out"
         assert AUTH_COOKIE_NAME not in client.cookies
 
+class TestMetrics:
+    """Verify the Prometheus metrics endpoint and instrumentation"""
+
+    def test_metrics_endpoint_exposes_pipeline_metrics(self, authorized_client):
+        authorized_client.post("/api/triage", json={
+            "symptoms": ["chest pain"],
+            "severity": "severe"
+        })
+        response = authorized_client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'triage_rule_hits_total{rule_id="RED_001"}' in body
+        assert 'triage_label_outcomes_total{label="EMERGENCY_911"}' in body
+        assert "triage_rule_match_seconds_bucket" in body
+        assert "triage_log_session_seconds_count" in body
+        assert "db_open_connections" in body
+
+    def test_histogram_buckets_are_cumulative(self):
+        from metrics import Histogram, Registry
+
+        registry = Registry()
+        histogram = Histogram("test_seconds", "test", buckets=(0.1, 1.0), registry=registry)
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        body = registry.render()
+        assert 'test_seconds_bucket{le="0.1"} 1' in body
+        assert 'test_seconds_bucket{le="1"} 2' in body
+        assert 'test_seconds_bucket{le="+Inf"} 3' in body
+        assert "test_seconds_count 3" in body
+
+
+class TestResultCache:
+    """Verify repeated identical requests are served from the result cache"""
+
+    def test_identical_requests_hit_cache_with_fresh_session(self, authorized_client):
+        evaluator.result_cache.clear()
+        first = authorized_client.post("/api/triage", json={
+            "symptoms": ["Chest Pain", "sweating"], "severity": "severe"
+        }).json()
+        hits_before = evaluator.result_cache.hits
+        second = authorized_client.post("/api/triage", json={
+            "symptoms": ["sweating ", "chest pain"], "severity": "Severe"
+        }).json()
+        assert evaluator.result_cache.hits == hits_before + 1
+        assert second["session_id"] != first["session_id"]
+        assert second["triage_label"] == first["triage_label"]
+        assert second["explanation"] == first["explanation"]
+        assert second["matched_rules"] == first["matched_rules"]
+
+    def test_fingerprint_distinguishes_relevant_fields(self):
+        from result_cache import request_fingerprint
+
+        base = TriageRequest(symptoms=["fever"], temperature="104°F")
+        assert request_fingerprint(base, "v1") != request_fingerprint(
+            TriageRequest(symptoms=["fever"], temperature="99°F"), "v1"
+        )
+        assert request_fingerprint(base, "v1") != request_fingerprint(base, "v2")
+
+    def test_llm_failure_fallback_is_not_cached(self, monkeypatch, tmp_path):
+        from triage import TriageEvaluator, init_db
+
+        monkeypatch.setattr("triage.DB_FILE", str(tmp_path / "cache.db"))
+        init_db()
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        fresh = TriageEvaluator()
+        fresh.explanation_batcher.window_seconds = 0
+        request = TriageRequest(symptoms=["chest pain"], severity="severe")
+
+        def outage(rule, request):
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr(fresh, "generate_openai_explanation", outage)
+        fallback = fresh.evaluate_triage(request).explanation
+        assert len(fresh.result_cache) == 0
+
+        monkeypatch.setattr(fresh, "generate_openai_explanation", lambda rule, request: "LLM advice.")
+        assert fresh.evaluate_triage(request).explanation == "LLM advice."
+        assert fallback != "LLM advice."
+        assert len(fresh.result_cache) == 1
+
+    def test_reload_invalidates_cache(self):
+        evaluator.evaluate_triage(TriageRequest(symptoms=["headache"], severity="mild"))
+        assert len(evaluator.result_cache) > 0
+        version = evaluator.rules_version
+        assert evaluator.reload_rules() == version
+        assert len(evaluator.result_cache) == 0
+
+    def test_hit_ratio_metric_exposed(self, authorized_client):
+        body = authorized_client.get("/metrics").text
+        assert "triage_result_cache_hit_ratio" in body
+
+
+class TestRequestProfiling:
+    """Verify admin-authorized per-request profiling"""
+
+    @pytest.fixture
+    def admin_headers(self):
+        response = client.post(
+            "/api/admin/auth/login",
+            json={"username": "admin", "password": "admin123"},
+        )
+        assert response.status_code == 200
+        return {"X-Admin-Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def test_flagged_triage_request_is_profiled(self, authorized_client, admin_headers, tmp_path):
+        import pstats
+
+        response = authorized_client.post(
+            "/api/triage?profile=cpu,memory",
+            json={"symptoms": ["chest pain"], "severity": "severe"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        auth = {"Authorization": admin_headers["X-Admin-Authorization"]}
+        detail = authorized_client.get(f"/api/admin/profiles/{profile_id}", headers=auth).json()
+        assert detail["path"] == "/api/triage"
+        assert detail["top_functions"]
+        assert detail["top_allocations"]
+
+        download = authorized_client.get(f"/api/admin/profiles/{profile_id}/pstats", headers=auth)
+        assert download.status_code == 200
+        prof_file = tmp_path / "request.prof"
+        prof_file.write_bytes(download.content)
+        stats = pstats.Stats(str(prof_file))
+        assert stats.total_calls > 0
+        # Work done in the threadpool is part of the profile
+        profiled = {funcname for _, _, funcname in stats.stats}
+        assert {"evaluate_triage", "match_rules"} <= profiled
+
+    def test_profiling_requires_admin(self, authorized_client):
+        response = authorized_client.post(
+            "/api/triage",
+            json={"symptoms": ["headache"]},
+            headers={"X-Profile": "1"},
+        )
+        assert response.status_code == 403
+
+    def test_unflagged_request_is_not_profiled(self, authorized_client):
+        response = authorized_client.post("/api/triage", json={"symptoms": ["headache"]})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+
+class TestStaticResponses:
+    """Verify ETag/304 handling of prebuilt endpoint bodies"""
+
+    @pytest.mark.parametrize("path", ["/api/rules", "/api/demo", "/api/demo/stroke", "/api/health"])
+    def test_if_none_match_returns_304(self, path):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_rules_etag_follows_rules_version(self):
+        response = client.get("/api/rules")
+        assert response.headers["etag"] == f'"{evaluator.rules_version}"'
+        assert response.json() == json.loads(json.dumps(evaluator.rules_data, default=str))
+
+    def test_health_etag_changes_with_body(self):
+        import time
+
+        before = client.get("/api/health")
+        time.sleep(0.001)
+        evaluator.reload_rules()
+        after = client.get("/api/health")
+        # Same rules, new load timestamp: a strong validator must change with the body
+        assert after.json()["rules_version"] == before.json()["rules_version"]
+        assert after.content != before.content
+        assert after.headers["etag"] != before.headers["etag"]
+        assert client.get("/api/health", headers={"If-None-Match": before.headers["etag"]}).status_code == 200
+
+    def test_demo_file_is_served(self):
+        with open("demo_payloads.json", "r") as f:
+            demo_ids = list(json.load(f)["demo_payloads"])
+        assert client.get("/api/demo").json()["demo_ids"] == demo_ids
+        assert client.get("/api/demo/stroke").json()["expected_triage_label"] == "EMERGENCY_911"
+
+
+class TestTriageHistory:
+    """Verify the per-user triage history endpoints"""
+
+    @pytest.fixture(autouse=True)
+    def history_db(self, tmp_path, monkeypatch):
+        from triage import init_db
+        from user_history import history_cache
+
+        monkeypatch.setattr("triage.DB_FILE", str(tmp_path / "history.db"))
+        init_db()
+        history_cache.clear()
+        yield
+        history_cache.clear()
+
+    def test_history_pages_newest_first(self, authorized_client):
+        for symptom in ["headache", "cough", "sore throat"]:
+            assert authorized_client.post("/api/triage", json={"symptoms": [symptom]}).status_code == 200
+
+        first = authorized_client.get("/api/me/triage-sessions?limit=2").json()
+        assert [item["request"]["symptoms"] for item in first["items"]] == [["sore throat"], ["cough"]]
+        rest = authorized_client.get(f"/api/me/triage-sessions?limit=2&cursor={first['next_cursor']}").json()
+        assert [item["request"]["symptoms"] for item in rest["items"]] == [["headache"]]
+        assert rest["next_cursor"] is None
+
+        session_id = first["items"][0]["session_id"]
+        detail = authorized_client.get(f"/api/me/triage-sessions/{session_id}").json()
+        assert detail["triage_label"] == first["items"][0]["triage_label"]
+
+    def test_cached_page_is_invalidated_by_new_triage(self, authorized_client):
+        authorized_client.post("/api/triage", json={"symptoms": ["headache"]})
+        assert len(authorized_client.get("/api/me/triage-sessions").json()["items"]) == 1
+        authorized_client.post("/api/triage", json={"symptoms": ["cough"]})
+        assert len(authorized_client.get("/api/me/triage-sessions").json()["items"]) == 2
+
+    def test_cached_page_sees_sessions_logged_by_other_workers(self, authorized_client):
+        import sqlite3
+        import triage
+
+        authorized_client.post("/api/triage", json={"symptoms": ["headache"]})
+        assert len(authorized_client.get("/api/me/triage-sessions").json()["items"]) == 1
+        # Another worker's write is only visible through the database
+        conn = sqlite3.connect(triage.DB_FILE)
+        conn.execute(
+            "INSERT INTO triage_sessions (id, symptoms, user_id) VALUES (?, ?, ?)",
+            ("other-worker", "cough", "dev_tester@example.com"),
+        )
+        conn.commit()
+        conn.close()
+        assert len(authorized_client.get("/api/me/triage-sessions").json()["items"]) == 2
+
+    def test_cached_page_sees_deleted_sessions(self, authorized_client):
+        import sqlite3
+        import triage
+        from user_history import history_version
+
+        session_id = authorized_client.post("/api/triage", json={"symptoms": ["headache"]}).json()["session_id"]
+        assert len(authorized_client.get("/api/me/triage-sessions").json()["items"]) == 1
+        conn = sqlite3.connect(triage.DB_FILE)
+        before = history_version(conn, "dev_tester@example.com")
+        conn.execute("DELETE FROM triage_sessions WHERE id = ?", (session_id,))
+        conn.commit()
+        assert history_version(conn, "dev_tester@example.com") == before + 1
+        conn.close()
+        assert authorized_client.get("/api/me/triage-sessions").json()["items"] == []
+
+    def test_other_users_sessions_are_hidden(self, authorized_client):
+        evaluator.log_session("someone-else", TriageRequest(symptoms=["cough"]), "SELF_CARE_MONITOR", [], "")
+        assert authorized_client.get("/api/me/triage-sessions/someone-else").status_code == 404
+
+
 class TestDemoScenarios:
     """Test all demo scenarios to ensure they work as expected"""
     
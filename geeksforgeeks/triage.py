@@ -1,39 +1,102 @@
 import os
 import sqlite3
-import uuid
-import yaml
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from fastapi import FastAPI, HTTPException, Depends
+from typing import List, Dict, Optional
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
-import openai
 from dotenv import load_dotenv
 
 try:
     from .auth_backend import (
         router as auth_router,
         AuthUser,
+        OAUTH_STUB_ENABLED,
         get_current_user,
+        oauth_http,
     )
 except ImportError:  # pragma: no cover - fallback for direct execution
     from auth_backend import (  # type: ignore
         router as auth_router,
         AuthUser,
+        OAUTH_STUB_ENABLED,
         get_current_user,
+        oauth_http,
     )
 
+try:
+    from .metrics import (
+        CONTENT_TYPE_LATEST,
+        IN_FLIGHT_REQUESTS,
+        LOG_SESSION_SECONDS,
+        TrackedConnection,
+        render_latest,
+    )
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from metrics import (  # type: ignore
+        CONTENT_TYPE_LATEST,
+        IN_FLIGHT_REQUESTS,
+        LOG_SESSION_SECONDS,
+        TrackedConnection,
+        render_latest,
+    )
+
+try:
+    from .triage_engine import DB_FILE, TriageEngine, TriageRequest, TriageResponse
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from triage_engine import DB_FILE, TriageEngine, TriageRequest, TriageResponse  # type: ignore
+
 # Import admin backend
-from admin_backend import admin_router
+from admin_backend import admin_router, get_current_admin
+from admission import AdmissionController, AdmissionRejected, prescreen_emergency
+from explanation_warmup import EXPLANATION_WARMUP, init_explanation_store, start_warmup
+from oauth_stub import stub_router
+from patients import init_patients, record_visit
+from profiling import ProfilingMiddleware, profiling_router, run_profiled
+from review_queue import enqueue_case, init_review_queue
+from session_codec import encode_columns, encode_matched_rules, encode_payload
+from session_export import export_router
+from session_search import init_search_index, search_router
+from static_responses import PrebuiltResponse, prebuilt_json
+from symptom_groups import ConditionError
+from symptom_suggest import DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS, SymptomSuggester
+from user_history import (
+    MAX_HISTORY_PAGE,
+    fetch_history_page,
+    fetch_history_record,
+    history_cache,
+    history_version,
+    init_history_versions,
+)
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pooled OAuth client up front and close its connections on shutdown
+    oauth_http.get()
+    symptom_suggester.start_refresh(DB_FILE)
+    # Pre-generate explanations now and after every rules reload, only with an LLM configured
+    warmup = EXPLANATION_WARMUP and bool(os.getenv("OPENAI_API_KEY"))
+    if warmup:
+        evaluator.reload_listeners.append(warm_explanations_in_background)
+        warm_explanations_in_background(evaluator)
+    yield
+    if warmup:
+        evaluator.reload_listeners.remove(warm_explanations_in_background)
+    symptom_suggester.stop()
+    await oauth_http.aclose()
+
 app = FastAPI(
     title="AI Healthcare Triage Bot",
     description="An AI-powered healthcare triage system that evaluates symptoms and provides appropriate care recommendations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -52,16 +115,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def track_in_flight_requests(request: Request, call_next):
+    """Keep the in-flight request gauge current for /metrics"""
+    with IN_FLIGHT_REQUESTS.track_inprogress():
+        return await call_next(request)
+
+
+# Opt-in per-request profiling (X-Profile header or ?profile= flag, admin only)
+app.add_middleware(ProfilingMiddleware)
+
+
 # Include authentication routesheufesah   
 app.include_router(auth_router)
+if OAUTH_STUB_ENABLED:
+    app.include_router(stub_router)
 
 # Database setup
-DB_FILE = os.getenv("TRIAGE_DB_FILE", "triage_sessions.db")
-
-
 def init_db():
     """Initialize SQLite database for session logging"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
     cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS triage_sessions (
@@ -83,6 +157,21 @@ def init_db():
     columns = {row[1] for row in cursor.fetchall()}
     if "user_id" not in columns:
         cursor.execute("ALTER TABLE triage_sessions ADD COLUMN user_id TEXT")
+    # Keyset order for streaming exports
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triage_sessions_timestamp_id
+        ON triage_sessions (timestamp, id)
+    """)
+    init_search_index(conn)
+    init_review_queue(conn)
+    init_patients(conn)
+    init_explanation_store(conn)
+    # Per-user history, newest first
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_triage_sessions_user_timestamp
+        ON triage_sessions (user_id, timestamp)
+    """)
+    init_history_versions(conn)
     conn.commit()
     conn.close()
 
@@ -91,249 +180,50 @@ init_db()
 
 # Include admin router for medical dashboard
 app.include_router(admin_router)
+app.include_router(profiling_router)
+app.include_router(export_router)
+app.include_router(search_router)
 
-# Load rules from YAML
-def load_rules():
-    """Load triage rules from rules.yaml"""
-    import os
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    rules_file = os.path.join(script_dir, "rules.yaml")
-    
-    try:
-        with open(rules_file, "r") as file:
-            return yaml.safe_load(file)
-    except FileNotFoundError:
-        raise HTTPException(status_code=500, detail=f"Rules file not found at {rules_file}")
-    except yaml.YAMLError as e:
-        raise HTTPException(status_code=500, detail=f"Error parsing rules file: {str(e)}")
-
-# Pydantic models
-class TriageRequest(BaseModel):
-    symptoms: List[str] = Field(..., description="List of symptoms reported by the patient")
-    severity: Optional[str] = Field(None, description="Severity level: mild, moderate, severe, critical")
-    duration: Optional[str] = Field(None, description="Duration of symptoms")
-    additional_factors: Optional[List[str]] = Field([], description="Additional factors or symptoms")
-    temperature: Optional[str] = Field(None, description="Body temperature if fever is present")
-    patient_age: Optional[int] = Field(None, description="Patient age for age-specific considerations")
-    session_id: Optional[str] = Field(None, description="Optional session ID for tracking")
-
-class TriageResponse(BaseModel):
-    session_id: str
-    triage_label: str
-    urgency: str
-    action: str
-    timeframe: str
-    matched_rules: List[Dict[str, Any]]
-    explanation: str
-    confidence_score: float
-    timestamp: datetime
+# API-only Pydantic models (TriageRequest/TriageResponse live in triage_engine)
+class SymptomSuggestion(BaseModel):
+    phrase: str
+    priority: int = Field(..., description="Best priority of the rules using this phrase (1 is most urgent)")
+    frequency: int = Field(..., description="Logged triage sessions that reported this phrase")
+
+class SymptomSuggestions(BaseModel):
+    query: str
+    suggestions: List[SymptomSuggestion]
 
 class DemoPayload(BaseModel):
     id: str
     name: str
     description: str
     payload: TriageRequest
+    expected_triage_label: Optional[str] = None
 
-# Rule evaluation engine
-class TriageEvaluator:
-    def __init__(self):
-        self.rules_data = load_rules()
-        self.rules = self.rules_data.get("rules", [])
-        self.triage_labels = self.rules_data.get("triage_labels", {})
-    
-    def normalize_text(self, text: str) -> str:
-        """Normalize text for comparison"""
-        return text.lower().strip()
-    
-    def match_symptoms(self, user_symptoms: List[str], rule_symptoms: List[str]) -> bool:
-        """Check if user symptoms match rule symptoms"""
-        user_symptoms_norm = [self.normalize_text(s) for s in user_symptoms]
-        
-        for rule_symptom in rule_symptoms:
-            rule_symptom_norm = self.normalize_text(rule_symptom)
-            # Check for exact match or partial match
-            if any(rule_symptom_norm in user_symptom or user_symptom in rule_symptom_norm 
-                   for user_symptom in user_symptoms_norm):
-                return True
-        return False
-    
-    def match_severity(self, user_severity: Optional[str], rule_severity: List[str]) -> bool:
-        """Check if user severity matches rule severity requirements"""
-        if not user_severity:
-            return "any" in rule_severity or len(rule_severity) == 0
-        
-        user_severity_norm = self.normalize_text(user_severity)
-        return user_severity_norm in [self.normalize_text(s) for s in rule_severity] or "any" in rule_severity
-    
-    def match_additional_factors(self, user_factors: List[str], rule_factors: List[str]) -> bool:
-        """Check if additional factors match"""
-        if not rule_factors:
-            return True
-        
-        user_factors_norm = [self.normalize_text(f) for f in user_factors]
-        
-        for rule_factor in rule_factors:
-            rule_factor_norm = self.normalize_text(rule_factor)
-            if any(rule_factor_norm in user_factor or user_factor in rule_factor_norm 
-                   for user_factor in user_factors_norm):
-                return True
-        return False
-    
-    def match_temperature(self, user_temp: Optional[str], rule_temp: List[str]) -> bool:
-        """Check if temperature matches rule requirements"""
-        if not user_temp or not rule_temp:
-            return True
-        
-        # Simple temperature matching - could be enhanced with actual parsing
-        user_temp_norm = self.normalize_text(user_temp)
-        return any(self.normalize_text(temp) in user_temp_norm for temp in rule_temp)
-    
-    def evaluate_rule(self, request: TriageRequest, rule: Dict) -> tuple[bool, float]:
-        """Evaluate if a single rule matches the request"""
-        conditions = rule.get("conditions", [])
-        
-        for condition in conditions:
-            symptoms_match = self.match_symptoms(request.symptoms, condition.get("symptoms", []))
-            severity_match = self.match_severity(request.severity, condition.get("severity", []))
-            factors_match = self.match_additional_factors(
-                request.additional_factors or [], 
-                condition.get("additional_factors", [])
-            )
-            temp_match = self.match_temperature(
-                request.temperature, 
-                condition.get("temperature", [])
-            )
-            
-            if symptoms_match and severity_match and factors_match and temp_match:
-                # Calculate confidence score based on how many criteria matched
-                confidence = 0.7  # Base confidence
-                if request.severity: confidence += 0.1
-                if request.additional_factors: confidence += 0.1
-                if request.temperature: confidence += 0.1
-                
-                return True, min(confidence, 1.0)
-        
-        return False, 0.0
-    
-    def evaluate_triage(self, request: TriageRequest, user: Optional[AuthUser] = None) -> TriageResponse:
-        """Evaluate triage request against all rules in priority order"""
-        matched_rules = []
-        
-        # Sort rules by priority
-        sorted_rules = sorted(self.rules, key=lambda x: x.get("priority", 999))
-        
-        for rule in sorted_rules:
-            matches, confidence = self.evaluate_rule(request, rule)
-            if matches:
-                matched_rules.append({
-                    "id": rule["id"],
-                    "name": rule["name"],
-                    "category": rule["category"],
-                    "confidence": confidence
-                })
-        
-        if not matched_rules:
-            # Default to self-care if no rules match
-            triage_label = "SELF_CARE_MONITOR"
-            explanation = "Based on the symptoms provided, self-care with monitoring is recommended. If symptoms worsen or persist, please seek medical attention."
-            confidence_score = 0.3
-        else:
-            # Use the highest priority (first) matched rule
-            best_rule = next((r for r in sorted_rules if r["id"] == matched_rules[0]["id"]), None)
-            triage_label = best_rule["triage_label"]
-            explanation = self.generate_explanation(best_rule, request)
-            confidence_score = matched_rules[0]["confidence"]
-        
-        # Get triage label details
-        label_info = self.triage_labels.get(triage_label, {
-            "urgency": "unknown",
-            "action": "Consult healthcare provider",
-            "timeframe": "as needed"
-        })
-        
-        # Generate session ID if not provided
-        session_id = request.session_id or str(uuid.uuid4())
-        
-        # Log to database
-        self.log_session(session_id, request, triage_label, matched_rules, explanation, user)
-        
-        return TriageResponse(
-            session_id=session_id,
-            triage_label=triage_label,
-            urgency=label_info["urgency"],
-            action=label_info["action"],
-            timeframe=label_info["timeframe"],
-            matched_rules=matched_rules,
-            explanation=explanation,
-            confidence_score=confidence_score,
-            timestamp=datetime.now()
-        )
-    
-    def generate_explanation(self, rule: Dict, request: TriageRequest) -> str:
-        """Generate explanation using OpenAI or template fallback"""
-        # Try OpenAI first if API key is available
-        if os.getenv("OPENAI_API_KEY"):
-            try:
-                return self.generate_openai_explanation(rule, request)
-            except Exception as e:
-                print(f"OpenAI API error: {e}")
-                # Fall back to template
-        
-        # Use template explanation
-        template = rule.get("explanation_template", "Please consult with a healthcare provider about your symptoms.")
-        
-        # Simple template variable replacement
-        explanation = template
-        if request.symptoms:
-            explanation += f" Your reported symptoms include: {', '.join(request.symptoms)}."
-        
-        return explanation
-    
-    def generate_openai_explanation(self, rule: Dict, request: TriageRequest) -> str:
-        """Generate explanation using OpenAI API"""
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        prompt = f"""
-        As a healthcare triage assistant, provide a clear, empathetic explanation for the following triage recommendation:
-
-        Rule: {rule['name']}
-        Category: {rule['category']}
-        Triage Label: {rule['triage_label']}
-        
-        Patient Symptoms: {', '.join(request.symptoms)}
-        Severity: {request.severity or 'Not specified'}
-        Duration: {request.duration or 'Not specified'}
-        Additional Factors: {', '.join(request.additional_factors or [])}
-        
-        Provide a 2-3 sentence explanation that:
-        1. Acknowledges the patient's symptoms
-        2. Explains why this triage level is recommended
-        3. Provides clear next steps
-        
-        Keep the tone professional, empathetic, and reassuring while being appropriately urgent when necessary.
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=200,
-            temperature=0.3
-        )
-        
-        return response.choices[0].message.content.strip()
-    
+# Rule evaluation engine, logging every evaluated session
+class TriageEvaluator(TriageEngine):
     def log_session(self, session_id: str, request: TriageRequest, triage_label: str, 
                    matched_rules: List[Dict], explanation: str, user: Optional[AuthUser] = None):
         """Log triage session to SQLite database"""
-        conn = sqlite3.connect(DB_FILE)
+        with LOG_SESSION_SECONDS.time():
+            self._write_session(session_id, request, triage_label, matched_rules, explanation, user)
+    
+    def _write_session(self, session_id: str, request: TriageRequest, triage_label: str,
+                       matched_rules: List[Dict], explanation: str, user: Optional[AuthUser] = None):
+        conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
         cursor = conn.cursor()
         
-        session_data = json.dumps({
-            "request": request.dict(),
-            "recorded_at": datetime.now().isoformat(),
-            "user_id": user.id if user else None,
-        })
+        payload = request.model_dump()
+        columns = encode_columns(payload)
+        
+        patient_id, patient_name = None, None
+        if user:
+            # Re-logging an existing session id must not count as another consultation
+            cursor.execute("SELECT 1 FROM triage_sessions WHERE id = ?", (session_id,))
+            new_session = cursor.fetchone() is None
+            patient_name = user.name or user.email
+            patient_id = record_visit(cursor, user.id, patient_name, request.patient_age, new_session)
         
         cursor.execute("""
             INSERT OR REPLACE INTO triage_sessions 
@@ -342,22 +232,80 @@ class TriageEvaluator:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             session_id,
-            ", ".join(request.symptoms),
-            request.severity or "",
-            request.duration or "",
-            ", ".join(request.additional_factors or []),
+            columns["symptoms"],
+            columns["severity"],
+            columns["duration"],
+            columns["additional_factors"],
             triage_label,
-            str(matched_rules),
+            encode_matched_rules(matched_rules),
             explanation,
-            session_data,
+            encode_payload(payload, session_id),
             user.id if user else None,
         ))
         
+        # EMERGENCY/URGENT sessions join the clinician review queue in the same transaction
+        enqueue_case(
+            cursor, session_id, triage_label,
+            self.triage_labels.get(triage_label, {}).get("urgency"),
+            columns["symptoms"], columns["severity"], request.patient_age,
+            patient_id, patient_name,
+        )
+        
         conn.commit()
         conn.close()
 
 # Initialize evaluator
 evaluator = TriageEvaluator()
+admission_controller = AdmissionController()
+
+DEMO_PAYLOADS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo_payloads.json")
+
+# Pre-serialized bodies for /api/rules, /api/demo and /api/health, rebuilt on rule reload
+static_responses: Dict[str, PrebuiltResponse] = {}
+
+
+def build_static_responses(evaluator: TriageEvaluator) -> None:
+    """Serialize the static-ish endpoint bodies once for the current rules and demo file"""
+    with open(DEMO_PAYLOADS_FILE, "r", encoding="utf-8") as f:
+        demos = [DemoPayload(**demo) for demo in json.load(f)["demo_payloads"].values()]
+    
+    responses = {
+        "rules": prebuilt_json(evaluator.rules_data, evaluator.rules_version),
+        # The load timestamp changes on every reload, so the ETag is a hash of the body
+        "health": prebuilt_json({
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "version": "1.0.0",
+            "rules_version": evaluator.rules_version,
+        }),
+        "demo_list": prebuilt_json({
+            "demo_ids": [demo.id for demo in demos],
+            "description": "Use /api/demo/{id} to get specific demo payloads for testing"
+        }),
+    }
+    for demo in demos:
+        responses[f"demo:{demo.id}"] = prebuilt_json(demo.model_dump())
+    # Swap in place so concurrent requests never see a missing key
+    stale = set(static_responses) - set(responses)
+    static_responses.update(responses)
+    for key in stale:
+        static_responses.pop(key, None)
+
+
+build_static_responses(evaluator)
+evaluator.reload_listeners.append(build_static_responses)
+
+symptom_suggester = SymptomSuggester()
+
+def rebuild_symptom_suggestions(evaluator: TriageEvaluator) -> None:
+    symptom_suggester.load_rules(evaluator.sorted_rules)
+
+rebuild_symptom_suggestions(evaluator)
+evaluator.reload_listeners.append(rebuild_symptom_suggestions)
+
+def warm_explanations_in_background(evaluator: TriageEvaluator) -> None:
+    # Started from lifespan, so importing this module never calls the LLM
+    start_warmup(evaluator, DB_FILE, TriageRequest)
 
 # API Endpoints
 @app.post("/api/triage", response_model=TriageResponse)
@@ -365,91 +313,78 @@ async def triage_endpoint(request: TriageRequest, user: AuthUser = Depends(get_c
     """
     Main triage endpoint that evaluates symptoms and returns triage recommendation
     """
+    # Correct typos first so a misspelt emergency symptom still skips the queue
+    request, corrections = evaluator.correct_request(request)
+    # Emergencies skip the queue and the LLM; everything else is admitted, degraded or shed
+    emergency = prescreen_emergency(evaluator, request)
+    try:
+        admission = await admission_controller.admit(user.id, emergency)
+    except AdmissionRejected as rejected:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Triage service is busy ({rejected.reason}); please retry shortly",
+            headers={"Retry-After": str(rejected.retry_after)},
+        )
     try:
-        return evaluator.evaluate_triage(request, user)
+        return await run_in_threadpool(
+            run_profiled, evaluator.evaluate_triage, request, user, admission.use_llm, corrections
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Triage evaluation error: {str(e)}")
+    finally:
+        admission_controller.release(admission)
 
 @app.get("/api/demo/{demo_id}", response_model=DemoPayload)
-async def get_demo_payload(demo_id: str):
+async def get_demo_payload(demo_id: str, request: Request):
     """
     Get demo request payload for frontend testing
     """
-    demo_payloads = {
-        "emergency": DemoPayload(
-            id="emergency",
-            name="Cardiac Emergency",
-            description="Severe chest pain with shortness of breath - should trigger RED/EMERGENCY_911",
-            payload=TriageRequest(
-                symptoms=["chest pain", "shortness of breath", "dizziness"],
-                severity="severe",
-                duration="sudden onset",
-                additional_factors=["sweating", "nausea"]
-            )
-        ),
-        "urgent": DemoPayload(
-            id="urgent", 
-            name="High Fever with Concerning Symptoms",
-            description="High fever with difficulty breathing - should trigger URGENT_CARE",
-            payload=TriageRequest(
-                symptoms=["fever", "difficulty breathing", "headache"],
-                severity="high",
-                duration="2 days",
-                temperature="104°F",
-                additional_factors=["confusion"]
-            )
-        ),
-        "gp": DemoPayload(
-            id="gp",
-            name="Persistent Cough",
-            description="Cough lasting over 2 weeks - should trigger SEE_DOCTOR_24H",
-            payload=TriageRequest(
-                symptoms=["persistent cough", "fatigue"],
-                severity="moderate",
-                duration="3 weeks",
-                additional_factors=["weight loss"]
-            )
-        ),
-        "self_care": DemoPayload(
-            id="self_care",
-            name="Mild Cold Symptoms", 
-            description="Basic cold symptoms - should trigger SELF_CARE_MONITOR",
-            payload=TriageRequest(
-                symptoms=["runny nose", "sneezing", "mild cough"],
-                severity="mild",
-                duration="2 days"
-            )
-        )
-    }
-    
-    if demo_id not in demo_payloads:
+    response = static_responses.get(f"demo:{demo_id}")
+    if response is None:
         raise HTTPException(status_code=404, detail="Demo payload not found")
     
-    return demo_payloads[demo_id]
+    return response.respond(request)
 
 @app.get("/api/demo")
-async def list_demo_payloads():
+async def list_demo_payloads(request: Request):
     """
     List all available demo payloads
     """
-    return {
-        "demo_ids": ["emergency", "urgent", "gp", "self_care"],
-        "description": "Use /api/demo/{id} to get specific demo payloads for testing"
-    }
+    return static_responses["demo_list"].respond(request)
+
+@app.get("/api/symptoms/suggest", response_model=SymptomSuggestions)
+async def suggest_symptoms(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Symptom phrases the rules recognise that start with (or have a word starting with) q"""
+    return {"query": q, "suggestions": [s._asdict() for s in symptom_suggester.suggest(q, limit)]}
 
 @app.get("/api/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(),
-        "version": "1.0.0"
-    }
+async def health_check(request: Request):
+    """Health check endpoint (timestamp is when the current rules were loaded)"""
+    return static_responses["health"].respond(request)
 
 @app.get("/api/rules")
-async def get_rules():
+async def get_rules(request: Request):
     """Get current triage rules (for debugging/admin)"""
-    return evaluator.rules_data
+    return static_responses["rules"].respond(request)
+
+
+@app.post("/api/admin/rules/reload")
+async def reload_rules(current_admin: Dict = Depends(get_current_admin)):
+    """Reload rules.yaml without restarting; invalidates cached triage results"""
+    try:
+        version = evaluator.reload_rules()
+    except ConditionError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rule condition: {str(e)}")
+    return {"message": "Rules reloaded", "rules_version": version, "rule_count": len(evaluator.rules)}
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/api/me", response_model=AuthUser)
@@ -457,6 +392,43 @@ async def get_current_user_profile(user: AuthUser = Depends(get_current_user)):
     """Return profile of the authenticated user"""
     return user
 
+
+@app.get("/api/me/triage-sessions")
+async def list_my_triage_sessions(
+    limit: int = Query(20, ge=1, le=MAX_HISTORY_PAGE),
+    cursor: Optional[str] = None,
+    user: AuthUser = Depends(get_current_user),
+):
+    """Newest-first history of the user's triage sessions (pass next_cursor to page)"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        if cursor:
+            return fetch_history_page(conn, user.id, limit, cursor)
+        # Read the version before the page, so a page is never stored with a newer version than its data
+        version = history_version(conn, user.id)
+        page = history_cache.get(user.id, limit, version)
+        if page is None:
+            page = fetch_history_page(conn, user.id, limit)
+            history_cache.put(user.id, limit, page, version)
+        return page
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        conn.close()
+
+
+@app.get("/api/me/triage-sessions/{session_id}")
+async def get_my_triage_session(session_id: str, user: AuthUser = Depends(get_current_user)):
+    """One of the user's own triage sessions"""
+    conn = sqlite3.connect(DB_FILE, factory=TrackedConnection)
+    try:
+        record = fetch_history_record(conn, user.id, session_id)
+    finally:
+        conn.close()
+    if record is None:
+        raise HTTPException(status_code=404, detail="Triage session not found")
+    return record
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,610 @@
+"""
+Side-effect-free triage engine
+Rules loading, the request/response models and TriageEngine, which matches rules and explains
+the result. Importing this module opens no database and starts no background work, so offline
+tools (retriage workers) can evaluate requests without the app's startup. triage.py extends
+TriageEngine with session logging and serves it.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import openai
+import yaml
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+
+try:
+    from .explanation_batcher import ExplanationBatcher, build_batch_prompt, parse_batch_response
+    from .explanation_warmup import PregeneratedExplanations, personalise
+    from .fuzzy_index import SymptomCorrector
+    from .metrics import (
+        EXPLANATION_SECONDS,
+        LABEL_OUTCOMES,
+        LLM_ERRORS,
+        LLM_FALLBACKS,
+        RULE_HITS,
+        RULE_MATCH_SECONDS,
+    )
+    from .result_cache import RESULT_CACHE_SIZE, CachedResult, TriageResultCache, request_fingerprint
+    from .rule_artifact import RULES_ARTIFACT_DIR, ArtifactError, RuleArtifact, load_artifact
+    from .rule_index import (
+        CompiledRules,
+        RequestFacts,
+        parse_age_range,
+        parse_duration,
+        parse_duration_constraint,
+        parse_temperature,
+        parse_temperature_range,
+    )
+    from .single_flight import llm_flights
+    from .symptom_groups import groups_match, has_groups
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from explanation_batcher import ExplanationBatcher, build_batch_prompt, parse_batch_response  # type: ignore
+    from explanation_warmup import PregeneratedExplanations, personalise  # type: ignore
+    from fuzzy_index import SymptomCorrector  # type: ignore
+    from metrics import (  # type: ignore
+        EXPLANATION_SECONDS,
+        LABEL_OUTCOMES,
+        LLM_ERRORS,
+        LLM_FALLBACKS,
+        RULE_HITS,
+        RULE_MATCH_SECONDS,
+    )
+    from result_cache import (  # type: ignore
+        RESULT_CACHE_SIZE,
+        CachedResult,
+        TriageResultCache,
+        request_fingerprint,
+    )
+    from rule_artifact import RULES_ARTIFACT_DIR, ArtifactError, RuleArtifact, load_artifact  # type: ignore
+    from rule_index import (  # type: ignore
+        CompiledRules,
+        RequestFacts,
+        parse_age_range,
+        parse_duration,
+        parse_duration_constraint,
+        parse_temperature,
+        parse_temperature_range,
+    )
+    from single_flight import llm_flights  # type: ignore
+    from symptom_groups import groups_match, has_groups  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover - auth_backend creates its tables on import
+    from auth_backend import AuthUser
+
+# Where the app logs sessions, and where offline tools read them from by default
+DB_FILE = os.getenv("TRIAGE_DB_FILE", "triage_sessions.db")
+
+# Load rules from YAML
+def _rules_path(rules_file: Optional[str]) -> str:
+    if rules_file is None:
+        # Get the directory of this script
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        rules_file = os.path.join(script_dir, "rules.yaml")
+    return rules_file
+
+def load_rules(rules_file: Optional[str] = None):
+    """Load triage rules from rules.yaml (or an alternative rules file)"""
+    rules_file = _rules_path(rules_file)
+    
+    try:
+        with open(rules_file, "r") as file:
+            return yaml.safe_load(file)
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail=f"Rules file not found at {rules_file}")
+    except yaml.YAMLError as e:
+        raise HTTPException(status_code=500, detail=f"Error parsing rules file: {str(e)}")
+
+def load_rule_artifact(rules_file: Optional[str] = None) -> Optional[RuleArtifact]:
+    """Map the precompiled artifact for the rules file, compiling it if needed; None when disabled"""
+    if not RULES_ARTIFACT_DIR:
+        return None
+    rules_file = _rules_path(rules_file)
+    try:
+        return load_artifact(rules_file, RULES_ARTIFACT_DIR)
+    except FileNotFoundError:
+        raise HTTPException(status_code=500, detail=f"Rules file not found at {rules_file}")
+    except yaml.YAMLError as e:
+        raise HTTPException(status_code=500, detail=f"Error parsing rules file: {str(e)}")
+    except (OSError, ArtifactError) as e:
+        # An unwritable cache directory only costs the YAML parse
+        print(f"Rule artifact unavailable, parsing YAML instead: {e}")
+        return None
+
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "15"))
+OPENAI_MAX_RETRIES = 2
+# Joiners of a coalesced call wait as long as the leader's worst case, so all see its outcome
+LLM_SHARED_WAIT_SECONDS = OPENAI_TIMEOUT_SECONDS * (OPENAI_MAX_RETRIES + 1) + 1
+
+# Results whose explanation does not depend on the LLM being reachable right now
+CACHEABLE_EXPLANATION_SOURCES = ("llm", "pregenerated", "default")
+
+def explanation_fingerprint(rule: Dict, request: "TriageRequest") -> tuple:
+    """Everything the LLM prompt depends on, normalized so reordered symptoms coincide"""
+    return (
+        rule["id"],
+        tuple(sorted(s.lower().strip() for s in request.symptoms)),
+        (request.severity or "").lower().strip(),
+        (request.duration or "").lower().strip(),
+        tuple(sorted(f.lower().strip() for f in request.additional_factors or [])),
+    )
+
+# Pydantic models
+class TriageRequest(BaseModel):
+    symptoms: List[str] = Field(..., description="List of symptoms reported by the patient")
+    severity: Optional[str] = Field(None, description="Severity level: mild, moderate, severe, critical")
+    duration: Optional[str] = Field(None, description="Duration of symptoms")
+    additional_factors: Optional[List[str]] = Field([], description="Additional factors or symptoms")
+    temperature: Optional[str] = Field(None, description="Body temperature if fever is present")
+    patient_age: Optional[int] = Field(None, description="Patient age for age-specific considerations")
+    session_id: Optional[str] = Field(None, description="Optional session ID for tracking")
+
+class SymptomCorrection(BaseModel):
+    field: str = Field(..., description="symptoms or additional_factors")
+    original: str
+    corrected: str
+
+class TriageResponse(BaseModel):
+    session_id: str
+    triage_label: str
+    urgency: str
+    action: str
+    timeframe: str
+    matched_rules: List[Dict[str, Any]]
+    explanation: str
+    confidence_score: float
+    timestamp: datetime
+    corrections: List[SymptomCorrection] = Field([], description="Misspellings corrected before matching")
+
+# Rule evaluation engine
+class TriageEngine:
+    """Rule matching and explanations; TriageEvaluator in triage.py also logs sessions"""
+    
+    def __init__(self, rules_file: Optional[str] = None, result_cache_size: int = RESULT_CACHE_SIZE):
+        self.rules_file = rules_file
+        self.result_cache = TriageResultCache(result_cache_size)
+        # Callbacks run after every rules reload; each receives the evaluator
+        self.reload_listeners: List[Callable[["TriageEngine"], None]] = []
+        # Concurrent LLM explanations are packed into one completion per short window
+        self.explanation_batcher = ExplanationBatcher(
+            lambda rule, request: self.generate_openai_explanation(rule, request),
+            lambda jobs: self.generate_openai_explanations(jobs),
+        )
+        self._load_rules()
+    
+    def _load_rules(self) -> None:
+        artifact = load_rule_artifact(self.rules_file)
+        if artifact is None:
+            self._apply_rules(load_rules(self.rules_file))
+        else:
+            self._apply_rules(artifact.rules_data(), artifact)
+    
+    def _apply_rules(self, rules_data: Dict, artifact: Optional[RuleArtifact] = None) -> None:
+        rules = rules_data.get("rules", [])
+        # Rules are evaluated in priority order; sort once instead of per request
+        if artifact is None:
+            sorted_rules = sorted(rules, key=lambda x: x.get("priority", 999))
+        else:
+            sorted_rules = [rules[i] for i in artifact.priority_order]
+        # Compile first, so malformed conditions leave the current rules in place
+        compiled = CompiledRules(sorted_rules, artifact)
+        
+        self.rules_data = rules_data
+        self.rules = rules
+        self.triage_labels = self.rules_data.get("triage_labels", {})
+        self.rules_version = hashlib.sha256(
+            json.dumps(self.rules_data, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        self.sorted_rules = sorted_rules
+        self.compiled = compiled
+        self.corrector = SymptomCorrector.from_compiled(self.compiled)
+        # Filled by the explanation warm-up (if enabled) for this rules version
+        self.pregenerated = PregeneratedExplanations(self.rules_version)
+    
+    def reload_rules(self) -> str:
+        """Re-read the rules file, rebuild indexes and drop cached results; returns the new version"""
+        self._load_rules()
+        self.result_cache.clear()
+        for listener in self.reload_listeners:
+            listener(self)
+        return self.rules_version
+    
+    def correct_request(self, request: TriageRequest) -> tuple[TriageRequest, List[Dict[str, str]]]:
+        """Request with misspelt symptoms/factors corrected to the rule vocabulary, plus the corrections"""
+        symptoms, factors, corrections = self.corrector.correct(request.symptoms, request.additional_factors or [])
+        if not corrections:
+            return request, corrections
+        return request.model_copy(update={"symptoms": symptoms, "additional_factors": factors}), corrections
+    
+    def normalize_text(self, text: str) -> str:
+        """Normalize text for comparison"""
+        return text.lower().strip()
+    
+    def match_symptoms(self, user_symptoms: List[str], rule_symptoms: List[str]) -> bool:
+        """Check if user symptoms match rule symptoms"""
+        user_symptoms_norm = [self.normalize_text(s) for s in user_symptoms]
+        
+        for rule_symptom in rule_symptoms:
+            rule_symptom_norm = self.normalize_text(rule_symptom)
+            # Check for exact match or partial match
+            if any(rule_symptom_norm in user_symptom or user_symptom in rule_symptom_norm 
+                   for user_symptom in user_symptoms_norm):
+                return True
+        return False
+    
+    def match_severity(self, user_severity: Optional[str], rule_severity: List[str]) -> bool:
+        """Check if user severity matches rule severity requirements"""
+        if not user_severity:
+            return "any" in rule_severity or len(rule_severity) == 0
+        
+        user_severity_norm = self.normalize_text(user_severity)
+        return user_severity_norm in [self.normalize_text(s) for s in rule_severity] or "any" in rule_severity
+    
+    def match_additional_factors(self, user_factors: List[str], rule_factors: List[str]) -> bool:
+        """Check if additional factors match"""
+        if not rule_factors:
+            return True
+        
+        user_factors_norm = [self.normalize_text(f) for f in user_factors]
+        
+        for rule_factor in rule_factors:
+            rule_factor_norm = self.normalize_text(rule_factor)
+            if any(rule_factor_norm in user_factor or user_factor in rule_factor_norm 
+                   for user_factor in user_factors_norm):
+                return True
+        return False
+    
+    def match_temperature(self, user_temp: Optional[str], rule_temp: List[str]) -> bool:
+        """Check if temperature matches rule requirements (numeric ranges in °F/°C)"""
+        if not user_temp or not rule_temp:
+            return True
+        
+        user_temp_f = parse_temperature(user_temp)
+        user_temp_norm = self.normalize_text(user_temp)
+        for temp in rule_temp:
+            interval = parse_temperature_range(temp)
+            if interval is None:
+                # Non-numeric rule values keep the original substring matching
+                if self.normalize_text(temp) in user_temp_norm:
+                    return True
+            elif user_temp_f is not None and interval.contains(user_temp_f):
+                return True
+        return False
+    
+    def match_age(self, user_age: Optional[int], rule_age: List[Any]) -> bool:
+        """Check if patient age falls in any of the rule's age ranges"""
+        if user_age is None or not rule_age:
+            return True
+        
+        for age in rule_age:
+            interval = parse_age_range(age)
+            if interval is not None and interval.contains(float(user_age)):
+                return True
+        return False
+    
+    def match_duration(self, user_duration: Optional[str], rule_duration: List[str]) -> bool:
+        """Check if the reported duration satisfies any of the rule's duration terms"""
+        info = parse_duration(user_duration)
+        if info is None or not info.known or not rule_duration:
+            return True
+        
+        interval = info.interval()
+        for term in rule_duration:
+            ranges, flags = parse_duration_constraint(term)
+            if flags & info.flags:
+                return True
+            if interval is not None and any(r.overlaps(interval) for r in ranges):
+                return True
+        return False
+    
+    def confidence_for(self, request: TriageRequest) -> float:
+        """Calculate confidence score based on how many criteria were provided"""
+        confidence = 0.7  # Base confidence
+        if request.severity: confidence += 0.1
+        if request.additional_factors: confidence += 0.1
+        if request.temperature: confidence += 0.1
+        return min(confidence, 1.0)
+    
+    def match_condition_terms(self, request: TriageRequest, condition: Dict) -> bool:
+        """Check the symptom, symptom group, severity and additional factor parts of a condition"""
+        rule_symptoms = condition.get("symptoms", [])
+        # A condition built only from all_of / at_least groups has no symptoms list to match
+        if (rule_symptoms or not has_groups(condition)) and not self.match_symptoms(request.symptoms, rule_symptoms):
+            return False
+        return (
+            groups_match(condition, [self.normalize_text(s) for s in request.symptoms])
+            and self.match_severity(request.severity, condition.get("severity", []))
+            and self.match_additional_factors(
+                request.additional_factors or [],
+                condition.get("additional_factors", [])
+            )
+        )
+    
+    def match_condition(self, request: TriageRequest, condition: Dict, check_duration: bool = True) -> bool:
+        """Check every part of a condition, optionally skipping its duration terms"""
+        return (
+            self.match_condition_terms(request, condition)
+            and self.match_temperature(request.temperature, condition.get("temperature", []))
+            and self.match_age(request.patient_age, condition.get("age", []))
+            and (not check_duration or self.match_duration(request.duration, condition.get("duration", [])))
+        )
+    
+    def duration_keeps_label(self, request: TriageRequest) -> bool:
+        """True when applying rule durations leaves the request's triage label unchanged"""
+        def label(check_duration: bool) -> str:
+            for rule in self.sorted_rules:
+                if any(self.match_condition(request, c, check_duration) for c in rule.get("conditions", [])):
+                    return rule["triage_label"]
+            return "SELF_CARE_MONITOR"
+        
+        return label(True) == label(False)
+    
+    def evaluate_rule(self, request: TriageRequest, rule: Dict) -> tuple[bool, float]:
+        """Evaluate if a single rule matches the request
+        
+        As in match_rules, duration terms only apply when they leave the triage label unchanged.
+        """
+        check_duration: Optional[bool] = None
+        for condition in rule.get("conditions", []):
+            if not self.match_condition(request, condition, check_duration=False):
+                continue
+            if condition.get("duration") and not self.match_duration(request.duration, condition["duration"]):
+                if check_duration is None:
+                    check_duration = self.duration_keeps_label(request)
+                if check_duration:
+                    continue
+            return True, self.confidence_for(request)
+        
+        return False, 0.0
+    
+    def match_rules(self, request: TriageRequest) -> List[Dict[str, Any]]:
+        """Return every rule matching the request, highest priority first
+        
+        Rule durations only narrow the matched rules when that keeps the triage label; a
+        reported duration never lowers the urgency the symptoms alone would get.
+        """
+        compiled = self.compiled
+        
+        with RULE_MATCH_SECONDS.time():
+            # Symptoms, temperature, age and groups are resolved through the compiled
+            # indexes; only surviving candidates get the severity and factor checks
+            facts = RequestFacts.from_request(request)
+            durations = compiled.duration.accepted(facts.duration)
+            matched_positions: Dict[int, None] = {}
+            timed_positions: Dict[int, None] = {}
+            for condition_id in compiled.candidates(facts, check_duration=False):
+                rule_pos = compiled.condition_rule[condition_id]
+                if rule_pos in timed_positions:
+                    continue
+                condition = compiled.conditions[condition_id]
+                if self.match_severity(request.severity, condition.get("severity", [])) and \
+                        self.match_additional_factors(
+                            request.additional_factors or [],
+                            condition.get("additional_factors", [])
+                        ):
+                    matched_positions[rule_pos] = None
+                    if compiled.duration.allows(condition_id, durations):
+                        timed_positions[rule_pos] = None
+            if self._label_at(list(timed_positions)) == self._label_at(list(matched_positions)):
+                matched_positions = timed_positions
+            
+            confidence = self.confidence_for(request)
+            matched_rules = [
+                {
+                    "id": rule["id"],
+                    "name": rule["name"],
+                    "category": rule["category"],
+                    "confidence": confidence
+                }
+                for rule in (compiled.rules[rule_pos] for rule_pos in matched_positions)
+            ]
+        
+        for matched in matched_rules:
+            RULE_HITS.labels(matched["id"]).inc()
+        return matched_rules
+    
+    def _label_at(self, rule_positions: List[int]) -> str:
+        if not rule_positions:
+            return "SELF_CARE_MONITOR"
+        return self.compiled.rules[rule_positions[0]]["triage_label"]
+    
+    def classify(self, request: TriageRequest) -> tuple[str, List[Dict[str, Any]]]:
+        """Triage label and matched rules for a request, typos corrected, without explaining or logging it"""
+        request, _ = self.correct_request(request)
+        matched_rules = self.match_rules(request)
+        if not matched_rules:
+            return "SELF_CARE_MONITOR", matched_rules
+        best_rule = next(r for r in self.sorted_rules if r["id"] == matched_rules[0]["id"])
+        return best_rule["triage_label"], matched_rules
+    
+    def evaluate_triage(self, request: TriageRequest, user: Optional["AuthUser"] = None,
+                        use_llm: bool = True,
+                        corrections: Optional[List[Dict[str, str]]] = None) -> TriageResponse:
+        """Evaluate triage request against all rules in priority order
+        
+        corrections are those already applied to request by correct_request; when None the
+        request is corrected here.
+        """
+        if corrections is None:
+            request, corrections = self.correct_request(request)
+        
+        # Identical requests under the same rules reuse the first evaluation
+        cache_key = request_fingerprint(request, self.rules_version)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            triage_label, explanation, confidence_score = (
+                cached.triage_label, cached.explanation, cached.confidence_score
+            )
+            matched_rules = [dict(rule) for rule in cached.matched_rules]
+            for matched in matched_rules:
+                RULE_HITS.labels(matched["id"]).inc()
+        else:
+            triage_label, matched_rules, explanation, confidence_score, source = self._evaluate_uncached(
+                request, use_llm
+            )
+            # A template stand-in (LLM turned off under load, or failed) must not outlive the LLM outage
+            if source in CACHEABLE_EXPLANATION_SOURCES or not os.getenv("OPENAI_API_KEY"):
+                self.result_cache.put(cache_key, CachedResult(
+                    triage_label, tuple(dict(rule) for rule in matched_rules), explanation, confidence_score
+                ))
+        
+        LABEL_OUTCOMES.labels(triage_label).inc()
+        
+        # Get triage label details
+        label_info = self.triage_labels.get(triage_label, {
+            "urgency": "unknown",
+            "action": "Consult healthcare provider",
+            "timeframe": "as needed"
+        })
+        
+        # Generate session ID if not provided
+        session_id = request.session_id or str(uuid.uuid4())
+        
+        # Log to database
+        self.log_session(session_id, request, triage_label, matched_rules, explanation, user)
+        
+        return TriageResponse(
+            session_id=session_id,
+            triage_label=triage_label,
+            urgency=label_info["urgency"],
+            action=label_info["action"],
+            timeframe=label_info["timeframe"],
+            matched_rules=matched_rules,
+            explanation=explanation,
+            confidence_score=confidence_score,
+            timestamp=datetime.now(),
+            corrections=corrections
+        )
+    
+    def _evaluate_uncached(self, request: TriageRequest,
+                           use_llm: bool = True) -> tuple[str, List[Dict[str, Any]], str, float, str]:
+        matched_rules = self.match_rules(request)
+        
+        if not matched_rules:
+            # Default to self-care if no rules match
+            triage_label = "SELF_CARE_MONITOR"
+            explanation = "Based on the symptoms provided, self-care with monitoring is recommended. If symptoms worsen or persist, please seek medical attention."
+            confidence_score = 0.3
+            source = "default"
+        else:
+            # Use the highest priority (first) matched rule
+            best_rule = next((r for r in self.sorted_rules if r["id"] == matched_rules[0]["id"]), None)
+            triage_label = best_rule["triage_label"]
+            explanation, source = self.explain(best_rule, request, use_llm)
+            confidence_score = matched_rules[0]["confidence"]
+        return triage_label, matched_rules, explanation, confidence_score, source
+    
+    def generate_explanation(self, rule: Dict, request: TriageRequest, use_llm: bool = True) -> str:
+        """Generate explanation using OpenAI or template fallback"""
+        return self.explain(rule, request, use_llm)[0]
+    
+    def explain(self, rule: Dict, request: TriageRequest, use_llm: bool = True) -> tuple[str, str]:
+        """Explanation plus where it came from: pregenerated, llm or template"""
+        # A pre-generated explanation for this rule, severity and duration needs no LLM call
+        pregenerated = self.pregenerated.lookup(rule["id"], request.severity, request.duration)
+        if pregenerated is not None:
+            with EXPLANATION_SECONDS.labels("pregenerated").time():
+                return personalise(pregenerated, request.symptoms), "pregenerated"
+        
+        # Try OpenAI first if API key is available
+        if use_llm and os.getenv("OPENAI_API_KEY"):
+            try:
+                with EXPLANATION_SECONDS.labels("llm").time():
+                    # Concurrent identical prompts share one call (and its failure or timeout)
+                    return llm_flights.do(
+                        explanation_fingerprint(rule, request),
+                        lambda: self.explanation_batcher.explain(rule, request, timeout=LLM_SHARED_WAIT_SECONDS),
+                        timeout=LLM_SHARED_WAIT_SECONDS,
+                    ), "llm"
+            except Exception as e:
+                print(f"OpenAI API error: {e}")
+                LLM_ERRORS.inc()
+                LLM_FALLBACKS.inc()
+                # Fall back to template
+        
+        with EXPLANATION_SECONDS.labels("template").time():
+            return self.generate_template_explanation(rule, request), "template"
+    
+    def generate_template_explanation(self, rule: Dict, request: TriageRequest) -> str:
+        """Fill the rule's explanation template with the reported symptoms"""
+        template = rule.get("explanation_template", "Please consult with a healthcare provider about your symptoms.")
+        
+        # Simple template variable replacement
+        explanation = template
+        if request.symptoms:
+            explanation += f" Your reported symptoms include: {', '.join(request.symptoms)}."
+        
+        return explanation
+    
+    def generate_openai_explanation(self, rule: Dict, request: TriageRequest) -> str:
+        """Generate explanation using OpenAI API"""
+        client = self._openai_client()
+        
+        prompt = f"""
+        As a healthcare triage assistant, provide a clear, empathetic explanation for the following triage recommendation:
+
+        Rule: {rule['name']}
+        Category: {rule['category']}
+        Triage Label: {rule['triage_label']}
+        
+        Patient Symptoms: {', '.join(request.symptoms)}
+        Severity: {request.severity or 'Not specified'}
+        Duration: {request.duration or 'Not specified'}
+        Additional Factors: {', '.join(request.additional_factors or [])}
+        
+        Provide a 2-3 sentence explanation that:
+        1. Acknowledges the patient's symptoms
+        2. Explains why this triage level is recommended
+        3. Provides clear next steps
+        
+        Keep the tone professional, empathetic, and reassuring while being appropriately urgent when necessary.
+        """
+        
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=200,
+            temperature=0.3
+        )
+        
+        return response.choices[0].message.content.strip()
+    
+    def generate_openai_explanations(self, jobs: List[tuple]) -> List[Optional[str]]:
+        """Explain several (rule, request) cases with one OpenAI call; None for unusable items"""
+        cases = [
+            {
+                "case": position + 1,
+                "rule": rule["name"],
+                "category": rule["category"],
+                "triage_label": rule["triage_label"],
+                "symptoms": list(request.symptoms),
+                "severity": request.severity or "Not specified",
+                "duration": request.duration or "Not specified",
+                "additional_factors": list(request.additional_factors or []),
+            }
+            for position, (rule, request) in enumerate(jobs)
+        ]
+        response = self._openai_client().chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": build_batch_prompt(cases)}],
+            max_tokens=200 * len(cases),
+            temperature=0.3
+        )
+        return parse_batch_response(response.choices[0].message.content, len(cases))
+    
+    def _openai_client(self) -> openai.OpenAI:
+        # OPENAI_BASE_URL (read by the SDK) can point this at openai_stub.py
+        return openai.OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=OPENAI_TIMEOUT_SECONDS,
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+    
+    def log_session(self, session_id: str, request: TriageRequest, triage_label: str,
+                    matched_rules: List[Dict], explanation: str, user: Optional["AuthUser"] = None):
+        """Record an evaluated session; the bare engine keeps nothing"""
@@ -0,0 +1,154 @@
+"""
+Per-user triage history
+Reads a user's sessions newest-first through the (user_id, timestamp) index with keyset
+cursors on (timestamp, rowid), decoding compact rows. The first page per user is cached with
+the user's history version, a counter that triggers bump in the same transaction as any insert,
+update or delete of the user's sessions. A cached page is only served while that version (one
+primary-key lookup) still matches, so sessions logged by other workers are seen at once.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .session_codec import decode_matched_rules, decode_request
+    from .session_export import decode_cursor, encode_cursor
+except ImportError:  # pragma: no cover - fallback for direct execution
+    from session_codec import decode_matched_rules, decode_request  # type: ignore
+    from session_export import decode_cursor, encode_cursor  # type: ignore
+
+HISTORY_CACHE_USERS = int(os.getenv("HISTORY_CACHE_USERS", "1024"))
+MAX_HISTORY_PAGE = 100
+
+_COLUMNS = """
+    rowid, id, timestamp, symptoms, severity, duration, additional_factors,
+    triage_label, matched_rules, explanation, session_data
+"""
+
+
+def _record(row) -> Dict:
+    _, session_id, timestamp, symptoms, severity, duration, factors, label, matched, explanation, data = row
+    return {
+        "session_id": session_id,
+        "timestamp": timestamp,
+        "triage_label": label,
+        "matched_rules": decode_matched_rules(matched),
+        "explanation": explanation,
+        "request": decode_request(session_id, symptoms, severity, duration, factors, data),
+    }
+
+
+def fetch_history_page(conn: sqlite3.Connection, user_id: str, limit: int = 20,
+                       cursor: Optional[str] = None) -> Dict:
+    """One newest-first page of a user's sessions plus the cursor for the next page"""
+    params: List = [user_id]
+    keyset = ""
+    if cursor:
+        timestamp, rowid = decode_cursor(cursor)
+        if not rowid.isdigit():
+            raise ValueError("Invalid history cursor")
+        keyset = "AND (timestamp, rowid) < (?, ?)"
+        params.extend((timestamp, int(rowid)))
+    rows = conn.execute(f"""
+        SELECT {_COLUMNS}
+        FROM triage_sessions
+        WHERE user_id = ? {keyset}
+        ORDER BY timestamp DESC, rowid DESC
+        LIMIT ?
+    """, params + [limit + 1]).fetchall()
+
+    items = [_record(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last[2], str(last[0]))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _bump(row: str) -> str:
+    """Trigger statement incrementing the history version of the session's owner"""
+    return f"""
+        INSERT INTO triage_history_versions (user_id, version)
+        SELECT {row}.user_id, 1 WHERE {row}.user_id IS NOT NULL
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+    """
+
+
+def init_history_versions(conn: sqlite3.Connection) -> None:
+    """Create the per-user history version table and the triggers that bump it"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS triage_history_versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # Any change to a row, including INSERT OR REPLACE of an existing id, bumps its owner
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS triage_history_version_insert
+        AFTER INSERT ON triage_sessions BEGIN {_bump("new")} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS triage_history_version_update
+        AFTER UPDATE ON triage_sessions BEGIN {_bump("old")} {_bump("new")} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS triage_history_version_delete
+        AFTER DELETE ON triage_sessions BEGIN {_bump("old")} END
+    """)
+
+
+def history_version(conn: sqlite3.Connection, user_id: str) -> int:
+    """Changes whenever any process logs, re-logs or deletes one of the user's sessions"""
+    row = conn.execute(
+        "SELECT version FROM triage_history_versions WHERE user_id = ?", (user_id,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def fetch_history_record(conn: sqlite3.Connection, user_id: str, session_id: str) -> Optional[Dict]:
+    """A single session, only if it belongs to the user"""
+    row = conn.execute(
+        f"SELECT {_COLUMNS} FROM triage_sessions WHERE id = ? AND user_id = ?",
+        (session_id, user_id),
+    ).fetchone()
+    return _record(row) if row else None
+
+
+class HistoryCache:
+    """Bounded LRU of each user's first history page (keyed by page size) and its history version"""
+
+    def __init__(self, max_users: int = HISTORY_CACHE_USERS):
+        self.max_users = max_users
+        self._pages: "OrderedDict[str, Dict[int, Tuple[int, Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, limit: int, version: int) -> Optional[Dict]:
+        with self._lock:
+            pages = self._pages.get(user_id)
+            if pages is None or limit not in pages:
+                return None
+            cached_version, page = pages[limit]
+            if cached_version != version:
+                return None
+            self._pages.move_to_end(user_id)
+            return page
+
+    def put(self, user_id: str, limit: int, page: Dict, version: int) -> None:
+        if self.max_users <= 0:
+            return
+        with self._lock:
+            self._pages.setdefault(user_id, {})[limit] = (version, page)
+            self._pages.move_to_end(user_id)
+            while len(self._pages) > self.max_users:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+history_cache = HistoryCache()